@@ -3,7 +3,10 @@
 import logging
 import re
 import warnings
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 import gradio as gr
@@ -11,11 +14,13 @@ from langchain_core.language_models import BaseChatModel
 from pydantic import SecretStr
 
 from multimodal_rag.models.chunks import SourceType
-from multimodal_rag.models.config import AppSettings
+from multimodal_rag.models.config import AppSettings, get_settings
 from multimodal_rag.models.llm import create_embeddings
 from multimodal_rag.models.query import CitedAnswer, SearchResult
-from multimodal_rag.query.generator import generate_cited_answer, generate_kb_article
+from multimodal_rag.query.cache import AnswerCache, RetrievalCache
+from multimodal_rag.query.generator import generate_kb_article, stream_cited_answer
 from multimodal_rag.query.retriever import retrieve
+from multimodal_rag.store.cache import IngestCache
 from multimodal_rag.store.weaviate import WeaviateStore
 
 logger = logging.getLogger(__name__)
@@ -96,26 +101,36 @@ def _is_ollama_model(model_name: str) -> bool:
     return "/" not in model_name
 
 
-def _make_llm(model_name: str, settings: AppSettings) -> BaseChatModel:
-    """Route to Ollama or OpenRouter based on model name format."""
+@lru_cache(maxsize=8)
+def _build_llm(model_name: str, base_url: str, api_key: str) -> BaseChatModel:
+    """Construct a chat model; cached so its HTTP connection pool is reused."""
     if _is_ollama_model(model_name):
         from langchain_ollama import ChatOllama
 
         return ChatOllama(
             model=model_name,
-            base_url=settings.ollama_base_url,
+            base_url=base_url,
             temperature=0.3,
         )
     from langchain_openai import ChatOpenAI
 
     return ChatOpenAI(
         model=model_name,
-        api_key=SecretStr(settings.openrouter_api_key),
-        base_url=settings.openrouter_base_url,
+        api_key=SecretStr(api_key),
+        base_url=base_url,
         temperature=0.3,
     )
 
 
+def _make_llm(model_name: str, settings: AppSettings) -> BaseChatModel:
+    """Route to Ollama or OpenRouter based on model name format."""
+    if _is_ollama_model(model_name):
+        return _build_llm(model_name, settings.ollama_base_url, "")
+    return _build_llm(
+        model_name, settings.openrouter_base_url, settings.openrouter_api_key
+    )
+
+
 def main() -> None:
     # Suppress Pandas deprecation warnings emitted by Gradio internals.
     # gradio/queueing.py calls df.infer_objects(copy=False) and uses
@@ -123,30 +138,90 @@ def main() -> None:
     warnings.filterwarnings("ignore", message=".*no_silent_downcasting.*")
     warnings.filterwarnings("ignore", message=".*copy keyword is deprecated.*")
 
-    settings = AppSettings()
+    settings = get_settings()
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper(), logging.INFO),
         format="%(asctime)s %(name)s %(levelname)s %(message)s",
     )
 
     embeddings = create_embeddings(settings)
+    # Shares the ingest cache file to see when ingestion last finished
+    cache = None
+    if settings.ingest_cache_path:
+        cache = IngestCache(
+            settings.ingest_cache_path, embedding_model=settings.embedding_model
+        )
     store = WeaviateStore(
         weaviate_url=settings.weaviate_url,
         embeddings=embeddings,
     )
+    # Prewarm the default model so the first question skips client setup
+    _make_llm(settings.llm_model, settings)
+    answer_cache = AnswerCache(
+        max_entries=settings.answer_cache_size,
+        similarity_threshold=settings.answer_cache_similarity,
+        ttl_seconds=settings.answer_cache_ttl_seconds,
+    )
+    retrieval_cache = RetrievalCache(
+        max_entries=settings.retrieval_cache_size,
+        similarity_threshold=settings.answer_cache_similarity,
+        ttl_seconds=settings.answer_cache_ttl_seconds,
+    )
+    # When ingestion last finished; a newer run makes both caches stale
+    last_ingest = cache.last_ingest_finished() if cache is not None else None
+    # Dedicated pool for query embedding so its round-trip overlaps LLM setup
+    embed_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="embed")
 
     def _respond(
         message: str,
         model: str,
-    ) -> tuple[str, CitedAnswer, list[SearchResult]]:
+    ) -> Iterator[tuple[str, CitedAnswer, list[SearchResult]]]:
+        """Yield (display_text, answer, results) as the answer streams in.
+
+        The citations block is only appended once the final answer arrives.
+        Repeated or near-duplicate questions are answered from answer_cache.
+        """
+        nonlocal last_ingest
+        if cache is not None:
+            finished = cache.last_ingest_finished()
+            if finished != last_ingest:
+                logger.info("Knowledge base re-ingested, clearing query caches")
+                last_ingest = finished
+                answer_cache.clear()
+                retrieval_cache.clear()
+        cached = answer_cache.get_exact(message, model)
+        if cached is not None:
+            answer, results = cached
+            yield _format_citations_block(answer), answer, results
+            return
+
+        # Start embedding the question, then resolve the LLM while it runs
+        embed_future = embed_pool.submit(store.embed_query, message)
         llm = _make_llm(model, settings)
-        results = retrieve(message, store, top_k=settings.top_k)
-        answer = generate_cited_answer(
+        query_vector = embed_future.result()
+        cached = answer_cache.get_similar(message, query_vector, model)
+        if cached is not None:
+            answer, results = cached
+            yield _format_citations_block(answer), answer, results
+            return
+
+        results = retrieve(
+            message,
+            store,
+            top_k=settings.top_k,
+            query_vector=query_vector,
+            cache=retrieval_cache,
+        )
+        final: CitedAnswer | None = None
+        for final in stream_cited_answer(
             question=message,
             results=results,
             llm=llm,
-        )
-        return _format_citations_block(answer), answer, results
+        ):
+            yield _format_citations_block(final), final, results
+        # Don't cache "no sources" answers; the KB may just not be ingested yet
+        if final is not None and results:
+            answer_cache.put(message, model, query_vector, final, results)
 
     _css = ".align-bottom { align-self: flex-end; }"
     with gr.Blocks(title="Paro Support KB", css=_css) as demo:
@@ -240,13 +315,19 @@ def main() -> None:
             message: str,
             history: list[dict[str, str]],
             model: str,
-        ) -> tuple[str, list[dict[str, str]], CitedAnswer | None, list[SearchResult]]:
+        ) -> Iterator[
+            tuple[str, list[dict[str, str]], CitedAnswer | None, list[SearchResult]]
+        ]:
             if not message.strip():
-                return "", history, None, []
-            history = history + [{"role": "user", "content": message}]
-            formatted, answer, results = _respond(message, model)
-            history = history + [{"role": "assistant", "content": formatted}]
-            return "", history, answer, results
+                yield "", history, None, []
+                return
+            history = history + [
+                {"role": "user", "content": message},
+                {"role": "assistant", "content": ""},
+            ]
+            for formatted, answer, results in _respond(message, model):
+                history[-1]["content"] = formatted
+                yield "", history, answer, results
 
         msg.submit(
             user_submit,
@@ -5,50 +5,313 @@ Usage: python -m multimodal_rag.ingest
 
 import logging
 import sys
-import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
 
 import yaml
+from langchain_core.language_models import BaseChatModel
 
+from multimodal_rag.ingest.throttle import HostThrottle
 from multimodal_rag.ingest.video_frames import fetch_frame_chunks, fetch_fused_chunks
-from multimodal_rag.ingest.web import crawl_knowledge_base, split_by_sections
-from multimodal_rag.ingest.web_images import fetch_image_chunks
+from multimodal_rag.ingest.web import (
+    MAX_CONCURRENT_CRAWLS,
+    crawl_knowledge_base,
+    split_by_sections,
+)
+from multimodal_rag.ingest.web_images import extract_image_urls, fetch_image_chunks
 from multimodal_rag.ingest.youtube import fetch_transcript_chunks
-from multimodal_rag.models.chunks import SupportChunk
-from multimodal_rag.models.config import AppSettings
+from multimodal_rag.models.chunks import (
+    SupportChunk,
+    screenshot_chunk_id,
+    web_chunk_id,
+)
+from multimodal_rag.models.config import AppSettings, get_settings
 from multimodal_rag.models.llm import create_embeddings, create_vision_llm
-from multimodal_rag.models.sources import SourceConfig
+from multimodal_rag.models.sources import (
+    KnowledgeBaseSource,
+    SourceConfig,
+    YouTubeSource,
+)
+from multimodal_rag.store.cache import IngestCache, content_hash
 from multimodal_rag.store.weaviate import WeaviateStore
 
 logger = logging.getLogger(__name__)
 
 SOURCES_PATH = Path("config/sources.yaml")
 
+# libyaml's C loader when PyYAML was built with it, else the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Queued chunks are flushed to the store once this many have accumulated,
+# bounding how many chunks (and their vectors) are held in memory at once
+_FLUSH_SIZE = 128
+
+# Worker threads for fetching YouTube sources and processing KB pages
+_MAX_WORKERS = 8
+
+# Minimum spacing between request starts to one host (avoids IP bans)
+_YOUTUBE_INTERVAL_SECONDS = 2.0
+_CRAWL_INTERVAL_SECONDS = 5.0
+
+# (label, chunks) pairs produced by one unit of work
+_Batches = list[tuple[str, list[SupportChunk]]]
+
 
 def load_sources() -> SourceConfig:
     if not SOURCES_PATH.exists():
         logger.error("Sources file not found: %s", SOURCES_PATH)
         sys.exit(1)
-    raw = yaml.safe_load(SOURCES_PATH.read_text()) or {}
+    raw = yaml.load(SOURCES_PATH.read_text(), Loader=_YAML_LOADER) or {}
     return SourceConfig.model_validate(raw)
 
 
-def _ingest_chunks(
-    store: WeaviateStore,
+def _open_cache(settings: AppSettings) -> AbstractContextManager[IngestCache | None]:
+    if not settings.ingest_cache_path:
+        return nullcontext()
+    return IngestCache(
+        settings.ingest_cache_path, embedding_model=settings.embedding_model
+    )
+
+
+def _queue_chunks(
+    pending: list[SupportChunk],
     chunks: list[SupportChunk],
     label: str,
-) -> int:
-    """Embed and store chunks for a single unit. Returns count added."""
+) -> None:
+    """Queue chunks for a single unit until the next flush."""
     if not chunks:
         logger.warning("[%s] No chunks produced, skipping", label)
+        return
+    pending.extend(chunks)
+    logger.info("[%s] Queued %d chunks", label, len(chunks))
+
+
+def _flush_chunks(
+    store: WeaviateStore,
+    pending: list[SupportChunk],
+    label: str,
+) -> int:
+    """Embed and store all queued chunks in one batch. Returns count added.
+
+    The queue is cleared even on failure so a bad batch is not retried.
+    """
+    if not pending:
         return 0
-    added = store.add_chunks(chunks)
+    batch = list(pending)
+    pending.clear()
+    added = store.add_chunks(batch)
     logger.info("[%s] Stored %d chunks", label, added)
     return added
 
 
+def _flush_sources(
+    store: WeaviateStore,
+    pending: list[SupportChunk],
+    sources: list[str],
+) -> tuple[int, int]:
+    """Flush a queue shared by several sources. Returns (added, failed).
+
+    A failed batch is reported against every source with chunks in it, and
+    the source list is cleared along with the queue.
+    """
+    batch_sources = list(sources)
+    sources.clear()
+    try:
+        return _flush_chunks(store, pending, "youtube"), 0
+    except Exception:
+        for source in batch_sources:
+            logger.exception("[%s] Store failed, skipping", source)
+        return 0, len(batch_sources)
+
+
+def _process_youtube(
+    yt: YouTubeSource,
+    settings: AppSettings,
+    vision_llm: BaseChatModel | None,
+    throttle: HostThrottle,
+    cache: IngestCache | None = None,
+) -> _Batches:
+    """Fetch and convert chunks for one YouTube source. Raises on failure."""
+    label = f"youtube:{yt.name}"
+    throttle.wait(str(yt.url))
+    logger.info("Processing %s", label)
+
+    if yt.skip_voxtral:
+        # Silent screen recording: vision-only path, dense frames
+        logger.info("[%s] skip_voxtral=true — using vision-only path", label)
+        if vision_llm is None:
+            logger.warning(
+                "[%s] skip_voxtral=true but VISION_MODEL not set, skipping", label
+            )
+            return []
+        frame_chunks = fetch_frame_chunks(
+            str(yt.url),
+            yt.name,
+            vision_llm,
+            interval_seconds=5,
+            cookies_file=settings.youtube_cookies_file,
+            transcribe_mode=True,
+            cache=cache,
+            vision_model=settings.vision_model,
+            frames_per_call=settings.vision_images_per_call,
+        )
+        support_chunks = [SupportChunk.from_frame_chunk(c) for c in frame_chunks]
+        return [(f"{label} [frames]", support_chunks)]
+
+    if settings.mistral_api_key:
+        # Standard spoken video: fused Voxtral + optional vision
+        tc = fetch_fused_chunks(
+            video_url=str(yt.url),
+            source_name=yt.name,
+            mistral_api_key=settings.mistral_api_key,
+            vision_llm=vision_llm,
+            cookies_file=settings.youtube_cookies_file,
+            window_seconds=30,
+            cache=cache,
+            vision_model=settings.vision_model,
+            frames_per_call=settings.vision_images_per_call,
+            cache_ttl_days=settings.transcript_cache_ttl_days,
+        )
+        return [(label, [SupportChunk.from_fused_chunk(c) for c in tc])]
+
+    # No Mistral key: fall back to youtube-transcript-api captions
+    logger.warning(
+        "[%s] MISTRAL_API_KEY not set — falling back to youtube-transcript-api",
+        label,
+    )
+    tc = fetch_transcript_chunks(
+        video_url=str(yt.url),
+        source_name=yt.name,
+        target_tokens=settings.chunk_size,
+        mistral_api_key="",
+        cookies_file=settings.youtube_cookies_file,
+        cache=cache,
+        cache_ttl_days=settings.transcript_cache_ttl_days,
+    )
+    return [(label, [SupportChunk.from_transcript_chunk(c) for c in tc])]
+
+
+def _crawl_kb(
+    kb: KnowledgeBaseSource, settings: AppSettings, throttle: HostThrottle
+) -> list[dict[str, str]]:
+    """Crawl one knowledge base source. Raises on failure."""
+    throttle.wait(str(kb.url))
+    logger.info("Processing kb:%s", kb.name)
+    return crawl_knowledge_base(
+        root_url=str(kb.url),
+        api_key=settings.firecrawl_api_key,
+        limit=100,
+    )
+
+
+def _ingested_image_urls(store: WeaviateStore, markdown: str) -> set[str]:
+    """Image URLs on a page whose screenshot chunk is already stored."""
+    ids = {screenshot_chunk_id(url): url for url in extract_image_urls(markdown)}
+    try:
+        return {ids[i] for i in store.existing_ids(list(ids))}
+    except Exception:
+        logger.warning("Could not check stored image chunks", exc_info=True)
+        return set()
+
+
+def _page_hash(content: str, settings: AppSettings) -> str:
+    """Hash of a page's content and the settings that shape its chunks.
+
+    Changing the chunk size, embedding model or vision model re-ingests
+    pages whose content is unchanged.
+    """
+    return content_hash(
+        f"{settings.chunk_size}|{settings.embedding_model}|"
+        f"{settings.vision_model}|{content}"
+    )
+
+
+def _stored_page_urls(
+    store: WeaviateStore, pages: list[dict[str, str]], with_images: bool
+) -> set[str]:
+    """URLs of pages whose first text chunk (and image chunks) are stored.
+
+    The ingest cache cannot see a purged or reset collection, so a page is
+    only skipped as unchanged if its chunks are still there. Checked in one
+    query for all pages.
+    """
+    expected = {
+        page["url"]: [web_chunk_id(page["url"], 0)]
+        + (
+            [screenshot_chunk_id(url) for url in extract_image_urls(page["content"])]
+            if with_images
+            else []
+        )
+        for page in pages
+    }
+    try:
+        found = store.existing_ids([i for ids in expected.values() for i in ids])
+    except Exception:
+        logger.warning("Could not check stored page chunks", exc_info=True)
+        return set()
+    return {url for url, ids in expected.items() if found.issuperset(ids)}
+
+
+def _process_page(
+    page: dict[str, str],
+    kb_name: str,
+    settings: AppSettings,
+    vision_llm: BaseChatModel | None,
+    store: WeaviateStore,
+    cache: IngestCache | None = None,
+) -> tuple[_Batches, int]:
+    """Chunk one crawled page and describe its not-yet-stored images.
+
+    Returns the produced batches and the number of failed steps.
+    """
+    page_url = page["url"]
+    page_label = f"kb:{kb_name}|{page_url}"
+    batches: _Batches = []
+    failed = 0
+
+    try:
+        web_chunks = split_by_sections(
+            content=page["content"],
+            source_url=page_url,
+            source_name=kb_name,
+            target_tokens=settings.chunk_size,
+        )
+        batches.append(
+            (page_label, [SupportChunk.from_web_chunk(c) for c in web_chunks])
+        )
+    except Exception:
+        logger.exception("[%s] Failed, skipping", page_label)
+        failed += 1
+
+    if vision_llm is not None:
+        try:
+            markdown = page.get("content", "")
+            img_chunks = fetch_image_chunks(
+                page_url,
+                kb_name,
+                markdown,
+                vision_llm,
+                images_per_call=settings.vision_images_per_call,
+                skip_urls=_ingested_image_urls(store, markdown),
+                cache=cache,
+                vision_model=settings.vision_model,
+            )
+            batches.append(
+                (
+                    f"{page_label} [images]",
+                    [SupportChunk.from_screenshot_chunk(c) for c in img_chunks],
+                )
+            )
+        except Exception:
+            logger.exception("[%s] Image description failed, skipping", page_label)
+            failed += 1
+
+    return batches, failed
+
+
 def run() -> None:
-    settings = AppSettings()
+    settings = get_settings()
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper(), logging.INFO),
         format="%(asctime)s %(name)s %(levelname)s %(message)s",
@@ -66,139 +329,152 @@ def run() -> None:
 
     total_added = 0
     total_failed = 0
+    total_unchanged = 0
+    pending: list[SupportChunk] = []
 
-    with WeaviateStore(
-        weaviate_url=settings.weaviate_url,
-        embeddings=embeddings,
-    ) as store:
+    with (
+        _open_cache(settings) as cache,
+        WeaviateStore(
+            weaviate_url=settings.weaviate_url,
+            embeddings=embeddings,
+            cache=cache,
+        ) as store,
+        ThreadPoolExecutor(max_workers=_MAX_WORKERS) as pool,
+        ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CRAWLS) as crawl_pool,
+    ):
         store.ensure_collection()
 
-        # YouTube sources (with rate limiting to avoid IP bans)
-        for i, yt in enumerate(sources.youtube):
-            if i > 0:
-                time.sleep(2)
-            label = f"youtube:{yt.name}"
-            logger.info("Processing %s", label)
+        # Start the knowledge base crawls first so they overlap the YouTube
+        # work below instead of waiting for it. They get their own pool:
+        # queued crawls wait on the crawl limit and host throttle, and on
+        # the shared pool would hold workers the YouTube fetches need
+        crawl_throttle = HostThrottle(_CRAWL_INTERVAL_SECONDS)
+        crawl_futures = [
+            (kb, crawl_pool.submit(_crawl_kb, kb, settings, crawl_throttle))
+            for kb in sources.kb_sources
+        ]
 
+        # YouTube sources, fetched concurrently but spaced per host
+        yt_throttle = HostThrottle(_YOUTUBE_INTERVAL_SECONDS)
+        yt_futures: dict[Future[_Batches], str] = {
+            pool.submit(
+                _process_youtube, yt, settings, vision_llm, yt_throttle, cache
+            ): f"youtube:{yt.name}"
+            for yt in sources.youtube
+        }
+        # Sources with chunks in the pending batch, to report a failed store
+        pending_sources: list[str] = []
+        for future in as_completed(yt_futures):
+            # Drop our reference so the future's chunks are freed once flushed
+            label = yt_futures.pop(future)
             try:
-                if yt.skip_voxtral:
-                    # Silent screen recording: vision-only path, dense frames
-                    logger.info(
-                        "[%s] skip_voxtral=true — using vision-only path", label
-                    )
-                    if vision_llm is not None:
-                        frame_chunks = fetch_frame_chunks(
-                            str(yt.url),
-                            yt.name,
-                            vision_llm,
-                            interval_seconds=5,
-                            cookies_file=settings.youtube_cookies_file,
-                            transcribe_mode=True,
-                        )
-                        support_chunks = [
-                            SupportChunk.from_frame_chunk(c) for c in frame_chunks
-                        ]
-                        total_added += _ingest_chunks(
-                            store, support_chunks, f"{label} [frames]"
-                        )
-                    else:
-                        logger.warning(
-                            "[%s] skip_voxtral=true but VISION_MODEL not set, skipping",
-                            label,
-                        )
-
-                elif settings.mistral_api_key:
-                    # Standard spoken video: fused Voxtral + optional vision
-                    tc = fetch_fused_chunks(
-                        video_url=str(yt.url),
-                        source_name=yt.name,
-                        mistral_api_key=settings.mistral_api_key,
-                        vision_llm=vision_llm,
-                        cookies_file=settings.youtube_cookies_file,
-                        window_seconds=30,
-                    )
-                    chunks = [SupportChunk.from_fused_chunk(c) for c in tc]
-                    total_added += _ingest_chunks(store, chunks, label)
-
-                else:
-                    # No Mistral key: fall back to youtube-transcript-api captions
-                    logger.warning(
-                        "[%s] MISTRAL_API_KEY not set — falling back to"
-                        " youtube-transcript-api",
-                        label,
-                    )
-                    tc = fetch_transcript_chunks(
-                        video_url=str(yt.url),
-                        source_name=yt.name,
-                        target_tokens=settings.chunk_size,
-                        mistral_api_key="",
-                        cookies_file=settings.youtube_cookies_file,
-                    )
-                    chunks = [SupportChunk.from_transcript_chunk(c) for c in tc]
-                    total_added += _ingest_chunks(store, chunks, label)
-
+                batches = future.result()
             except Exception:
                 logger.exception("[%s] Failed, skipping", label)
                 total_failed += 1
+                continue
+            queued = len(pending)
+            for unit_label, chunks in batches:
+                _queue_chunks(pending, chunks, unit_label)
+            if len(pending) > queued:
+                pending_sources.append(label)
+            if len(pending) >= _FLUSH_SIZE:
+                added, failed = _flush_sources(store, pending, pending_sources)
+                total_added += added
+                total_failed += failed
 
-        # Web knowledge base sources
-        for i, kb in enumerate(sources.kb_sources):
-            if i > 0:
-                time.sleep(5)
+        added, failed = _flush_sources(store, pending, pending_sources)
+        total_added += added
+        total_failed += failed
+
+        # Web knowledge base sources, in source order as their crawls finish
+        for kb, crawl_future in crawl_futures:
             kb_label = f"kb:{kb.name}"
-            logger.info("Processing %s", kb_label)
             try:
-                pages = crawl_knowledge_base(
-                    root_url=str(kb.url),
-                    api_key=settings.firecrawl_api_key,
-                    limit=100,
-                )
+                pages = crawl_future.result()
             except Exception:
                 logger.exception("[%s] Crawl failed, skipping", kb_label)
                 total_failed += 1
                 continue
 
+            # Skip pages whose content is unchanged since the last ingest,
+            # as long as their chunks are still in the store
+            page_hashes = {
+                page["url"]: _page_hash(page["content"], settings) for page in pages
+            }
+            unchanged = (
+                _stored_page_urls(
+                    store,
+                    [
+                        page
+                        for page in pages
+                        if cache.page_hash(page["url"]) == page_hashes[page["url"]]
+                    ],
+                    with_images=vision_llm is not None,
+                )
+                if cache is not None
+                else set()
+            )
+            page_futures: dict[Future[tuple[_Batches, int]], str] = {}
             for page in pages:
                 page_url = page["url"]
-                page_label = f"kb:{kb.name}|{page_url}"
-                try:
-                    web_chunks = split_by_sections(
-                        content=page["content"],
-                        source_url=page_url,
-                        source_name=kb.name,
-                        target_tokens=settings.chunk_size,
+                if page_url in unchanged:
+                    logger.info("[kb:%s|%s] Unchanged, skipping", kb.name, page_url)
+                    total_unchanged += 1
+                    continue
+                page_futures[
+                    pool.submit(
+                        _process_page,
+                        page,
+                        kb.name,
+                        settings,
+                        vision_llm,
+                        store,
+                        cache,
                     )
-                    chunks = [SupportChunk.from_web_chunk(c) for c in web_chunks]
-                    total_added += _ingest_chunks(store, chunks, page_label)
-                except Exception:
-                    logger.exception("[%s] Failed, skipping", page_label)
-                    total_failed += 1
+                ] = page_url
+            # Workers hold the pages they still need; free the rest as they finish
+            pages.clear()
+
+            done_hashes: dict[str, str] = {}
+            store_failed = False
+            for page_future in as_completed(page_futures):
+                page_url = page_futures.pop(page_future)
+                batches, failed = page_future.result()
+                total_failed += failed
+                if not failed:
+                    done_hashes[page_url] = page_hashes[page_url]
+                for unit_label, chunks in batches:
+                    _queue_chunks(pending, chunks, unit_label)
 
-                if vision_llm is not None:
+                if len(pending) >= _FLUSH_SIZE:
                     try:
-                        img_chunks = fetch_image_chunks(
-                            page_url,
-                            kb.name,
-                            page.get("content", ""),
-                            vision_llm,
-                        )
-                        support_chunks = [
-                            SupportChunk.from_screenshot_chunk(c) for c in img_chunks
-                        ]
-                        total_added += _ingest_chunks(
-                            store, support_chunks, f"{page_label} [images]"
-                        )
+                        total_added += _flush_chunks(store, pending, kb_label)
                     except Exception:
-                        logger.exception(
-                            "[%s] Image description failed, skipping", page_label
-                        )
+                        logger.exception("[%s] Store failed, skipping", kb_label)
                         total_failed += 1
+                        store_failed = True
+
+            try:
+                total_added += _flush_chunks(store, pending, kb_label)
+            except Exception:
+                logger.exception("[%s] Store failed, skipping", kb_label)
+                total_failed += 1
+                store_failed = True
+
+            # Only remember pages once their chunks are safely stored
+            if cache is not None and not store_failed:
+                cache.set_page_hashes(done_hashes)
 
         total_in_store = store.count()
+        # Tells a running app to drop answers cached from the old content
+        if cache is not None and total_added:
+            cache.mark_ingest_finished()
 
     logger.info(
-        "Ingestion complete: %d added, %d failed, %d total in store",
+        "Ingestion complete: %d added, %d unchanged, %d failed, %d total in store",
         total_added,
+        total_unchanged,
         total_failed,
         total_in_store,
     )
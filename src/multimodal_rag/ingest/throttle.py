@@ -0,0 +1,30 @@
+"""Per-host request spacing for concurrent ingestion workers."""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class HostThrottle:
+    """Enforce a minimum interval between request starts to the same host.
+
+    Replaces blanket sleeps between units: requests to different hosts
+    proceed immediately, while requests to one host are spaced out by
+    min_interval seconds. Safe to share across threads.
+    """
+
+    def __init__(self, min_interval: float) -> None:
+        self._min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot: dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        """Block until a request to url's host may start."""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self._min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
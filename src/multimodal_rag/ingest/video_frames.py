@@ -1,17 +1,27 @@
 """Video keyframe extraction and vision LLM description."""
 
+import asyncio
 import base64
+import io
 import logging
 import subprocess
 import tempfile
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from hashlib import sha256
 from pathlib import Path
 
+import av
 import yt_dlp
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage
 
-from multimodal_rag.ingest.voxtral import transcribe_with_voxtral
+from multimodal_rag.ingest.vision import split_numbered
+from multimodal_rag.ingest.voxtral import transcribe_audio
+from multimodal_rag.ingest.youtube import extract_video_id
 from multimodal_rag.models.chunks import TranscriptChunk
+from multimodal_rag.models.llm import content_text
+from multimodal_rag.store.cache import IngestCache
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +49,14 @@ def download_video(
         "outtmpl": str(output_dir / "%(id)s.%(ext)s"),
         "quiet": True,
         "no_warnings": True,
+        "noprogress": True,
         "remote_components": "ejs:github",
+        # Fetch DASH/HLS fragments in parallel; chunk plain HTTP downloads
+        "concurrent_fragment_downloads": 8,
+        "http_chunk_size": 10 * 1024 * 1024,
+        "retries": 3,
+        "fragment_retries": 3,
+        "socket_timeout": 30,
     }
     if cookies_file:
         ydl_opts["cookiefile"] = cookies_file
@@ -57,32 +74,59 @@ def download_video(
     return video_path
 
 
-def extract_keyframes(
-    video_path: Path, output_dir: Path, interval_seconds: int = 30
-) -> list[tuple[Path, int]]:
-    """Extract one frame every interval_seconds from a video file.
-
-    Returns a sorted list of (frame_path, timestamp_seconds) pairs.
-    Raises subprocess.CalledProcessError on ffmpeg failure.
+# Frames whose longer side exceeds this are downscaled before being sent to
+# the vision LLM; vision APIs downsample larger images themselves anyway
+_MAX_FRAME_SIDE = 1024
+_JPEG_QUALITY = 80
+
+
+def _encode_frame(frame: av.VideoFrame) -> bytes:
+    """Downscale a decoded frame to _MAX_FRAME_SIDE and encode it as JPEG."""
+    longest = max(frame.width, frame.height)
+    if longest > _MAX_FRAME_SIDE:
+        scale = _MAX_FRAME_SIDE / longest
+        # Keep both sides even, as ffmpeg's scale=W:-2 would
+        width = round(frame.width * scale / 2) * 2
+        height = round(frame.height * scale / 2) * 2
+        frame = frame.reformat(width=width, height=height)
+    buf = io.BytesIO()
+    frame.to_image().save(buf, format="JPEG", quality=_JPEG_QUALITY)
+    return buf.getvalue()
+
+
+def iter_keyframes(
+    video_path: Path, interval_seconds: int = 30
+) -> Iterator[tuple[bytes, int]]:
+    """Yield one frame every interval_seconds from a video file.
+
+    Seeks to each target timestamp with PyAV and decodes only from the
+    preceding keyframe, instead of decoding the whole video. Frames are
+    yielded as JPEG bytes, downscaled to at most _MAX_FRAME_SIDE on the
+    longer side, as soon as each is decoded, so consumers can start on
+    early frames while later ones are still being extracted.
+    Yields (jpeg_bytes, timestamp_seconds) pairs in time order.
+    Raises av.error.FFmpegError if the file cannot be opened or decoded.
     """
-    output_pattern = str(output_dir / "frame_%04d.jpg")
-    subprocess.run(
-        [
-            "ffmpeg",
-            "-i",
-            str(video_path),
-            "-vf",
-            f"fps=1/{interval_seconds}",
-            "-q:v",
-            "2",
-            output_pattern,
-        ],
-        check=True,
-        capture_output=True,
-    )
+    with av.open(str(video_path)) as container:
+        stream = container.streams.video[0]
+        time_base = stream.time_base
+        if stream.duration is not None and time_base is not None:
+            duration_s = float(stream.duration * time_base)
+        elif container.duration is not None:
+            duration_s = container.duration / av.time_base
+        else:
+            logger.warning("Unknown duration for %s, no frames extracted", video_path)
+            return
 
-    frames = sorted(output_dir.glob("frame_*.jpg"))
-    return [(frame, (i) * interval_seconds) for i, frame in enumerate(frames)]
+        for t in range(0, int(duration_s) + 1, interval_seconds):
+            if time_base is not None:
+                container.seek(int(t / time_base), stream=stream)
+            else:
+                container.seek(t * av.time_base)
+            for frame in container.decode(stream):
+                if frame.time is None or frame.time >= t:
+                    yield _encode_frame(frame), t
+                    break
 
 
 _PROMPT_DESCRIBE = (
@@ -105,28 +149,161 @@ _PROMPT_TRANSCRIBE = (
 )
 
 
-def describe_frame(
-    frame_path: Path, llm: BaseChatModel, transcribe_mode: bool = False
+_BATCH_INSTRUCTIONS = (
+    "The {n} images below are separate frames, in time order. "
+    "Follow the instructions above for each frame on its own. "
+    "Reply with exactly {n} items numbered 1. to {n}., one per frame "
+    "in the order given, and use no other numbered lists."
+)
+
+# Upper bound on in-flight vision LLM calls when describing a video's frames
+_MAX_CONCURRENT_FRAMES = 16
+
+_JPEG_DATA_URL_PREFIX = b"data:image/jpeg;base64,"
+
+
+@lru_cache(maxsize=32)
+def _frame_prompt(n: int, transcribe_mode: bool) -> str:
+    """Return the prompt for n frames, built once per (n, mode)."""
+    prompt = _PROMPT_TRANSCRIBE if transcribe_mode else _PROMPT_DESCRIBE
+    if n > 1:
+        prompt = f"{prompt}\n\n{_BATCH_INSTRUCTIONS.format(n=n)}"
+    return prompt
+
+
+def _frame_message(images: list[bytes], transcribe_mode: bool) -> HumanMessage:
+    return HumanMessage(
+        content=[
+            {"type": "text", "text": _frame_prompt(len(images), transcribe_mode)},
+            *(
+                {
+                    "type": "image_url",
+                    # Build the data URL as bytes and decode once; base64 is ASCII
+                    "image_url": {
+                        "url": (
+                            _JPEG_DATA_URL_PREFIX + base64.b64encode(image_bytes)
+                        ).decode("ascii")
+                    },
+                }
+                for image_bytes in images
+            ),
+        ]
+    )
+
+
+async def describe_frame_async(
+    image_bytes: bytes, llm: BaseChatModel, transcribe_mode: bool = False
 ) -> str:
-    """Describe or transcribe a video frame using a vision LLM.
+    """Describe or transcribe a JPEG video frame using a vision LLM.
 
     In transcribe_mode, extracts on-screen text only (for silent screen recordings).
     Returns the LLM's text response.
     """
-    image_bytes = frame_path.read_bytes()
-    b64 = base64.b64encode(image_bytes).decode("utf-8")
-    prompt = _PROMPT_TRANSCRIBE if transcribe_mode else _PROMPT_DESCRIBE
-    message = HumanMessage(
-        content=[
-            {"type": "text", "text": prompt},
+    message = _frame_message([image_bytes], transcribe_mode)
+    response = await llm.ainvoke([message])
+    return content_text(response.content)
+
+
+async def describe_frames_batch(
+    images: list[bytes], llm: BaseChatModel, transcribe_mode: bool = False
+) -> list[str]:
+    """Describe or transcribe several JPEG frames in one vision LLM call.
+
+    Falls back to one call per frame when the reply cannot be split into
+    exactly one numbered item per frame.
+    """
+    if len(images) == 1:
+        return [await describe_frame_async(images[0], llm, transcribe_mode)]
+
+    response = await llm.ainvoke([_frame_message(images, transcribe_mode)])
+    items = split_numbered(content_text(response.content), len(images))
+    if items is not None:
+        return items
+    logger.warning(
+        "Could not split batched reply into %d frame descriptions, "
+        "retrying one frame per call",
+        len(images),
+    )
+    return list(
+        await asyncio.gather(
+            *(describe_frame_async(b, llm, transcribe_mode) for b in images)
+        )
+    )
+
+
+async def _describe_frames(
+    frames: Iterable[tuple[bytes, int]],
+    llm: BaseChatModel,
+    transcribe_mode: bool,
+    cache: IngestCache | None = None,
+    vision_model: str = "",
+    frames_per_call: int = 1,
+) -> list[tuple[int, str | BaseException]]:
+    """Describe frames concurrently as they are produced, preserving order.
+
+    frames is consumed in a worker thread, so decoding later frames overlaps
+    with describing earlier ones. Frames are sent frames_per_call at a time,
+    each group as soon as it is full. With a cache, frames are keyed on the
+    SHA-256 of their JPEG bytes and descriptions cached for vision_model are
+    reused, so re-ingesting an unchanged video makes no vision LLM calls.
+    Returns (timestamp, description) pairs; failures are returned in place
+    of the description rather than raised.
+    """
+    sem = asyncio.Semaphore(_MAX_CONCURRENT_FRAMES)
+    mode = "transcribe" if transcribe_mode else "describe"
+    size = max(1, frames_per_call)
+
+    async def _bounded(images: list[bytes]) -> list[str]:
+        async with sem:
+            return await describe_frames_batch(images, llm, transcribe_mode)
+
+    timestamps: list[int] = []
+    hashes: list[str] = []
+    cached: dict[int, str] = {}
+    groups: list[list[int]] = []
+    tasks: list[asyncio.Task[list[str]]] = []
+    pending: list[tuple[int, bytes]] = []
+
+    def _submit() -> None:
+        groups.append([i for i, _ in pending])
+        tasks.append(asyncio.create_task(_bounded([b for _, b in pending])))
+        pending.clear()
+
+    frame_iter = iter(frames)
+    while (frame := await asyncio.to_thread(next, frame_iter, None)) is not None:
+        image_bytes, timestamp = frame
+        i = len(timestamps)
+        timestamps.append(timestamp)
+        if cache is not None:
+            frame_hash = sha256(image_bytes).hexdigest()
+            hashes.append(frame_hash)
+            known = cache.get_frame_descriptions([frame_hash], vision_model, mode)
+            if frame_hash in known:
+                cached[i] = known[frame_hash]
+                continue
+        pending.append((i, image_bytes))
+        if len(pending) == size:
+            _submit()
+    if pending:
+        _submit()
+
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    results: dict[int, str | BaseException] = dict(cached)
+    for group, outcome in zip(groups, outcomes):
+        for pos, i in enumerate(group):
+            results[i] = outcome if isinstance(outcome, BaseException) else outcome[pos]
+    if cache is not None:
+        logger.info("Reused %d cached frame descriptions", len(cached))
+        cache.put_frame_descriptions(
             {
-                "type": "image_url",
-                "image_url": {"url": f"data:image/jpeg;base64,{b64}"},
+                hashes[i]: d
+                for i, d in results.items()
+                if i not in cached and isinstance(d, str)
             },
-        ]
-    )
-    response = llm.invoke([message])
-    return str(response.content)
+            vision_model,
+            mode,
+        )
+    return [(timestamp, results[i]) for i, timestamp in enumerate(timestamps)]
 
 
 def extract_audio(video_path: Path, output_dir: Path) -> Path:
@@ -159,48 +336,53 @@ def fetch_frame_chunks(
     interval_seconds: int = 30,
     cookies_file: str = "",
     transcribe_mode: bool = False,
+    cache: IngestCache | None = None,
+    vision_model: str = "",
+    frames_per_call: int = 1,
 ) -> list[TranscriptChunk]:
     """Download a video, extract keyframes, and describe each with a vision LLM.
 
+    Frames are described concurrently (up to _MAX_CONCURRENT_FRAMES at once)
+    while later ones are still being extracted, frames_per_call frames per
+    vision LLM request. Descriptions cached for vision_model are reused
+    instead of calling the LLM.
     Returns a list of TranscriptChunks where text is the frame description
     and start_seconds is the frame timestamp.
     """
     chunks: list[TranscriptChunk] = []
 
     with tempfile.TemporaryDirectory() as tmpdir:
-        tmp_path = Path(tmpdir)
-        video_dir = tmp_path / "video"
-        frame_dir = tmp_path / "frames"
-        video_dir.mkdir()
-        frame_dir.mkdir()
-
         logger.info("Downloading video for frame extraction: %s", video_title)
-        video_path = download_video(video_url, video_dir, cookies_file=cookies_file)
+        video_path = download_video(
+            video_url, Path(tmpdir), cookies_file=cookies_file
+        )
 
-        frames = extract_keyframes(video_path, frame_dir, interval_seconds)
-        logger.info("Extracted %d keyframes from %s", len(frames), video_title)
+        frames = iter_keyframes(video_path, interval_seconds)
+        descriptions = asyncio.run(
+            _describe_frames(
+                frames, llm, transcribe_mode, cache, vision_model, frames_per_call
+            )
+        )
+        logger.info("Extracted %d keyframes from %s", len(descriptions), video_title)
 
-        for frame_path, timestamp in frames:
-            try:
-                description = describe_frame(
-                    frame_path, llm, transcribe_mode=transcribe_mode
-                )
-                chunks.append(
-                    TranscriptChunk(
-                        text=description,
-                        source_url=video_url,
-                        source_name=video_title,
-                        start_seconds=timestamp,
-                        end_seconds=timestamp + interval_seconds,
-                    )
-                )
-            except Exception:
+        for timestamp, description in descriptions:
+            if isinstance(description, BaseException):
                 logger.warning(
                     "Failed to describe frame at %ds for %s, skipping",
                     timestamp,
                     video_title,
-                    exc_info=True,
+                    exc_info=description,
                 )
+                continue
+            chunks.append(
+                TranscriptChunk(
+                    text=description,
+                    source_url=video_url,
+                    source_name=video_title,
+                    start_seconds=timestamp,
+                    end_seconds=timestamp + interval_seconds,
+                )
+            )
 
     return chunks
 
@@ -212,89 +394,122 @@ def fetch_fused_chunks(
     vision_llm: BaseChatModel | None,
     cookies_file: str = "",
     window_seconds: int = 30,
+    cache: IngestCache | None = None,
+    vision_model: str = "",
+    frames_per_call: int = 1,
+    cache_ttl_days: float = 30,
 ) -> list[TranscriptChunk]:
-    """Download video once, transcribe with Voxtral, describe keyframes, merge per window."""  # noqa: E501
+    """Download video once, transcribe with Voxtral, describe keyframes, merge per window.
+
+    Keyframes are described concurrently as they are decoded, up to
+    _MAX_CONCURRENT_FRAMES at a time, with frames_per_call frames per vision
+    LLM request. Descriptions cached for
+    vision_model are reused instead of calling the LLM.
+    The Voxtral transcript is reused from cache (if given) for up to
+    cache_ttl_days; the video is then downloaded without audio, or not at
+    all when there is no vision_llm.
+    """  # noqa: E501
     chunks: list[TranscriptChunk] = []
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmp_path = Path(tmpdir)
-        video_dir = tmp_path / "video"
-        frame_dir = tmp_path / "frames"
-        video_dir.mkdir()
-        frame_dir.mkdir()
-
-        logger.info("Downloading video for fusion: %s", source_name)
-        video_path = download_video(
-            video_url, video_dir, cookies_file=cookies_file, include_audio=True
-        )
-
-        logger.info("Extracting audio for Voxtral: %s", source_name)
-        audio_path = extract_audio(video_path, tmp_path)
-        logger.info("Transcribing with Voxtral: %s", source_name)
-        segments = transcribe_with_voxtral(audio_path, mistral_api_key)
-
-        frames: list[tuple[Path, int]] = []
-        if vision_llm is not None:
-            frames = extract_keyframes(
-                video_path, frame_dir, interval_seconds=window_seconds
-            )
-            logger.info("Extracted %d keyframes from %s", len(frames), source_name)
-
-        if frames:
-            window_starts = [ts for _, ts in frames]
-        else:
-            max_t = max(
-                (float(s["start"]) + float(s["duration"]) for s in segments),
-                default=0.0,
-            )
-            window_starts = list(
-                range(0, int(max_t) + window_seconds, window_seconds)
+    video_id = extract_video_id(video_url)
+    segments = (
+        cache.get_transcript(video_id, "voxtral", cache_ttl_days * 86400)
+        if cache is not None and video_id
+        else None
+    )
+    if segments is not None:
+        logger.info("Using cached voxtral transcript for %s", source_name)
+
+    # (timestamp, description) per keyframe, described as they are decoded
+    described: list[tuple[int, str | BaseException]] = []
+    if segments is None or vision_llm is not None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            video_dir = tmp_path / "video"
+            video_dir.mkdir()
+
+            logger.info("Downloading video for fusion: %s", source_name)
+            video_path = download_video(
+                video_url,
+                video_dir,
+                cookies_file=cookies_file,
+                include_audio=segments is None,
             )
 
-        for i, window_start in enumerate(window_starts):
-            window_end = window_start + window_seconds
-
-            window_segs = [
-                s
-                for s in segments
-                if float(s["start"]) >= window_start
-                and float(s["start"]) < window_end
-            ]
-            speech_text = " ".join(
-                str(s["text"]).strip() for s in window_segs
-            ).strip()
-
-            frame_description: str | None = None
-            if vision_llm is not None and i < len(frames):
-                frame_path, _ = frames[i]
-                try:
-                    frame_description = describe_frame(frame_path, vision_llm)
-                except Exception:
-                    logger.warning(
-                        "Failed to describe frame at %ds for %s, skipping visual",
-                        window_start,
-                        source_name,
-                        exc_info=True,
+            if segments is None:
+                logger.info("Extracting audio for Voxtral: %s", source_name)
+                audio_path = extract_audio(video_path, tmp_path)
+                logger.info("Transcribing with Voxtral: %s", source_name)
+                segments = transcribe_audio(audio_path, mistral_api_key)
+                if cache is not None and video_id and segments:
+                    cache.put_transcript(video_id, "voxtral", segments)
+
+            if vision_llm is not None:
+                frames = iter_keyframes(video_path, interval_seconds=window_seconds)
+                described = asyncio.run(
+                    _describe_frames(
+                        frames, vision_llm, False, cache, vision_model, frames_per_call
                     )
+                )
+                logger.info(
+                    "Extracted %d keyframes from %s", len(described), source_name
+                )
+    descriptions = [description for _, description in described]
+
+    if described:
+        window_starts = [ts for ts, _ in described]
+    else:
+        max_t = max(
+            (s.start + s.duration for s in segments),
+            default=0.0,
+        )
+        window_starts = list(
+            range(0, int(max_t) + window_seconds, window_seconds)
+        )
 
-            if not speech_text and frame_description is None:
-                continue
+    for i, window_start in enumerate(window_starts):
+        window_end = window_start + window_seconds
 
-            if speech_text and frame_description:
-                text = f"[Transcript] {speech_text}\n[Visual] {frame_description}"
-            elif speech_text:
-                text = speech_text
+        window_segs = [
+            s
+            for s in segments
+            if window_start <= s.start < window_end
+        ]
+        speech_text = " ".join(
+            s.text.strip() for s in window_segs
+        ).strip()
+
+        frame_description: str | None = None
+        if i < len(descriptions):
+            description = descriptions[i]
+            if isinstance(description, BaseException):
+                logger.warning(
+                    "Failed to describe frame at %ds for %s, skipping visual",
+                    window_start,
+                    source_name,
+                    exc_info=description,
+                )
             else:
-                text = f"[Visual] {frame_description}"
+                frame_description = description
 
-            chunks.append(
-                TranscriptChunk(
-                    text=text,
-                    source_url=video_url,
-                    source_name=source_name,
-                    start_seconds=window_start,
-                    end_seconds=window_end,
-                )
+        if not speech_text and frame_description is None:
+            continue
+
+        if speech_text and frame_description:
+            text = f"[Transcript] {speech_text}\n[Visual] {frame_description}"
+        elif speech_text:
+            text = speech_text
+        else:
+            text = f"[Visual] {frame_description}"
+
+        chunks.append(
+            TranscriptChunk(
+                text=text,
+                source_url=video_url,
+                source_name=source_name,
+                start_seconds=window_start,
+                end_seconds=window_end,
             )
+        )
 
     return chunks
@@ -0,0 +1,21 @@
+"""Helpers shared by the page image and video keyframe vision LLM calls."""
+
+import re
+
+_NUMBERED_ITEM_RE = re.compile(r"^\s*(\d+)[.)]\s*", re.MULTILINE)
+
+
+def split_numbered(text: str, expected: int) -> list[str] | None:
+    """Split a numbered-list reply into its items, or None if malformed.
+
+    Batched vision prompts ask for exactly one item per image, numbered
+    1. to expected.; anything else (missing, extra or nested numbering,
+    empty items) returns None so the caller can fall back to one image
+    per call.
+    """
+    matches = list(_NUMBERED_ITEM_RE.finditer(text))
+    if [int(m.group(1)) for m in matches] != list(range(1, expected + 1)):
+        return None
+    ends = [m.start() for m in matches[1:]] + [len(text)]
+    items = [text[m.end() : end].strip() for m, end in zip(matches, ends)]
+    return items if all(items) else None
@@ -1,9 +1,15 @@
 """Voxtral audio transcription fallback for videos without captions."""
 
+import csv
 import logging
+import mimetypes
+import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+import av
 import yt_dlp
 from mistralai.client.errors import MistralError
 from mistralai.client.sdk import Mistral
@@ -15,8 +21,15 @@ from tenacity import (
     wait_exponential,
 )
 
+from multimodal_rag.models.chunks import Segment
+
 logger = logging.getLogger(__name__)
 
+# Audio longer than this is split into parts of this length, transcribed
+# concurrently
+_PART_SECONDS = 600
+_MAX_CONCURRENT_PARTS = 4
+
 
 def download_audio(video_url: str, output_dir: Path, cookies_file: str = "") -> Path:
     """Download best available audio from a YouTube URL to output_dir.
@@ -25,11 +38,21 @@ def download_audio(video_url: str, output_dir: Path, cookies_file: str = "") ->
     Raises yt_dlp.utils.DownloadError on failure.
     """
     ydl_opts: dict = {
-        "format": "bestaudio[ext=m4a]/bestaudio",
+        # Voxtral downsamples anyway; cap bitrate to halve download size.
+        # abr<=? keeps m4a streams with unknown bitrate; without a capped
+        # m4a stream, fall back to any m4a, then to any audio
+        "format": "bestaudio[ext=m4a][abr<=?128]/bestaudio[ext=m4a]/bestaudio",
         "outtmpl": str(output_dir / "%(id)s.%(ext)s"),
         "quiet": True,
         "no_warnings": True,
+        "noprogress": True,
         "remote_components": "ejs:github",
+        # Fetch DASH/HLS fragments in parallel; chunk plain HTTP downloads
+        "concurrent_fragment_downloads": 8,
+        "http_chunk_size": 10 * 1024 * 1024,
+        "retries": 3,
+        "fragment_retries": 3,
+        "socket_timeout": 30,
     }
     if cookies_file:
         ydl_opts["cookiefile"] = cookies_file
@@ -48,6 +71,12 @@ def download_audio(video_url: str, output_dir: Path, cookies_file: str = "") ->
     return audio_path
 
 
+@lru_cache(maxsize=4)
+def _get_client(api_key: str) -> Mistral:
+    """Return a Mistral client per API key, reusing its pooled connections."""
+    return Mistral(api_key=api_key)
+
+
 def _is_retryable_mistral_error(exc: BaseException) -> bool:
     if isinstance(exc, MistralError):
         return exc.status_code == 429 or exc.status_code >= 500
@@ -61,18 +90,23 @@ def _is_retryable_mistral_error(exc: BaseException) -> bool:
     before_sleep=before_sleep_log(logger, logging.WARNING),
     reraise=True,
 )
-def transcribe_with_voxtral(
-    media_path: Path, api_key: str
-) -> list[dict[str, float | str]]:
+def transcribe_with_voxtral(media_path: Path, api_key: str) -> list[Segment]:
     """Transcribe an audio or video file using Mistral Voxtral Mini.
 
-    Returns a list of segment dicts with keys: text, start, duration.
+    The open file handle (not its bytes) is passed to the SDK, which streams
+    it to the API in chunks, so memory use does not grow with file size.
+    Returns a list of Segment(text, start, duration).
     """
-    client = Mistral(api_key=api_key)
+    client = _get_client(api_key)
+    content_type, _ = mimetypes.guess_type(media_path.name)
     with open(media_path, "rb") as f:
         response = client.audio.transcriptions.complete(
             model="voxtral-mini-latest",
-            file={"file_name": media_path.name, "content": f},
+            file={
+                "file_name": media_path.name,
+                "content": f,
+                "content_type": content_type or "application/octet-stream",
+            },
             timestamp_granularities=["segment"],
         )
 
@@ -86,22 +120,95 @@ def transcribe_with_voxtral(
         return []
 
     return [
-        {
-            "text": seg.text,
-            "start": float(seg.start),
-            "duration": float(seg.end) - float(seg.start),
-        }
+        Segment(seg.text, float(seg.start), float(seg.end) - float(seg.start))
         for seg in response.segments
     ]
 
 
+def _audio_duration(media_path: Path) -> float | None:
+    """Return the media duration in seconds, or None if it cannot be probed."""
+    try:
+        with av.open(str(media_path)) as container:
+            if container.duration is None:
+                return None
+            return container.duration / av.time_base
+    except av.error.FFmpegError:
+        return None
+
+
+def split_audio(
+    media_path: Path, output_dir: Path, part_seconds: int
+) -> list[tuple[Path, float]]:
+    """Split media into audio parts of about part_seconds via ffmpeg, no re-encode.
+
+    Returns (part_path, start_offset_seconds) pairs in time order.
+    Raises subprocess.CalledProcessError on ffmpeg failure.
+    """
+    list_path = output_dir / "parts.csv"
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-i",
+            str(media_path),
+            "-vn",
+            "-f",
+            "segment",
+            "-segment_time",
+            str(part_seconds),
+            "-c",
+            "copy",
+            "-reset_timestamps",
+            "1",
+            "-segment_list",
+            str(list_path),
+            "-segment_list_type",
+            "csv",
+            str(output_dir / f"part_%03d{media_path.suffix}"),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    with open(list_path, newline="") as f:
+        return [(output_dir / row[0], float(row[1])) for row in csv.reader(f)]
+
+
+def transcribe_audio(media_path: Path, api_key: str) -> list[Segment]:
+    """Transcribe media with Voxtral, splitting long audio into concurrent parts.
+
+    Audio up to _PART_SECONDS long is sent as is. Longer audio is split into
+    parts transcribed up to _MAX_CONCURRENT_PARTS at a time, so latency no
+    longer grows with video length; segment starts are shifted back onto
+    the full timeline.
+    Returns a list of Segment(text, start, duration).
+    """
+    duration = _audio_duration(media_path)
+    if duration is None or duration <= _PART_SECONDS:
+        return transcribe_with_voxtral(media_path, api_key)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        parts = split_audio(media_path, Path(tmpdir), _PART_SECONDS)
+        logger.info(
+            "Transcribing %s in %d parts with Voxtral", media_path.name, len(parts)
+        )
+        with ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_PARTS) as pool:
+            results = list(
+                pool.map(lambda part: transcribe_with_voxtral(part[0], api_key), parts)
+            )
+
+    return [
+        Segment(seg.text, seg.start + offset, seg.duration)
+        for (_, offset), segments in zip(parts, results)
+        for seg in segments
+    ]
+
+
 def fetch_voxtral_transcript(
     video_url: str, api_key: str, cookies_file: str = ""
-) -> list[dict[str, float | str]]:
+) -> list[Segment]:
     """Download audio and transcribe via Voxtral. Cleans up temp files on exit."""
     with tempfile.TemporaryDirectory() as tmpdir:
         tmp_path = Path(tmpdir)
         logger.info("Downloading audio for Voxtral transcription: %s", video_url)
         media_path = download_audio(video_url, tmp_path, cookies_file=cookies_file)
         logger.info("Transcribing %s with Voxtral", media_path.name)
-        return transcribe_with_voxtral(media_path, api_key)
+        return transcribe_audio(media_path, api_key)
@@ -2,14 +2,107 @@
 
 import logging
 import re
-
-from firecrawl import FirecrawlApp
-from firecrawl.v2.types import ScrapeOptions
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from itertools import accumulate
+
+import tiktoken
+from firecrawl import FirecrawlApp, RateLimitError
+from firecrawl.v2.types import CrawlJob, ScrapeOptions
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 
 from multimodal_rag.models.chunks import WebChunk
 
 logger = logging.getLogger(__name__)
 
+_WORD_RE = re.compile(r"\S+")
+_SECTION_RE = re.compile(r"^(#{1,3})\s+(.+)$", re.MULTILINE)
+_TOKEN_ENCODING = "cl100k_base"
+# Deleted from a token's bytes to count the characters that start in it
+_UTF8_CONTINUATION = bytes(range(0x80, 0xC0))
+
+# Crawl jobs in flight at once across ingest worker threads; Firecrawl's
+# lower plans allow two concurrent jobs and answer 429 beyond that
+MAX_CONCURRENT_CRAWLS = 2
+_CRAWL_SLOTS = threading.Semaphore(MAX_CONCURRENT_CRAWLS)
+
+
+@lru_cache(maxsize=1)
+def _token_encoding() -> tiktoken.Encoding | None:
+    """Load the BPE encoding once, or None if it cannot be loaded.
+
+    tiktoken downloads the encoding file on first use; without network
+    access (and no TIKTOKEN_CACHE_DIR) chunking falls back to a word
+    count estimate.
+    """
+    try:
+        return tiktoken.get_encoding(_TOKEN_ENCODING)
+    except Exception:
+        logger.warning(
+            "Could not load %s, estimating tokens from word count",
+            _TOKEN_ENCODING,
+            exc_info=True,
+        )
+        return None
+
+
+def _chunk_units(text: str, target_tokens: int) -> tuple[list[int], int]:
+    """Return the start offset of every token in text, and tokens per chunk.
+
+    Tokens come from tiktoken's BPE encoder when available, otherwise words
+    stand in for tokens. Offsets are summed from each token's byte length
+    (its UTF-8 lead bytes for non-ASCII text) rather than taken from
+    Encoding.decode_with_offsets, which loops over every byte in Python.
+    A token that starts inside a character is placed after it.
+    """
+    enc = _token_encoding()
+    if enc is not None:
+        token_bytes = enc.decode_tokens_bytes(
+            enc.encode(text, disallowed_special=())
+        )
+        lengths: Iterable[int] = (
+            map(len, token_bytes)
+            if text.isascii()
+            else (len(b.translate(None, _UTF8_CONTINUATION)) for b in token_bytes)
+        )
+        offsets = list(accumulate(lengths, initial=0))
+        offsets.pop()
+        return offsets, max(1, target_tokens)
+
+    # Estimate: 1 word ≈ 1.3 tokens
+    starts = [m.start() for m in _WORD_RE.finditer(text)]
+    return starts, max(1, int(target_tokens / 1.3))
+
+
+@retry(
+    retry=retry_if_exception_type(RateLimitError),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=60),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
+def _crawl(app: FirecrawlApp, root_url: str, limit: int) -> CrawlJob:
+    """Run one crawl job, at most _CRAWL_SLOTS at once, retrying on 429."""
+    with _CRAWL_SLOTS:
+        return app.crawl(
+            root_url,
+            limit=limit,
+            max_concurrency=1,
+            include_paths=["/article/*"],
+            scrape_options=ScrapeOptions(
+                formats=["markdown"],
+                only_main_content=True,
+            ),
+        )
+
 
 def crawl_knowledge_base(
     root_url: str,
@@ -17,17 +110,7 @@ def crawl_knowledge_base(
     limit: int = 100,
 ) -> list[dict[str, str]]:
     """Crawl a knowledge base from root URL, returning page content."""
-    app = FirecrawlApp(api_key=api_key)
-    result = app.crawl(
-        root_url,
-        limit=limit,
-        max_concurrency=1,
-        include_paths=["/article/*"],
-        scrape_options=ScrapeOptions(
-            formats=["markdown"],
-            only_main_content=True,
-        ),
-    )
+    result = _crawl(FirecrawlApp(api_key=api_key), root_url, limit)
 
     pages: list[dict[str, str]] = []
     for doc in result.data:
@@ -47,76 +130,64 @@ def split_by_sections(
     source_url: str,
     source_name: str,
     target_tokens: int = 400,
-) -> list[WebChunk]:
-    """Split markdown content by headers, with token-based fallback."""
-    section_pattern = re.compile(r"^(#{1,3})\s+(.+)$", re.MULTILINE)
-    matches = list(section_pattern.finditer(content))
-
-    if not matches:
-        return _split_by_tokens(
-            content, source_url, source_name, None, target_tokens, start_index=0
-        )
-
-    chunks: list[WebChunk] = []
-
-    # Content before first header
-    pre_header = content[: matches[0].start()].strip()
-    if pre_header:
-        chunks.extend(
-            _split_by_tokens(
-                pre_header, source_url, source_name, None, target_tokens,
-                start_index=len(chunks),
-            )
-        )
-
+) -> Iterator[WebChunk]:
+    """Split markdown content by headers, with token-based fallback.
+
+    The page is tokenized once; sections are then cut into ~target_tokens
+    windows by looking up their character bounds in the token offsets.
+    Chunks are yielded as they are cut, so a long page is never held as
+    a full list of WebChunks.
+    """
+    units, step = _chunk_units(content, target_tokens)
+    # Cheap substring check skips the regex scan for header-less pages
+    matches = list(_SECTION_RE.finditer(content)) if "#" in content else []
+
+    # Content before the first header, then each header's section body
+    spans: list[tuple[int, int, str | None]] = [
+        (0, matches[0].start() if matches else len(content), None)
+    ]
     for i, match in enumerate(matches):
-        heading = match.group(2).strip()
-        start = match.end()
         end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
-        section_text = content[start:end].strip()
-
-        if section_text:
-            chunks.extend(
-                _split_by_tokens(
-                    section_text, source_url, source_name, heading, target_tokens,
-                    start_index=len(chunks),
-                )
+        spans.append((match.end(), end, match.group(2).strip()))
+
+    index = 0
+    for start, end, heading in spans:
+        for chunk_text in _split_span(content, start, end, units, step):
+            yield WebChunk(
+                text=chunk_text,
+                source_url=source_url,
+                source_name=source_name,
+                section_heading=heading,
+                chunk_index=index,
             )
-
-    return chunks
-
-
-def _split_by_tokens(
-    text: str,
-    source_url: str,
-    source_name: str,
-    section_heading: str | None,
-    target_tokens: int,
-    start_index: int = 0,
-) -> list[WebChunk]:
-    """Split text into chunks of ~target_tokens."""
-    words = text.split()
-    if not words:
-        return []
-
-    # Estimate: 1 word ≈ 1.3 tokens
-    words_per_chunk = max(1, int(target_tokens / 1.3))
-    chunks: list[WebChunk] = []
-
-    for i in range(0, len(words), words_per_chunk):
-        chunk_words = words[i : i + words_per_chunk]
-        chunk_text = " ".join(chunk_words).strip()
+            index += 1
+
+
+def _split_span(
+    content: str, start: int, end: int, units: list[int], step: int
+) -> Iterator[str]:
+    """Yield the non-empty chunk texts of content[start:end], step tokens each.
+
+    units holds the start offset of every token on the page (see
+    _chunk_units). Chunks are sliced from the original text, so whitespace
+    within a chunk (e.g. markdown line breaks) is preserved.
+    """
+    # Strip the span like str.strip() would, but keep page offsets
+    while start < end and content[start].isspace():
+        start += 1
+    while end > start and content[end - 1].isspace():
+        end -= 1
+    if start == end:
+        return
+
+    lo = bisect_left(units, start)
+    bounds = units[lo : bisect_left(units, end)]
+    if lo and (not bounds or bounds[0] != start):
+        # The span starts inside a token (e.g. after the space of " word")
+        bounds.insert(0, start)
+
+    for i in range(0, len(bounds), step):
+        chunk_end = bounds[i + step] if i + step < len(bounds) else end
+        chunk_text = content[bounds[i] : chunk_end].strip()
         if chunk_text:
-            chunks.append(
-                WebChunk(
-                    text=chunk_text,
-                    source_url=source_url,
-                    source_name=source_name,
-                    section_heading=section_heading,
-                    chunk_index=start_index + len(chunks),
-                )
-            )
-
-    return chunks
-
-
+            yield chunk_text
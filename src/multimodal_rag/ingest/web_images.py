@@ -1,68 +1,239 @@
 """Web page image extraction and vision LLM description."""
 
+import asyncio
 import base64
+import ipaddress
 import logging
 import re
+import socket
+from collections.abc import Collection
+from functools import lru_cache
+from urllib.parse import urlparse
 
 import httpx
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage
 
+from multimodal_rag.ingest.vision import split_numbered
 from multimodal_rag.models.chunks import WebChunk
+from multimodal_rag.models.llm import content_text
+from multimodal_rag.store.cache import IngestCache
 
 logger = logging.getLogger(__name__)
 
-_IMAGE_URL_RE = re.compile(r"!\[.*?\]\((https?://[^\s)]+)\)")
+# Alt text may hold one level of [nested] brackets. Disjoint alternatives and
+# possessive quantifiers keep the scan linear on lines of relative images.
+_IMAGE_URL_RE = re.compile(
+    r"!\[(?:[^\[\]\n]++|\[[^\[\]\n]*+\])*+\]\((https?://[^\s)]++)\)"
+)
 
+# Upper bound on in-flight image downloads + vision LLM calls per page
+_MAX_CONCURRENT_IMAGES = 8
 
-def extract_image_urls(markdown: str) -> list[str]:
-    """Extract absolute image URLs from Firecrawl markdown.
+# Keep-alive pool for image downloads; screenshots mostly share a CDN host
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_HTTP_TIMEOUT = 30
 
-    Returns a deduplicated list of http/https image URLs.
-    """
-    seen: set[str] = set()
-    result: list[str] = []
-    for match in _IMAGE_URL_RE.finditer(markdown):
-        url = match.group(1)
-        if url not in seen:
-            seen.add(url)
-            result.append(url)
-    return result
+_DESCRIBE_PROMPT = (
+    "Describe what is shown in this screenshot in detail. "
+    "Focus on any UI elements, text, menus, buttons, "
+    "forms, or actions visible. "
+    "Be specific and concise."
+)
 
+_DESCRIBE_BATCH_PROMPT = (
+    "Describe each of the {n} screenshots below in detail. "
+    "Focus on any UI elements, text, menus, buttons, "
+    "forms, or actions visible. "
+    "Be specific and concise. "
+    "Reply with exactly {n} items numbered 1. to {n}., one per screenshot "
+    "in the order given, and use no other numbered lists."
+)
 
-def describe_image(image_url: str, llm: BaseChatModel) -> str:
-    """Download an image and describe it using a vision LLM.
 
-    Detects content-type from the response header (falls back to image/jpeg).
-    Returns the LLM's text description.
-    Raises httpx.HTTPStatusError on HTTP errors.
+def extract_image_urls(markdown: str) -> list[str]:
+    """Extract absolute image URLs from Firecrawl markdown.
+
+    Returns a deduplicated list of http/https image URLs, in page order.
     """
-    response = httpx.get(image_url, follow_redirects=True, timeout=30)
-    response.raise_for_status()
+    if "![" not in markdown:
+        return []
+    # One capture group, so findall returns the URLs; dict keeps first-seen order
+    return list(dict.fromkeys(_IMAGE_URL_RE.findall(markdown)))
+
 
+def _data_url(response: httpx.Response) -> str:
+    """Encode a downloaded image as a data URL (content-type from headers)."""
     raw_ct = response.headers.get("content-type", "image/jpeg")
     content_type = raw_ct.split(";")[0].strip()
-    b64 = base64.b64encode(response.content).decode("utf-8")
+    # base64 output is pure ASCII, which decodes faster than UTF-8
+    b64 = base64.b64encode(response.content).decode("ascii")
+    return f"data:{content_type};base64,{b64}"
+
+
+@lru_cache(maxsize=32)
+def _image_prompt(n: int) -> str:
+    """Return the prompt for n images, formatted once per batch size."""
+    return _DESCRIBE_PROMPT if n == 1 else _DESCRIBE_BATCH_PROMPT.format(n=n)
+
 
-    message = HumanMessage(
+def _image_message(data_urls: list[str]) -> HumanMessage:
+    return HumanMessage(
         content=[
-            {
-                "type": "text",
-                "text": (
-                    "Describe what is shown in this screenshot in detail. "
-                    "Focus on any UI elements, text, menus, buttons, "
-                    "forms, or actions visible. "
-                    "Be specific and concise."
-                ),
-            },
-            {
-                "type": "image_url",
-                "image_url": {"url": f"data:{content_type};base64,{b64}"},
-            },
+            {"type": "text", "text": _image_prompt(len(data_urls))},
+            *(
+                {"type": "image_url", "image_url": {"url": url}}
+                for url in data_urls
+            ),
         ]
     )
-    response_msg = llm.invoke([message])
-    return str(response_msg.content)
+
+
+@lru_cache(maxsize=256)
+def _host_is_public(host: str) -> bool:
+    """True if every address host resolves to is globally routable.
+
+    Public images can be passed to the vision API by URL, so it fetches
+    them itself; anything else (intranet, localhost, unresolvable) has to
+    be downloaded here and inlined.
+    """
+    if not host:
+        return False
+    try:
+        infos = socket.getaddrinfo(host, None)
+        return bool(infos) and all(
+            ipaddress.ip_address(str(info[4][0]).split("%")[0]).is_global
+            for info in infos
+        )
+    except (OSError, ValueError):
+        return False
+
+
+def _is_public_url(image_url: str) -> bool:
+    return _host_is_public(urlparse(image_url).hostname or "")
+
+
+async def _download_image(image_url: str, client: httpx.AsyncClient) -> str:
+    """Download an image with a shared client and return it as a data URL."""
+    response = await client.get(image_url)
+    response.raise_for_status()
+    return _data_url(response)
+
+
+async def _image_source(image_url: str, client: httpx.AsyncClient) -> str:
+    """Return the image URL itself if public, else a downloaded data URL."""
+    if await asyncio.to_thread(_is_public_url, image_url):
+        return image_url
+    return await _download_image(image_url, client)
+
+
+async def describe_images_batch(
+    data_urls: list[str], llm: BaseChatModel
+) -> list[str]:
+    """Describe several images (data or public URLs) in one vision LLM call.
+
+    Falls back to one call per image when the reply cannot be split into
+    exactly one numbered item per image.
+    """
+    response = await llm.ainvoke([_image_message(data_urls)])
+    text = content_text(response.content)
+    if len(data_urls) == 1:
+        return [text]
+
+    items = split_numbered(text, len(data_urls))
+    if items is not None:
+        return items
+    logger.warning(
+        "Could not split batched reply into %d descriptions, "
+        "retrying one image per call",
+        len(data_urls),
+    )
+    replies = await asyncio.gather(
+        *(llm.ainvoke([_image_message([url])]) for url in data_urls)
+    )
+    return [content_text(r.content) for r in replies]
+
+
+async def _describe_images(
+    image_urls: list[str], llm: BaseChatModel, images_per_call: int
+) -> list[str | BaseException]:
+    """Describe all images concurrently, preserving order.
+
+    Public images are sent by URL; the rest are downloaded first. Images
+    are sent images_per_call at a time, and a group the API could not
+    read by URL is retried once with downloaded copies. Failures are
+    returned in place of the description rather than raised.
+    """
+    sem = asyncio.Semaphore(_MAX_CONCURRENT_IMAGES)
+
+    async with httpx.AsyncClient(
+        follow_redirects=True, timeout=_HTTP_TIMEOUT, limits=_HTTP_LIMITS
+    ) as client:
+
+        async def _bounded_source(image_url: str) -> str:
+            async with sem:
+                return await _image_source(image_url, client)
+
+        sources: list[str | BaseException] = await asyncio.gather(
+            *(_bounded_source(url) for url in image_urls),
+            return_exceptions=True,
+        )
+
+        results = list(sources)
+        ok = {i: src for i, src in enumerate(sources) if isinstance(src, str)}
+        indices = list(ok)
+        size = max(1, images_per_call)
+        groups = [indices[i : i + size] for i in range(0, len(indices), size)]
+
+        async def _bounded_describe(group: list[int]) -> list[str]:
+            async with sem:
+                group_sources = [ok[i] for i in group]
+                try:
+                    return await describe_images_batch(group_sources, llm)
+                except Exception:
+                    if all(src.startswith("data:") for src in group_sources):
+                        raise
+                    logger.warning(
+                        "Vision API could not read images by URL, inlining them",
+                        exc_info=True,
+                    )
+                inlined = await asyncio.gather(
+                    *(
+                        _download_image(image_urls[i], client)
+                        if not ok[i].startswith("data:")
+                        else asyncio.sleep(0, ok[i])
+                        for i in group
+                    )
+                )
+                return await describe_images_batch(list(inlined), llm)
+
+        described = await asyncio.gather(
+            *(_bounded_describe(g) for g in groups), return_exceptions=True
+        )
+
+    for group, outcome in zip(groups, described):
+        for pos, i in enumerate(group):
+            if isinstance(outcome, BaseException):
+                results[i] = outcome
+            else:
+                results[i] = outcome[pos]
+    return results
+
+
+def describe_image(image_url: str, llm: BaseChatModel) -> str:
+    """Describe an image using a vision LLM.
+
+    Publicly reachable images are passed by URL for the API to fetch.
+    Otherwise (or if the API cannot read the URL) the image is downloaded
+    and inlined as a data URL, with content-type from the response header
+    (falls back to image/jpeg). Runs the same path as fetch_image_chunks.
+    Returns the LLM's text description.
+    Raises httpx.HTTPStatusError on HTTP errors.
+    """
+    (result,) = asyncio.run(_describe_images([image_url], llm, 1))
+    if isinstance(result, BaseException):
+        raise result
+    return result
 
 
 def fetch_image_chunks(
@@ -70,34 +241,69 @@ def fetch_image_chunks(
     page_title: str,
     markdown: str,
     llm: BaseChatModel,
+    images_per_call: int = 1,
+    skip_urls: Collection[str] = (),
+    cache: IngestCache | None = None,
+    vision_model: str = "",
 ) -> list[WebChunk]:
     """Extract images from a web page's markdown and describe each with a vision LLM.
 
+    Images are described concurrently (up to _MAX_CONCURRENT_IMAGES at
+    once), with images_per_call images sent per vision LLM request. Public
+    images are passed by URL; others are downloaded over one pooled client.
+    Images in skip_urls (e.g. already stored) are left out, and descriptions
+    cached for vision_model are reused instead of calling the LLM.
     Returns a list of WebChunks where text is the image description
     and image_url is the source image URL.
     """
-    image_urls = extract_image_urls(markdown)
-    logger.info("Found %d images on %s", len(image_urls), page_url)
+    found = extract_image_urls(markdown)
+    image_urls = [url for url in found if url not in skip_urls]
+    logger.info(
+        "Found %d images on %s (%d already ingested)",
+        len(found),
+        page_url,
+        len(found) - len(image_urls),
+    )
+    if not image_urls:
+        return []
+
+    known = (
+        cache.get_image_descriptions(image_urls, vision_model)
+        if cache is not None
+        else {}
+    )
+    new_urls = [url for url in image_urls if url not in known]
+    described: dict[str, str | BaseException] = {}
+    if new_urls:
+        results = asyncio.run(_describe_images(new_urls, llm, images_per_call))
+        described = dict(zip(new_urls, results))
+        if cache is not None:
+            cache.put_image_descriptions(
+                {u: d for u, d in described.items() if isinstance(d, str)},
+                vision_model,
+            )
 
     chunks: list[WebChunk] = []
     for image_url in image_urls:
-        try:
-            description = describe_image(image_url, llm)
-            chunks.append(
-                WebChunk(
-                    text=description,
-                    source_url=page_url,
-                    source_name=page_title,
-                    image_url=image_url,
-                    section_heading=None,
-                )
-            )
-        except Exception:
+        description = (
+            known[image_url] if image_url in known else described[image_url]
+        )
+        if isinstance(description, BaseException):
             logger.warning(
                 "Failed to describe image %s on %s, skipping",
                 image_url,
                 page_url,
-                exc_info=True,
+                exc_info=description,
+            )
+            continue
+        chunks.append(
+            WebChunk(
+                text=description,
+                source_url=page_url,
+                source_name=page_title,
+                image_url=image_url,
+                section_heading=None,
             )
+        )
 
     return chunks
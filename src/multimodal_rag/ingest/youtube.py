@@ -3,6 +3,10 @@
 import http.cookiejar
 import logging
 import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
 
 import requests
 from youtube_transcript_api import (
@@ -13,133 +17,176 @@ from youtube_transcript_api import (
 )
 
 from multimodal_rag.ingest.voxtral import fetch_voxtral_transcript
-from multimodal_rag.models.chunks import TranscriptChunk
+from multimodal_rag.models.chunks import Segment, TranscriptChunk
+from multimodal_rag.store.cache import IngestCache
 
 logger = logging.getLogger(__name__)
 
+_Segments = list[Segment]
+_TRANSCRIPT_SOURCES = ("captions", "voxtral")
+
+# Caption requests in flight at once across ingest worker threads, and the
+# exponential backoff (1s, 2s, 4s, ... capped) applied when YouTube IP-blocks
+_CAPTION_SLOTS = threading.Semaphore(4)
+_IP_BLOCK_RETRIES = 3
+_MAX_BACKOFF_SECONDS = 60
+
+# watch?v=, /v/, /embed/ and youtu.be/ forms in one pass
+_VIDEO_ID_RE = re.compile(r"(?:v=|/v/|/embed/|youtu\.be/)([a-zA-Z0-9_-]{11})")
+
 
 def extract_video_id(url: str) -> str | None:
     """Extract video ID from a YouTube URL."""
-    patterns = [
-        r"(?:v=|/v/|/embed/)([a-zA-Z0-9_-]{11})",
-        r"(?:youtu\.be/)([a-zA-Z0-9_-]{11})",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
 
 
-def _build_http_client(cookies_file: str) -> requests.Session | None:
-    """Return a requests.Session with cookies loaded, or None if no file given."""
-    if not cookies_file:
-        return None
+@lru_cache(maxsize=4)
+def _cookie_jar(cookies_file: str) -> http.cookiejar.MozillaCookieJar:
+    """Parse a Netscape-format cookie file once rather than per video."""
     jar = http.cookiejar.MozillaCookieJar(cookies_file)
     jar.load(ignore_discard=True, ignore_expires=True)
-    session = requests.Session()
-    session.cookies.update(jar)
-    return session
+    return jar
+
+
+# Per-thread transcript clients; requests.Session is not thread-safe
+_clients = threading.local()
 
 
-def fetch_transcript(
-    video_id: str, cookies_file: str = ""
-) -> list[dict[str, float | str]]:
+def _transcript_api(cookies_file: str) -> YouTubeTranscriptApi:
+    """This thread's transcript client per cookie file, reusing connections."""
+    clients: dict[str, YouTubeTranscriptApi] = _clients.__dict__.setdefault(
+        "by_cookies_file", {}
+    )
+    client = clients.get(cookies_file)
+    if client is None:
+        session = requests.Session()
+        if cookies_file:
+            session.cookies.update(_cookie_jar(cookies_file))
+        client = clients[cookies_file] = YouTubeTranscriptApi(http_client=session)
+    return client
+
+
+def fetch_transcript(video_id: str, cookies_file: str = "") -> list[Segment]:
     """Fetch timestamped transcript segments for a video."""
-    http_client = _build_http_client(cookies_file)
-    ytt_api = YouTubeTranscriptApi(http_client=http_client)
-    transcript = ytt_api.fetch(video_id, languages=["en", "en-GB", "en-US"])
+    transcript = _transcript_api(cookies_file).fetch(
+        video_id, languages=["en", "en-GB", "en-US"]
+    )
     return [
-        {
-            "text": str(snippet.text),
-            "start": float(snippet.start),
-            "duration": float(snippet.duration),
-        }
+        Segment(str(snippet.text), float(snippet.start), float(snippet.duration))
         for snippet in transcript
     ]
 
 
-def chunk_segments(
-    segments: list[dict[str, float | str]],
+def iter_chunk_segments(
+    segments: Iterable[Segment],
     source_url: str,
     source_name: str,
     target_tokens: int = 400,
-) -> list[TranscriptChunk]:
+) -> Iterator[TranscriptChunk]:
     """Group consecutive transcript segments into chunks of ~target_tokens.
 
+    Yields each chunk as soon as it is complete, in a single pass over
+    segments; no intermediate per-segment lists are built.
     Estimates tokens as word_count * 1.3 (conservative for English text).
     """
-    chunks: list[TranscriptChunk] = []
     current_texts: list[str] = []
     current_token_estimate = 0
     chunk_start: float = 0.0
+    # End time of the last segment whose text went into current_texts
+    last_text_end: float = 0.0
 
-    for i, segment in enumerate(segments):
-        text = str(segment["text"]).strip()
+    for segment in segments:
+        text = segment.text.strip()
         if not text:
             continue
 
-        word_count = len(text.split())
-        token_estimate = int(word_count * 1.3)
+        # Integer form of int(word_count * 1.3)
+        token_estimate = len(text.split()) * 13 // 10
 
-        if i == 0 or current_token_estimate == 0:
-            chunk_start = float(segment["start"])
+        if current_token_estimate == 0:
+            chunk_start = segment.start
 
         if current_token_estimate + token_estimate > target_tokens and current_texts:
-            last_seg_idx = max(0, i - 1)
-            last_seg = segments[last_seg_idx]
-            end = float(last_seg["start"]) + float(last_seg["duration"])
-            chunks.append(
-                TranscriptChunk(
-                    text=" ".join(current_texts),
-                    source_url=source_url,
-                    source_name=source_name,
-                    start_seconds=int(chunk_start),
-                    end_seconds=int(end),
-                )
+            yield TranscriptChunk(
+                text=" ".join(current_texts),
+                source_url=source_url,
+                source_name=source_name,
+                start_seconds=int(chunk_start),
+                end_seconds=int(last_text_end),
             )
             current_texts = []
             current_token_estimate = 0
-            chunk_start = float(segment["start"])
+            chunk_start = segment.start
 
         current_texts.append(text)
         current_token_estimate += token_estimate
+        last_text_end = segment.start + segment.duration
 
     if current_texts:
-        last_seg = segments[-1]
-        end = float(last_seg["start"]) + float(last_seg["duration"])
-        chunks.append(
-            TranscriptChunk(
-                text=" ".join(current_texts),
-                source_url=source_url,
-                source_name=source_name,
-                start_seconds=int(chunk_start),
-                end_seconds=int(end),
-            )
+        yield TranscriptChunk(
+            text=" ".join(current_texts),
+            source_url=source_url,
+            source_name=source_name,
+            start_seconds=int(chunk_start),
+            end_seconds=int(last_text_end),
         )
 
-    return chunks
-
 
-def fetch_transcript_chunks(
-    video_url: str,
+def chunk_segments(
+    segments: Iterable[Segment],
+    source_url: str,
     source_name: str,
     target_tokens: int = 400,
-    mistral_api_key: str = "",
-    cookies_file: str = "",
 ) -> list[TranscriptChunk]:
-    """Fetch and chunk a YouTube video's transcript.
+    """List form of iter_chunk_segments."""
+    return list(
+        iter_chunk_segments(segments, source_url, source_name, target_tokens)
+    )
 
-    Falls back to Voxtral audio transcription when captions are disabled,
-    if mistral_api_key is provided. Returns empty list if unavailable.
+
+def _cached_transcript(
+    cache: IngestCache | None, video_id: str, ttl_days: float
+) -> _Segments | None:
+    """Return a cached captions or Voxtral transcript younger than ttl_days."""
+    if cache is None:
+        return None
+    for source in _TRANSCRIPT_SOURCES:
+        segments = cache.get_transcript(video_id, source, ttl_days * 86400)
+        if segments is not None:
+            logger.info("Using cached %s transcript for %s", source, video_id)
+            return segments
+    return None
+
+
+def _fetch_captions(video_id: str, cookies_file: str) -> _Segments:
+    """Fetch captions, backing off and retrying while YouTube IP-blocks us.
+
+    Raises IpBlocked if still blocked after _IP_BLOCK_RETRIES retries.
     """
-    video_id = extract_video_id(video_url)
-    if not video_id:
-        logger.error("Could not extract video ID from URL: %s", video_url)
-        return []
+    for attempt in range(_IP_BLOCK_RETRIES):
+        try:
+            with _CAPTION_SLOTS:
+                return fetch_transcript(video_id, cookies_file=cookies_file)
+        except IpBlocked:
+            delay = min(_MAX_BACKOFF_SECONDS, 2**attempt)
+            logger.warning(
+                "IP blocked by YouTube for %s — retrying in %ds", video_id, delay
+            )
+            time.sleep(delay)
+    with _CAPTION_SLOTS:
+        return fetch_transcript(video_id, cookies_file=cookies_file)
+
+
+def _fetch_segments(
+    video_id: str, video_url: str, mistral_api_key: str, cookies_file: str
+) -> tuple[str, _Segments] | None:
+    """Fetch captions, falling back to Voxtral. Returns (source, segments).
 
+    Returns None (after logging) if no transcript could be fetched.
+    """
     try:
-        segments = fetch_transcript(video_id, cookies_file=cookies_file)
+        return "captions", _fetch_captions(video_id, cookies_file)
     except (TranscriptsDisabled, NoTranscriptFound) as exc:
         if mistral_api_key:
             logger.info(
@@ -148,26 +195,56 @@ def fetch_transcript_chunks(
                 type(exc).__name__,
             )
             try:
-                segments = fetch_voxtral_transcript(
+                return "voxtral", fetch_voxtral_transcript(
                     video_url, mistral_api_key, cookies_file=cookies_file
                 )
             except Exception:
                 logger.exception("Voxtral fallback failed for %s", video_url)
-                return []
+                return None
         else:
             logger.warning(
                 "Captions unavailable for %s (%s) and no MISTRAL_API_KEY set",
                 video_url,
                 type(exc).__name__,
             )
-            return []
+            return None
     except IpBlocked:
         logger.warning("IP blocked by YouTube for %s — skipping", video_url)
-        return []
+        return None
     except Exception:
         logger.exception("Failed to fetch transcript for %s", video_url)
+        return None
+
+
+def fetch_transcript_chunks(
+    video_url: str,
+    source_name: str,
+    target_tokens: int = 400,
+    mistral_api_key: str = "",
+    cookies_file: str = "",
+    cache: IngestCache | None = None,
+    cache_ttl_days: float = 30,
+) -> list[TranscriptChunk]:
+    """Fetch and chunk a YouTube video's transcript.
+
+    Falls back to Voxtral audio transcription when captions are disabled,
+    if mistral_api_key is provided. Returns empty list if unavailable.
+    Transcripts are reused from cache (if given) for up to cache_ttl_days.
+    """
+    video_id = extract_video_id(video_url)
+    if not video_id:
+        logger.error("Could not extract video ID from URL: %s", video_url)
         return []
 
+    segments = _cached_transcript(cache, video_id, cache_ttl_days)
+    if segments is None:
+        fetched = _fetch_segments(video_id, video_url, mistral_api_key, cookies_file)
+        if fetched is None:
+            return []
+        source, segments = fetched
+        if cache is not None and segments:
+            cache.put_transcript(video_id, source, segments)
+
     if not segments:
         logger.warning("No transcript segments found for %s", video_url)
         return []
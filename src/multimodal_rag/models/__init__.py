@@ -1,7 +1,12 @@
 """Data models for the multimodal RAG pipeline."""
 
-from multimodal_rag.models.chunks import SupportChunk, TranscriptChunk, WebChunk
-from multimodal_rag.models.config import AppSettings
+from multimodal_rag.models.chunks import (
+    Segment,
+    SupportChunk,
+    TranscriptChunk,
+    WebChunk,
+)
+from multimodal_rag.models.config import AppSettings, get_settings
 from multimodal_rag.models.llm import create_chat_model, create_embeddings
 from multimodal_rag.models.query import Citation, CitedAnswer, SearchResult
 from multimodal_rag.models.sources import (
@@ -15,9 +20,11 @@ __all__ = [
     "CitedAnswer",
     "create_chat_model",
     "create_embeddings",
+    "get_settings",
     "Citation",
     "KnowledgeBaseSource",
     "SearchResult",
+    "Segment",
     "SourceConfig",
     "SupportChunk",
     "TranscriptChunk",
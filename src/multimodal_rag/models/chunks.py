@@ -1,11 +1,14 @@
 """Chunk models for ingestion and Weaviate storage."""
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import StrEnum
-from hashlib import sha256
-from uuid import NAMESPACE_URL, UUID, uuid5
+from functools import lru_cache
+from hashlib import sha1, sha256
+from typing import NamedTuple
+from uuid import NAMESPACE_URL, UUID
 
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, Field
 
 
 class SourceType(StrEnum):
@@ -13,8 +16,55 @@ class SourceType(StrEnum):
     WEB = "web"
 
 
-class TranscriptChunk(BaseModel):
-    """A chunk of video transcript with timestamp metadata."""
+_NAMESPACE_URL_BYTES = NAMESPACE_URL.bytes
+# Version 5 and RFC 4122 variant bits, as applied by uuid.uuid5
+_UUID5_CLEAR = ~((0xF000 << 64) | (0xC000 << 48))
+_UUID5_SET = (0x5000 << 64) | (0x8000 << 48)
+
+
+def _stable_id(name: str) -> UUID:
+    """Equivalent to uuid5(NAMESPACE_URL, name), minus uuid5's bytes round-trip.
+
+    Callers build name with a single f-string; the namespace bytes are
+    encoded once at import.
+    """
+    digest = sha1(_NAMESPACE_URL_BYTES + name.encode()).digest()
+    value = int.from_bytes(digest[:16])
+    return UUID(int=(value & _UUID5_CLEAR) | _UUID5_SET)
+
+
+# Sized above a full run's distinct URLs (pages + videos across all sources)
+@lru_cache(maxsize=4096)
+def _url_hash(source_url: str) -> str:
+    """SHA-256 of a source URL; cached since every chunk of a page shares it."""
+    return sha256(source_url.encode()).hexdigest()
+
+
+def web_chunk_id(source_url: str, chunk_index: int) -> UUID:
+    """chunk_id of a page's chunk_index-th text chunk (see from_web_chunk)."""
+    return _stable_id(f"{source_url}|{chunk_index}")
+
+
+def screenshot_chunk_id(image_url: str) -> UUID:
+    """chunk_id of the screenshot chunk for image_url (see from_screenshot_chunk)."""
+    return _stable_id(image_url)
+
+
+class Segment(NamedTuple):
+    """One timestamped transcript segment (captions or Voxtral), in seconds."""
+
+    text: str
+    start: float
+    duration: float
+
+
+@dataclass(slots=True, kw_only=True)
+class TranscriptChunk:
+    """A chunk of video transcript with timestamp metadata.
+
+    Ingest-internal DTO built by trusted code, so a slotted dataclass
+    rather than a validated model; SupportChunk is the storage boundary.
+    """
 
     text: str
     source_url: str
@@ -22,20 +72,19 @@ class TranscriptChunk(BaseModel):
     start_seconds: int
     end_seconds: int
 
-    @computed_field  # type: ignore[prop-decorator]
     @property
     def timestamp_url(self) -> str:
         return f"{self.source_url}&t={self.start_seconds}s"
 
-    @computed_field  # type: ignore[prop-decorator]
     @property
     def timestamp_display(self) -> str:
         minutes, seconds = divmod(self.start_seconds, 60)
         return f"{minutes:02d}:{seconds:02d}"
 
 
-class WebChunk(BaseModel):
-    """A chunk of web page content with source metadata."""
+@dataclass(slots=True, kw_only=True)
+class WebChunk:
+    """A chunk of web page content with source metadata (see TranscriptChunk)."""
 
     text: str
     source_url: str
@@ -46,7 +95,11 @@ class WebChunk(BaseModel):
 
 
 class SupportChunk(BaseModel):
-    """Unified chunk model for Weaviate storage."""
+    """Unified chunk model for Weaviate storage.
+
+    The from_* factories fill chunk_id and url_hash up front, so
+    model_post_init has nothing left to assign on the bulk ingest path.
+    """
 
     chunk_id: UUID = Field(default=None)  # type: ignore[assignment]
     text: str
@@ -60,21 +113,36 @@ class SupportChunk(BaseModel):
 
     def model_post_init(self, __context: object) -> None:
         if not self.url_hash:
-            self.url_hash = sha256(self.source_url.encode()).hexdigest()
+            self.url_hash = _url_hash(self.source_url)
         if self.chunk_id is None:
-            self.chunk_id = uuid5(NAMESPACE_URL, self.source_url + "|" + self.text)
+            self.chunk_id = _stable_id(f"{self.source_url}|{self.text}")
+
+    def to_weaviate_properties(self) -> dict[str, str | int | None]:
+        """Weaviate object properties, built from direct attribute reads.
+
+        Cheaper than model_dump: no per-field serializer dispatch, and the
+        only formatting done is ingested_at's ISO string.
+        """
+        return {
+            "text": self.text,
+            "source_type": self.source_type.value,
+            "source_url": self.source_url,
+            "source_name": self.source_name,
+            "timestamp_seconds": self.timestamp_seconds,
+            "section_heading": self.section_heading or "",
+            "url_hash": self.url_hash,
+            "ingested_at": self.ingested_at.isoformat(),
+        }
 
     @classmethod
     def from_transcript_chunk(cls, chunk: TranscriptChunk) -> "SupportChunk":
-        stable_id = uuid5(
-            NAMESPACE_URL,
-            chunk.source_url + "|transcript|" + str(chunk.start_seconds),
-        )
+        stable_id = _stable_id(f"{chunk.source_url}|transcript|{chunk.start_seconds}")
         return cls(
             chunk_id=stable_id,
             text=chunk.text,
             source_type=SourceType.VIDEO,
             source_url=chunk.source_url,
+            url_hash=_url_hash(chunk.source_url),
             source_name=chunk.source_name,
             timestamp_seconds=chunk.start_seconds,
         )
@@ -83,20 +151,20 @@ class SupportChunk(BaseModel):
     def from_web_chunk(cls, chunk: WebChunk) -> "SupportChunk":
         if chunk.chunk_index is not None:
             return cls(
-                chunk_id=uuid5(
-                    NAMESPACE_URL,
-                    chunk.source_url + "|" + str(chunk.chunk_index),
-                ),
+                chunk_id=web_chunk_id(chunk.source_url, chunk.chunk_index),
                 text=chunk.text,
                 source_type=SourceType.WEB,
                 source_url=chunk.source_url,
+                url_hash=_url_hash(chunk.source_url),
                 source_name=chunk.source_name,
                 section_heading=chunk.section_heading,
             )
         return cls(
+            chunk_id=_stable_id(f"{chunk.source_url}|{chunk.text}"),
             text=chunk.text,
             source_type=SourceType.WEB,
             source_url=chunk.source_url,
+            url_hash=_url_hash(chunk.source_url),
             source_name=chunk.source_name,
             section_heading=chunk.section_heading,
         )
@@ -107,15 +175,13 @@ class SupportChunk(BaseModel):
 
         chunk_id is stable: keyed on source_url + timestamp, not LLM text.
         """
-        stable_id = uuid5(
-            NAMESPACE_URL,
-            chunk.source_url + "|frame|" + str(chunk.start_seconds),
-        )
+        stable_id = _stable_id(f"{chunk.source_url}|frame|{chunk.start_seconds}")
         return cls(
             chunk_id=stable_id,
             text=chunk.text,
             source_type=SourceType.VIDEO,
             source_url=chunk.source_url,
+            url_hash=_url_hash(chunk.source_url),
             source_name=chunk.source_name,
             timestamp_seconds=chunk.start_seconds,
         )
@@ -126,15 +192,13 @@ class SupportChunk(BaseModel):
 
         chunk_id is stable: keyed on source_url + window timestamp.
         """
-        stable_id = uuid5(
-            NAMESPACE_URL,
-            chunk.source_url + "|fused|" + str(chunk.start_seconds),
-        )
+        stable_id = _stable_id(f"{chunk.source_url}|fused|{chunk.start_seconds}")
         return cls(
             chunk_id=stable_id,
             text=chunk.text,
             source_type=SourceType.VIDEO,
             source_url=chunk.source_url,
+            url_hash=_url_hash(chunk.source_url),
             source_name=chunk.source_name,
             timestamp_seconds=chunk.start_seconds,
         )
@@ -148,12 +212,12 @@ class SupportChunk(BaseModel):
         """
         if chunk.image_url is None:
             raise ValueError("from_screenshot_chunk requires chunk.image_url to be set")
-        stable_id = uuid5(NAMESPACE_URL, chunk.image_url)
         return cls(
-            chunk_id=stable_id,
+            chunk_id=screenshot_chunk_id(chunk.image_url),
             text=chunk.text,
             source_type=SourceType.WEB,
             source_url=chunk.source_url,
+            url_hash=_url_hash(chunk.source_url),
             source_name=chunk.source_name,
             section_heading=chunk.section_heading,
         )
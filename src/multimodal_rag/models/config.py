@@ -1,12 +1,15 @@
 """Application settings via Pydantic BaseSettings."""
 
+from functools import lru_cache
 from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class AppSettings(BaseSettings):
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", frozen=True
+    )
 
     # Provider selection
     llm_provider: Literal["openrouter", "ollama"] = "openrouter"
@@ -34,6 +37,8 @@ class AppSettings(BaseSettings):
 
     # Vision (visual grounding — empty = disabled)
     vision_model: str = ""
+    # Page images / video keyframes sent per vision LLM request (1 = one per call)
+    vision_images_per_call: int = 4
 
     # YouTube cookie file (Netscape format) — bypasses IP blocks
     youtube_cookies_file: str = ""
@@ -42,7 +47,26 @@ class AppSettings(BaseSettings):
     chunk_size: int = 400
     chunk_overlap: int = 50
     top_k: int = 10
+    # SQLite cache of page hashes + embeddings (empty = disabled)
+    ingest_cache_path: str = ".cache/ingest.sqlite3"
+    # Cached YouTube transcripts older than this are fetched again
+    transcript_cache_ttl_days: int = 30
 
     # App
+    # In-memory answer cache: max entries (0 = disabled), the cosine
+    # similarity above which an earlier question's answer is reused, and
+    # how long a cached answer is served (0 = until the next re-ingest)
+    answer_cache_size: int = 1024
+    answer_cache_similarity: float = 0.97
+    answer_cache_ttl_seconds: int = 3600
+    # Retrieval results reused across chat models (0 = disabled); they
+    # share the answer cache's similarity threshold and TTL
+    retrieval_cache_size: int = 512
     app_env: str = "development"
     log_level: str = "INFO"
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> AppSettings:
+    """Return the process-wide settings, reading .env and the environment once."""
+    return AppSettings()
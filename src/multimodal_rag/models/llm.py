@@ -1,13 +1,44 @@
-"""LangChain model factories for provider-agnostic LLM and embedding access."""
+"""LangChain model factories for provider-agnostic LLM and embedding access.
+
+Provider packages (and LangChain itself) are imported inside the factories,
+so importing multimodal_rag.models stays cheap for code that only needs the
+data models.
+"""
+
+from typing import TYPE_CHECKING, Any
 
-from langchain_core.embeddings import Embeddings
-from langchain_core.language_models import BaseChatModel
 from pydantic import SecretStr
 
 from multimodal_rag.models.config import AppSettings
 
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+    from langchain_core.language_models import BaseChatModel
+
+# Keep-alive pool for the embeddings client: one warm connection per
+# concurrent embed_texts batch, held past httpx's 5 s default idle expiry so
+# spaced-out queries and ingest batches skip a fresh TLS handshake
+_EMBEDDING_MAX_KEEPALIVE = 8
+_EMBEDDING_MAX_CONNECTIONS = 16
+_EMBEDDING_KEEPALIVE_SECONDS = 60.0
+
+
+def content_text(content: str | list[str | dict[str, Any]]) -> str:
+    """Return the text of a chat message's content, plain or as content blocks.
 
-def create_chat_model(settings: AppSettings) -> BaseChatModel:
+    Providers may reply with a list of blocks (text, reasoning, images);
+    only the text blocks are kept, in order.
+    """
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block if isinstance(block, str) else str(block.get("text", ""))
+        for block in content
+        if isinstance(block, str) or block.get("type") == "text"
+    )
+
+
+def create_chat_model(settings: AppSettings) -> "BaseChatModel":
     """Create a LangChain chat model based on the configured provider."""
     if settings.llm_provider == "ollama":
         from langchain_ollama import ChatOllama
@@ -27,7 +58,7 @@ def create_chat_model(settings: AppSettings) -> BaseChatModel:
     )
 
 
-def create_vision_llm(settings: AppSettings) -> BaseChatModel:
+def create_vision_llm(settings: AppSettings) -> "BaseChatModel":
     """Create a vision-capable LangChain chat model via OpenRouter.
 
     Always uses OpenRouter (no Ollama vision path).
@@ -45,7 +76,7 @@ def create_vision_llm(settings: AppSettings) -> BaseChatModel:
     )
 
 
-def create_embeddings(settings: AppSettings) -> Embeddings:
+def create_embeddings(settings: AppSettings) -> "Embeddings":
     """Create a LangChain embeddings instance based on the configured provider."""
     if settings.embedding_provider == "ollama":
         from langchain_ollama import OllamaEmbeddings
@@ -54,10 +85,20 @@ def create_embeddings(settings: AppSettings) -> Embeddings:
             model=settings.embedding_model,
             base_url=settings.ollama_base_url,
         )
+    import httpx
     from langchain_openai import OpenAIEmbeddings
 
+    limits = httpx.Limits(
+        max_keepalive_connections=_EMBEDDING_MAX_KEEPALIVE,
+        max_connections=_EMBEDDING_MAX_CONNECTIONS,
+        keepalive_expiry=_EMBEDDING_KEEPALIVE_SECONDS,
+    )
+    # Send raw text: skips client-side tiktoken encoding and the token-ID JSON
+    # body it produces (embed_texts already bounds input length)
     return OpenAIEmbeddings(
         model=settings.embedding_model,
         api_key=SecretStr(settings.openrouter_api_key),
         base_url=settings.openrouter_base_url,
+        check_embedding_ctx_length=False,
+        http_client=httpx.Client(limits=limits),
     )
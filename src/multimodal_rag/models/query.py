@@ -1,12 +1,21 @@
 """Query pipeline response models."""
 
-from pydantic import BaseModel
+from dataclasses import dataclass
+
+from pydantic import BaseModel, ConfigDict
 
 from multimodal_rag.models.chunks import SourceType
 
 
-class SearchResult(BaseModel):
-    """A retrieved chunk with its relevance score."""
+@dataclass(frozen=True, slots=True, kw_only=True)
+class SearchResult:
+    """A retrieved chunk with its relevance score.
+
+    Built per hit by the retriever from already-coerced Weaviate fields,
+    so a slotted dataclass rather than a validated model. Frozen:
+    RetrievalCache and AnswerCache hand the same instances to every
+    matching request.
+    """
 
     text: str
     source_type: SourceType
@@ -40,6 +49,8 @@ class SearchResult(BaseModel):
 class Citation(BaseModel):
     """A single citation in a generated answer."""
 
+    model_config = ConfigDict(frozen=True)
+
     label: str
     url: str
     relevance_score: float
@@ -47,7 +58,12 @@ class Citation(BaseModel):
 
 
 class CitedAnswer(BaseModel):
-    """LLM-generated answer with structured citations."""
+    """LLM-generated answer with structured citations.
+
+    Frozen: AnswerCache hands the same instance to every matching request.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     answer: str
     citations: list[Citation]
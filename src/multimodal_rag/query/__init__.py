@@ -1,9 +1,13 @@
 """Query pipeline: retrieval and answer generation."""
 
-from multimodal_rag.query.generator import generate_cited_answer
+from multimodal_rag.query.cache import AnswerCache, RetrievalCache
+from multimodal_rag.query.generator import generate_cited_answer, stream_cited_answer
 from multimodal_rag.query.retriever import retrieve
 
 __all__ = [
+    "AnswerCache",
     "generate_cited_answer",
+    "RetrievalCache",
     "retrieve",
+    "stream_cited_answer",
 ]
@@ -0,0 +1,252 @@
+"""In-memory answer and retrieval caches for repeated and near-duplicate questions."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from multimodal_rag.models.query import CitedAnswer, SearchResult
+
+logger = logging.getLogger(__name__)
+
+CachedAnswer = tuple[CitedAnswer, list[SearchResult]]
+
+
+def _normalize(question: str) -> str:
+    return " ".join(question.lower().split())
+
+
+# Words that flip a question's meaning while barely moving its embedding
+_NEGATIONS = frozenset({"no", "not", "never", "cannot", "without"})
+
+
+def _negations(normalized: str) -> frozenset[str]:
+    """Negation words in a normalized question; n't forms count as "not"."""
+    words = {w.strip("?!.,;:") for w in normalized.split()}
+    found = words & _NEGATIONS
+    if any(w.endswith("n't") for w in words):
+        found |= {"not"}
+    return frozenset(found)
+
+
+def _as_vector(vector: list[float]) -> np.ndarray:
+    # Already unit length: embed_texts normalizes every vector it returns
+    return np.asarray(vector, dtype=np.float32)
+
+
+class AnswerCache:
+    """Two-tier cache of final answers, scoped per chat model.
+
+    Tier 1 matches the normalized question text exactly and needs no
+    embedding. Tier 2 matches any earlier question with the same negation
+    words whose embedding has cosine similarity >= similarity_threshold,
+    so "can I ..." never reuses the answer to "can't I ...". Query
+    vectors arrive unit-normalized from embed_texts and live in one
+    preallocated (max_entries, dim) matrix, so a lookup is a single
+    matrix-vector product of cosine similarities. Both tiers share one LRU bound
+    of max_entries; entries expire ttl_seconds after they were cached
+    (0 = never), and clear() drops everything, e.g. after a re-ingest.
+    Safe to share across Gradio worker threads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        similarity_threshold: float = 0.97,
+        ttl_seconds: float = 0,
+    ) -> None:
+        self._max_entries = max_entries
+        self._threshold = similarity_threshold
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        size = max(max_entries, 0)
+        self._vectors: np.ndarray | None = None  # allocated on first put
+        # Per slot: (model, negations) group id (-1 = free) and expiry time
+        self._groups = np.full(size, -1, dtype=np.int32)
+        self._expires = np.zeros(size, dtype=np.float64)
+        self._answers: list[CachedAnswer | None] = [None] * size
+        self._group_ids: dict[tuple[str, frozenset[str]], int] = {}
+        # (normalized question, model) → slot, least recently used first
+        self._slots: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._slot_keys: list[tuple[str, str] | None] = [None] * size
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        with self._lock:
+            self._reset()
+            self._vectors = None
+
+    def _reset(self) -> None:
+        """Free every slot; the caller holds the lock."""
+        self._groups.fill(-1)
+        self._answers = [None] * len(self._answers)
+        self._slot_keys = [None] * len(self._slot_keys)
+        self._slots.clear()
+        self._group_ids.clear()
+
+    def _free(self, slot: int) -> None:
+        """Release slot; the caller holds the lock."""
+        key = self._slot_keys[slot]
+        if key is not None:
+            del self._slots[key]
+        self._slot_keys[slot] = None
+        self._answers[slot] = None
+        self._groups[slot] = -1
+
+    def get_exact(self, question: str, model: str) -> CachedAnswer | None:
+        """Return the cached answer for this exact question, if any."""
+        key = (_normalize(question), model)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                return None
+            if self._ttl and self._expires[slot] <= time.monotonic():
+                self._free(slot)
+                return None
+            self._slots.move_to_end(key)
+            return self._answers[slot]
+
+    def get_similar(
+        self, question: str, query_vector: list[float], model: str
+    ) -> CachedAnswer | None:
+        """Return the answer of the most similar cached question, if close enough."""
+        q = _as_vector(query_vector)
+        group = (model, _negations(_normalize(question)))
+        with self._lock:
+            group_id = self._group_ids.get(group)
+            if (
+                group_id is None
+                or self._vectors is None
+                or self._vectors.shape[1] != len(q)
+            ):
+                return None
+            scores = self._vectors @ q
+            live = self._groups == group_id
+            if self._ttl:
+                live &= self._expires > time.monotonic()
+            scores[~live] = -1.0
+            best = int(np.argmax(scores))
+            if scores[best] < self._threshold:
+                return None
+            key = self._slot_keys[best]
+            assert key is not None
+            self._slots.move_to_end(key)
+            logger.info(
+                "Answer cache hit (similarity %.3f) for: %.60s...",
+                scores[best],
+                key[0],
+            )
+            return self._answers[best]
+
+    def put(
+        self,
+        question: str,
+        model: str,
+        query_vector: list[float],
+        answer: CitedAnswer,
+        results: list[SearchResult],
+    ) -> None:
+        """Cache a final answer, evicting the least recently used entry."""
+        if self._max_entries <= 0:
+            return
+        normalized = _normalize(question)
+        key = (normalized, model)
+        q = _as_vector(query_vector)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != len(q):
+                # First entry, or the embedding model changed: start over
+                self._reset()
+                self._vectors = np.zeros(
+                    (self._max_entries, len(q)), dtype=np.float32
+                )
+            slot = self._slots.get(key)
+            if slot is None:
+                if len(self._slots) >= self._max_entries:
+                    self._free(next(iter(self._slots.values())))
+                slot = int(np.argmin(self._groups))  # a free slot holds -1
+            group = (model, _negations(normalized))
+            self._vectors[slot] = q
+            self._groups[slot] = self._group_ids.setdefault(
+                group, len(self._group_ids)
+            )
+            self._expires[slot] = time.monotonic() + self._ttl
+            self._answers[slot] = (answer, results)
+            self._slot_keys[slot] = key
+            self._slots[key] = slot
+            self._slots.move_to_end(key)
+
+
+class RetrievalCache:
+    """FIFO cache of retrieval results, matched by query-vector similarity.
+
+    Model-independent, so a near-duplicate question skips the Weaviate
+    search even when asked of a different chat model. Vectors, expiry and
+    clear() work as in AnswerCache. Safe to share across Gradio worker threads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        similarity_threshold: float = 0.97,
+        ttl_seconds: float = 0,
+    ) -> None:
+        self._max_entries = max_entries
+        self._threshold = similarity_threshold
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._vectors: np.ndarray | None = None  # allocated on first put
+        self._top_ks = np.zeros(max(max_entries, 0), dtype=np.int32)
+        self._expires = np.zeros(max(max_entries, 0), dtype=np.float64)
+        self._results: list[list[SearchResult]] = []
+        self._next = 0
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._vectors = None
+            self._results = []
+            self._next = 0
+
+    def get(self, query_vector: list[float], top_k: int) -> list[SearchResult] | None:
+        """Return results cached for a similar query with the same top_k."""
+        q = _as_vector(query_vector)
+        with self._lock:
+            size = len(self._results)
+            if self._vectors is None or not size or self._vectors.shape[1] != len(q):
+                return None
+            scores = self._vectors[:size] @ q
+            stale = self._top_ks[:size] != top_k
+            if self._ttl:
+                stale |= self._expires[:size] <= time.monotonic()
+            scores[stale] = -1.0
+            best = int(np.argmax(scores))
+            if scores[best] < self._threshold:
+                return None
+            logger.info("Retrieval cache hit (similarity %.3f)", scores[best])
+            return self._results[best]
+
+    def put(
+        self, query_vector: list[float], top_k: int, results: list[SearchResult]
+    ) -> None:
+        """Cache results for a query, replacing the oldest entry when full."""
+        if self._max_entries <= 0:
+            return
+        q = _as_vector(query_vector)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != len(q):
+                # First entry, or the embedding model changed: start over
+                self._vectors = np.zeros(
+                    (self._max_entries, len(q)), dtype=np.float32
+                )
+                self._results = []
+                self._next = 0
+            self._vectors[self._next] = q
+            self._top_ks[self._next] = top_k
+            self._expires[self._next] = time.monotonic() + self._ttl
+            if self._next < len(self._results):
+                self._results[self._next] = results
+            else:
+                self._results.append(results)
+            self._next = (self._next + 1) % self._max_entries
@@ -1,14 +1,19 @@
 """Cited answer generation via LangChain chat model."""
 
 import logging
+import re
+from collections.abc import Iterator
 
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 
+from multimodal_rag.models.llm import content_text
 from multimodal_rag.models.query import Citation, CitedAnswer, SearchResult
 
 logger = logging.getLogger(__name__)
 
+_REF_RE = re.compile(r"\[([1-9]\d*)\]")
+
 SYSTEM_PROMPT = """\
 You are a support assistant for Paro Software. Answer the user's question \
 using ONLY the provided source chunks. Follow these rules strictly:
@@ -29,30 +34,23 @@ USER_TEMPLATE = """\
 {question}"""
 
 
-def generate_cited_answer(
-    question: str,
-    results: list[SearchResult],
-    llm: BaseChatModel,
-) -> CitedAnswer:
-    """Generate a cited answer from retrieved search results."""
-    from multimodal_rag.query.retriever import format_context
+_NO_SOURCES_ANSWER = "I couldn't find any relevant sources to answer your question."
 
-    if not results:
-        return CitedAnswer(
-            answer="I couldn't find any relevant sources to answer your question.",
-            citations=[],
-        )
+
+def _answer_messages(
+    question: str, results: list[SearchResult]
+) -> list[BaseMessage]:
+    from multimodal_rag.query.retriever import format_context
 
     context = format_context(results)
     user_message = USER_TEMPLATE.format(context=context, question=question)
-
-    response = llm.invoke([
+    return [
         SystemMessage(content=SYSTEM_PROMPT),
         HumanMessage(content=user_message),
-    ])
+    ]
 
-    raw_answer = str(response.content) if response.content else ""
 
+def _finalize_answer(raw_answer: str, results: list[SearchResult]) -> CitedAnswer:
     citations = _build_citations(results)
     answer_with_links = _replace_refs_with_links(raw_answer, results)
 
@@ -60,6 +58,46 @@ def generate_cited_answer(
     return CitedAnswer(answer=answer_with_links, citations=citations)
 
 
+def generate_cited_answer(
+    question: str,
+    results: list[SearchResult],
+    llm: BaseChatModel,
+) -> CitedAnswer:
+    """Generate a cited answer from retrieved search results."""
+    if not results:
+        return CitedAnswer(answer=_NO_SOURCES_ANSWER, citations=[])
+
+    response = llm.invoke(_answer_messages(question, results))
+    raw_answer = content_text(response.content)
+    return _finalize_answer(raw_answer, results)
+
+
+def stream_cited_answer(
+    question: str,
+    results: list[SearchResult],
+    llm: BaseChatModel,
+) -> Iterator[CitedAnswer]:
+    """Stream a cited answer as the LLM generates it.
+
+    Yields partial answers (raw text so far, no citations) as tokens arrive,
+    then a final CitedAnswer identical to generate_cited_answer's result.
+    """
+    if not results:
+        yield CitedAnswer(answer=_NO_SOURCES_ANSWER, citations=[])
+        return
+
+    raw_answer = ""
+    for chunk in llm.stream(_answer_messages(question, results)):
+        text = content_text(chunk.content)
+        if not text:
+            continue
+        # Extend once per piece; re-joining every piece per token is quadratic
+        raw_answer += text
+        yield CitedAnswer(answer=raw_answer, citations=[])
+
+    yield _finalize_answer(raw_answer, results)
+
+
 def _build_citations(results: list[SearchResult]) -> list[Citation]:
     """Build Citation objects from search results."""
     return [
@@ -76,12 +114,20 @@ def _build_citations(results: list[SearchResult]) -> list[Citation]:
 def _replace_refs_with_links(
     text: str, results: list[SearchResult]
 ) -> str:
-    """Replace [1], [2] etc. with clickable markdown citation links."""
-    for i, r in enumerate(results, 1):
-        score_pct = round(r.relevance_score * 100)
-        link = f"[{r.citation_label}]({r.citation_url}) ({score_pct}%)"
-        text = text.replace(f"[{i}]", link)
-    return text
+    """Replace [1], [2] etc. with clickable markdown citation links.
+
+    Each result's link is built once and the answer is scanned in a single
+    pass; references without a matching result are left as written.
+    """
+    if not results:
+        return text
+    links = [r.citation_markdown for r in results]
+
+    def _link(match: re.Match[str]) -> str:
+        n = int(match.group(1))
+        return links[n - 1] if n <= len(links) else match.group(0)
+
+    return _REF_RE.sub(_link, text)
 
 
 KB_ARTICLE_PROMPT = """\
@@ -129,4 +175,4 @@ def generate_kb_article(
         SystemMessage(content=KB_ARTICLE_PROMPT),
         HumanMessage(content=user_message),
     ])
-    return str(response.content) if response.content else ""
+    return content_text(response.content)
@@ -1,20 +1,31 @@
 """Retrieval: embed query, search Weaviate, return SearchResults."""
 
 import logging
+import sys
 
 from multimodal_rag.models.chunks import SourceType
 from multimodal_rag.models.query import SearchResult
+from multimodal_rag.query.cache import RetrievalCache
 from multimodal_rag.store.weaviate import WeaviateStore
 
 logger = logging.getLogger(__name__)
 
+# Plain dict lookup instead of the Enum constructor for every hit
+_SOURCE_TYPES = {t.value: t for t in SourceType}
+
 
 def _distance_to_score(distance: float | None) -> float:
     """Convert Weaviate cosine distance to a 0-1 relevance score."""
     if distance is None:
         return 0.0
-    # Weaviate cosine distance: 0 = identical, 2 = opposite
-    return max(0.0, 1.0 - distance)
+    # Weaviate cosine distance: 0 = identical, 2 = opposite. A comparison
+    # instead of max() skips a builtin call per hit
+    score = 1.0 - distance
+    return score if score > 0.0 else 0.0
+
+
+def _source_type(value: str) -> SourceType:
+    return _SOURCE_TYPES.get(value) or SourceType(value)
 
 
 def _build_results(raw: list[dict]) -> list[SearchResult]:
@@ -22,14 +33,17 @@ def _build_results(raw: list[dict]) -> list[SearchResult]:
     for hit in raw:
         score = _distance_to_score(hit.get("_distance"))
         ts = hit.get("timestamp_seconds")
+        # TEXT properties come back as str (or None when unset), so no str().
+        # Every hit decodes fresh copies of its URL and name; interning them
+        # keeps one copy per source across the answer and retrieval caches
         results.append(
             SearchResult(
-                text=str(hit.get("text", "")),
-                source_type=SourceType(str(hit.get("source_type", "web"))),
-                source_url=str(hit.get("source_url", "")),
-                source_name=str(hit.get("source_name", "")),
+                text=hit.get("text") or "",
+                source_type=_source_type(hit.get("source_type") or "web"),
+                source_url=sys.intern(hit.get("source_url") or ""),
+                source_name=sys.intern(hit.get("source_name") or ""),
                 timestamp_seconds=int(ts) if ts is not None else None,
-                section_heading=str(hit.get("section_heading") or "") or None,
+                section_heading=hit.get("section_heading") or None,
                 relevance_score=score,
             )
         )
@@ -40,22 +54,45 @@ def retrieve(
     query: str,
     store: WeaviateStore,
     top_k: int = 5,
+    query_vector: list[float] | None = None,
+    cache: RetrievalCache | None = None,
 ) -> list[SearchResult]:
     """Embed query, search Weaviate, return ranked SearchResults.
 
     Fetches a larger candidate pool and guarantees at least half the results
     are video chunks, so video content is not crowded out by web chunks.
+    Pass query_vector when the query has already been embedded. With a
+    cache, results of an earlier near-identical query are reused without
+    searching.
     """
-    pool = _build_results(store.search(query, top_k=top_k * 4))
-
-    videos = [r for r in pool if r.source_type == SourceType.VIDEO]
-    web = [r for r in pool if r.source_type != SourceType.VIDEO]
+    if cache is not None:
+        if query_vector is None:
+            query_vector = store.embed_query(query)
+        cached = cache.get(query_vector, top_k)
+        if cached is not None:
+            return cached
+
+    if query_vector is None:
+        raw = store.search(query, top_k=top_k * 4)
+    else:
+        raw = store.search_by_vector(query_vector, top_k=top_k * 4)
+
+    # Partition the raw hits (already in distance order) in one pass and
+    # build SearchResults only for the top_k that survive the video quota,
+    # not the whole top_k * 4 candidate pool
+    videos: list[dict] = []
+    web: list[dict] = []
+    for hit in raw:
+        if _source_type(hit.get("source_type") or "web") is SourceType.VIDEO:
+            videos.append(hit)
+        else:
+            web.append(hit)
 
     n_video = min(len(videos), (top_k + 1) // 2)
     n_web = min(len(web), top_k - n_video)
 
     selected = sorted(
-        videos[:n_video] + web[:n_web],
+        _build_results(videos[:n_video] + web[:n_web]),
         key=lambda r: r.relevance_score,
         reverse=True,
     )
@@ -67,13 +104,13 @@ def retrieve(
         n_web,
         query,
     )
+    if cache is not None and query_vector is not None and selected:
+        cache.put(query_vector, top_k, selected)
     return selected
 
 
 def format_context(results: list[SearchResult]) -> str:
     """Format retrieved results as numbered context for the LLM prompt."""
-    parts: list[str] = []
-    for i, r in enumerate(results, 1):
-        label = r.citation_label
-        parts.append(f"[{i}] {label}\n{r.text}")
-    return "\n\n".join(parts)
+    return "\n\n".join(
+        [f"[{i}] {r.citation_label}\n{r.text}" for i, r in enumerate(results, 1)]
+    )
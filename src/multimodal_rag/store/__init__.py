@@ -1,9 +1,11 @@
 """Vector store and embedding utilities."""
 
+from multimodal_rag.store.cache import IngestCache
 from multimodal_rag.store.embeddings import embed_texts
 from multimodal_rag.store.weaviate import WeaviateStore
 
 __all__ = [
+    "IngestCache",
     "WeaviateStore",
     "embed_texts",
 ]
@@ -0,0 +1,250 @@
+"""SQLite cache for incremental re-ingestion.
+
+Stores a content hash per crawled page (so unchanged pages can be skipped),
+the embedding vector per chunk text (so unchanged chunks are not
+re-embedded), fetched video transcripts (so captions and Voxtral
+transcriptions are not re-downloaded) and vision descriptions of page
+images and video keyframes (so unchanged images are not described again).
+The app reads when ingestion last finished to drop its stale answer caches.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from hashlib import sha256
+from pathlib import Path
+
+from multimodal_rag.models.chunks import Segment
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (model, text_hash)
+);
+CREATE TABLE IF NOT EXISTS transcripts (
+    video_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    segments TEXT NOT NULL,
+    fetched_at INTEGER NOT NULL,
+    PRIMARY KEY (video_id, source)
+);
+CREATE TABLE IF NOT EXISTS image_descriptions (
+    image_url TEXT NOT NULL,
+    model TEXT NOT NULL,
+    description TEXT NOT NULL,
+    described_at INTEGER NOT NULL,
+    PRIMARY KEY (image_url, model)
+);
+CREATE TABLE IF NOT EXISTS frame_descriptions (
+    frame_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    description TEXT NOT NULL,
+    described_at INTEGER NOT NULL,
+    PRIMARY KEY (frame_hash, model, mode)
+);
+CREATE TABLE IF NOT EXISTS ingest_runs (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    finished_at REAL NOT NULL
+);
+"""
+
+
+def content_hash(text: str) -> str:
+    """Return the hex SHA-256 of text, used as the cache key."""
+    return sha256(text.encode()).hexdigest()
+
+
+class IngestCache:
+    """Page hashes and chunk embeddings persisted in a local SQLite file.
+
+    Embeddings are keyed on (embedding_model, text hash), so switching
+    models never returns stale vectors. Vectors are stored as float32.
+    Transcripts are keyed on (video_id, source), e.g. "captions" or
+    "voxtral". Image descriptions are keyed on (image_url, vision model),
+    keyframe descriptions on (JPEG hash, vision model, prompt mode).
+    Safe to share across ingest worker threads.
+    """
+
+    def __init__(self, path: Path | str, embedding_model: str) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._model = embedding_model
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "IngestCache":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def page_hash(self, url: str) -> str | None:
+        """Return the content hash recorded for url, or None if unseen."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        return str(row[0]) if row else None
+
+    def set_page_hashes(self, hashes: dict[str, str]) -> None:
+        """Record content hashes for successfully ingested pages (url → hash)."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages (url, content_hash) VALUES (?, ?)",
+                hashes.items(),
+            )
+
+    def forget_pages(self, url: str | None = None) -> None:
+        """Drop the hash recorded for url, or for every page if url is None.
+
+        Called after chunks are purged from the store, so the next ingest
+        does not skip the purged pages as unchanged.
+        """
+        with self._lock, self._conn:
+            if url is None:
+                self._conn.execute("DELETE FROM pages")
+            else:
+                self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+
+    def get_vectors(self, texts: list[str]) -> list[list[float] | None]:
+        """Look up cached vectors for texts, None where not cached."""
+        with self._lock:
+            rows = [
+                self._conn.execute(
+                    "SELECT vector FROM embeddings WHERE model = ? AND text_hash = ?",
+                    (self._model, content_hash(text)),
+                ).fetchone()
+                for text in texts
+            ]
+        vectors: list[list[float] | None] = []
+        for row in rows:
+            if row is None:
+                vectors.append(None)
+                continue
+            vec = array("f")
+            vec.frombytes(row[0])
+            vectors.append(vec.tolist())
+        return vectors
+
+    def put_vectors(self, texts: list[str], vectors: list[list[float]]) -> None:
+        """Store vectors for texts, replacing any existing entries."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) "
+                "VALUES (?, ?, ?)",
+                (
+                    (self._model, content_hash(t), array("f", v).tobytes())
+                    for t, v in zip(texts, vectors)
+                ),
+            )
+
+    def get_transcript(
+        self, video_id: str, source: str, max_age_seconds: float
+    ) -> list[Segment] | None:
+        """Return cached transcript segments, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT segments, fetched_at FROM transcripts "
+                "WHERE video_id = ? AND source = ?",
+                (video_id, source),
+            ).fetchone()
+        if row is None or time.time() - row[1] > max_age_seconds:
+            return None
+        return [Segment(*s) for s in json.loads(row[0])]
+
+    def put_transcript(
+        self, video_id: str, source: str, segments: list[Segment]
+    ) -> None:
+        """Store transcript segments for a video, replacing any existing entry."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts "
+                "(video_id, source, segments, fetched_at) VALUES (?, ?, ?, ?)",
+                (video_id, source, json.dumps(segments), int(time.time())),
+            )
+
+    def get_image_descriptions(
+        self, image_urls: list[str], model: str
+    ) -> dict[str, str]:
+        """Return cached descriptions by image URL, for those that have one."""
+        with self._lock:
+            rows = [
+                self._conn.execute(
+                    "SELECT description FROM image_descriptions "
+                    "WHERE image_url = ? AND model = ?",
+                    (url, model),
+                ).fetchone()
+                for url in image_urls
+            ]
+        return {url: str(row[0]) for url, row in zip(image_urls, rows) if row}
+
+    def put_image_descriptions(self, descriptions: dict[str, str], model: str) -> None:
+        """Store descriptions (image URL → text), replacing existing entries."""
+        now = int(time.time())
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO image_descriptions "
+                "(image_url, model, description, described_at) VALUES (?, ?, ?, ?)",
+                ((url, model, text, now) for url, text in descriptions.items()),
+            )
+
+    def get_frame_descriptions(
+        self, frame_hashes: list[str], model: str, mode: str
+    ) -> dict[str, str]:
+        """Return cached keyframe descriptions by frame hash, where present."""
+        with self._lock:
+            rows = [
+                self._conn.execute(
+                    "SELECT description FROM frame_descriptions "
+                    "WHERE frame_hash = ? AND model = ? AND mode = ?",
+                    (frame_hash, model, mode),
+                ).fetchone()
+                for frame_hash in frame_hashes
+            ]
+        return {h: str(row[0]) for h, row in zip(frame_hashes, rows) if row}
+
+    def put_frame_descriptions(
+        self, descriptions: dict[str, str], model: str, mode: str
+    ) -> None:
+        """Store keyframe descriptions (frame hash → text), replacing existing ones."""
+        now = int(time.time())
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO frame_descriptions "
+                "(frame_hash, model, mode, description, described_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ((h, model, mode, text, now) for h, text in descriptions.items()),
+            )
+
+    def mark_ingest_finished(self) -> None:
+        """Record that an ingest run just finished writing to the store."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ingest_runs (id, finished_at) VALUES (1, ?)",
+                (time.time(),),
+            )
+
+    def last_ingest_finished(self) -> float | None:
+        """Return when an ingest run last finished (epoch seconds), if ever."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT finished_at FROM ingest_runs WHERE id = 1"
+            ).fetchone()
+        return float(row[0]) if row else None
@@ -1,55 +1,182 @@
 """Text embedding via LangChain Embeddings interface."""
 
 import logging
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 
+import numpy as np
 from langchain_core.embeddings import Embeddings
 
 logger = logging.getLogger(__name__)
 
-_BATCH_SIZE = 5
+# Texts per embedding request: a full ingest flush (128 chunks) goes out as
+# a handful of parallel requests; 32 x _MAX_WORDS stays far below provider
+# per-request input and token limits
+_BATCH_SIZE = 32
 _MAX_WORDS = 400
 _RETRY_MAX_WORDS = 200
+# Batch requests in flight at once (kept low to respect provider rate limits)
+_MAX_CONCURRENT_BATCHES = 8
 
 
 def _truncate(text: str, max_words: int = _MAX_WORDS) -> str:
-    """Truncate text to max_words to stay within model context limits."""
-    words = text.split()
+    """Truncate text to max_words to stay within model context limits.
+
+    Splits at most max_words times, so long texts are not split in full.
+    """
+    # Words need a separator between them, so a text of at most 2 * max_words
+    # characters holds at most max_words words: no split needed
+    if len(text) <= 2 * max_words:
+        return text
+    words = text.split(None, max_words)
     if len(words) <= max_words:
         return text
-    logger.warning("Truncating text from %d to %d words", len(words), max_words)
+    logger.warning("Truncating text of more than %d words", max_words)
     return " ".join(words[:max_words])
 
 
+def _normalize(vectors: list[list[float]]) -> list[list[float]]:
+    """Scale vectors to unit L2 norm in one vectorized pass (zero rows kept)."""
+    matrix = np.asarray(vectors, dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    result: list[list[float]] = matrix.tolist()
+    return result
+
+
+def _embed_batch(
+    batch: list[str], start: int, embeddings: Embeddings
+) -> list[list[float]]:
+    """Truncate and embed one batch, retrying harder on context errors.
+
+    Truncation happens here, in the worker, so the first request is sent
+    without waiting for every text to be truncated.
+    """
+    try:
+        return embeddings.embed_documents([_truncate(t) for t in batch])
+    except Exception as exc:
+        if "context length" not in str(exc).lower():
+            raise
+        logger.warning(
+            "Context length error on batch %d-%d, retrying with %d-word limit",
+            start,
+            start + len(batch),
+            _RETRY_MAX_WORDS,
+        )
+        retry_batch = [_truncate(t, _RETRY_MAX_WORDS) for t in batch]
+        return embeddings.embed_documents(retry_batch)
+
+
 def embed_texts(
     texts: list[str],
     embeddings: Embeddings,
 ) -> list[list[float]]:
     """Embed a list of texts, returning vectors.
 
-    Batches requests to stay within API limits.
+    Batches requests to stay within API limits, with up to
+    _MAX_CONCURRENT_BATCHES batches in flight at once; results keep the
+    input order.
     On context-length errors, retries the failing batch with aggressive truncation.
+    Vectors are returned unit-normalized, whatever the provider returns, so
+    cosine search and the semantic caches compare like with like.
     """
     if not texts:
         return []
 
-    safe_texts = [_truncate(t) for t in texts]
-    all_embeddings: list[list[float]] = []
-    for i in range(0, len(safe_texts), _BATCH_SIZE):
-        batch = safe_texts[i : i + _BATCH_SIZE]
-        try:
-            batch_embeddings = embeddings.embed_documents(batch)
-        except Exception as exc:
-            if "context length" not in str(exc).lower():
-                raise
-            logger.warning(
-                "Context length error on batch %d-%d, retrying with %d-word limit",
-                i,
-                i + len(batch),
-                _RETRY_MAX_WORDS,
+    starts = range(0, len(texts), _BATCH_SIZE)
+    batches = [texts[i : i + _BATCH_SIZE] for i in starts]
+    if len(batches) == 1:
+        results = [_embed_batch(batches[0], 0, embeddings)]
+    else:
+        workers = min(_MAX_CONCURRENT_BATCHES, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(_embed_batch, batches, starts, [embeddings] * len(batches))
             )
-            retry_batch = [_truncate(t, _RETRY_MAX_WORDS) for t in batch]
-            batch_embeddings = embeddings.embed_documents(retry_batch)
-        all_embeddings.extend(batch_embeddings)
 
+    all_embeddings = _normalize([vector for batch in results for vector in batch])
     logger.info("Embedded %d texts", len(texts))
     return all_embeddings
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent single-text embedding requests into batch calls.
+
+    Each embed() call queues its text and blocks on a Future. One
+    background thread sends everything queued (up to max_batch texts) as
+    a single embed_fn call, so requests that arrive while a call is in
+    flight share the next round-trip. A lone request is sent at once,
+    with no added wait. Safe to call from any number of threads.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[list[str]], list[list[float]]],
+        max_batch: int = 32,
+    ) -> None:
+        self._embed_fn = embed_fn
+        self._max_batch = max_batch
+        self._queue: queue.SimpleQueue[tuple[str, Future[list[float]]]] = (
+            queue.SimpleQueue()
+        )
+        self._start_lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+
+    def embed(self, text: str) -> list[float]:
+        """Embed one text, batched with any concurrent callers."""
+        future: Future[list[float]] = Future()
+        self._queue.put((text, future))
+        self._ensure_worker()
+        return future.result()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="embed-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                pending = [self._queue.get()]
+                while len(pending) < self._max_batch:
+                    try:
+                        pending.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                self._embed_pending(pending)
+        finally:
+            # Only reached if the thread dies. Clear it before checking the
+            # queue, so a text queued meanwhile is picked up by a new worker
+            # either here or by its caller's _ensure_worker
+            self._worker = None
+            if not self._queue.empty():
+                self._ensure_worker()
+
+    def _embed_pending(self, pending: list[tuple[str, Future[list[float]]]]) -> None:
+        """Embed one batch and resolve every one of its futures."""
+        try:
+            vectors = self._embed_fn([text for text, _ in pending])
+            if len(vectors) != len(pending):
+                raise ValueError(
+                    f"Expected {len(pending)} vectors, got {len(vectors)}"
+                )
+            if len(pending) > 1:
+                logger.debug("Embedded %d coalesced queries", len(pending))
+            for (_, future), vector in zip(pending, vectors):
+                future.set_result(vector)
+        except Exception as exc:
+            for _, future in pending:
+                future.set_exception(exc)
+        finally:
+            # A BaseException escapes the handler above; no caller may hang
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(RuntimeError("Embedding batch aborted"))
@@ -1,19 +1,89 @@
 """Weaviate vector store for SupportChunk objects."""
 
 import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import cached_property
+from hashlib import blake2b
+from uuid import UUID
 
 import weaviate
 import weaviate.classes.config as wvc
 from langchain_core.embeddings import Embeddings
 from weaviate.classes.query import Filter, MetadataQuery
+from weaviate.collections import Collection
 
 from multimodal_rag.models.chunks import SourceType, SupportChunk
-from multimodal_rag.store.embeddings import embed_texts
+from multimodal_rag.store.cache import IngestCache
+from multimodal_rag.store.embeddings import EmbeddingBatcher, embed_texts
 
 logger = logging.getLogger(__name__)
 
 COLLECTION_NAME = "SupportChunk"
 
+# HNSW build/search parameters; ef=-1 lets Weaviate pick a per-query ef of
+# limit * dynamic_ef_factor, clamped to [dynamic_ef_min, dynamic_ef_max]
+_HNSW_EF_CONSTRUCTION = 128
+_HNSW_MAX_CONNECTIONS = 16
+_HNSW_DYNAMIC_EF_MIN = 100
+_HNSW_DYNAMIC_EF_MAX = 500
+
+# Scalar quantization compresses HNSW vectors to 8 bits once the collection
+# holds SQ's training_limit objects; top results are rescored at full
+# precision, so keep this above the retriever's candidate pool (top_k * 4)
+_SQ_RESCORE_LIMIT = 100
+
+# Objects per batch insert request, and insert requests in flight at once
+_INSERT_BATCH_SIZE = 200
+_INSERT_CONCURRENCY = 4
+
+# Query embeddings kept for repeat searches: entry count and lifetime
+_QUERY_CACHE_SIZE = 2000
+_QUERY_CACHE_TTL_SECONDS = 300.0
+
+
+class _QueryVectorCache:
+    """LRU cache of query embeddings with a TTL, safe across threads."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        # blake2b(query) → (expiry on the monotonic clock, vector)
+        self._entries: OrderedDict[bytes, tuple[float, list[float]]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(query: str) -> bytes:
+        return blake2b(query.encode(), digest_size=16).digest()
+
+    def get(self, key: bytes) -> list[float] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key: bytes, vector: list[float]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def info(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._entries),
+            }
+
 
 class WeaviateStore:
     """Manages SupportChunk storage and retrieval in Weaviate."""
@@ -22,8 +92,14 @@ class WeaviateStore:
         self,
         weaviate_url: str,
         embeddings: Embeddings,
+        cache: IngestCache | None = None,
     ) -> None:
         self._embeddings = embeddings
+        self._cache = cache
+        self._query_vectors = _QueryVectorCache(
+            _QUERY_CACHE_SIZE, _QUERY_CACHE_TTL_SECONDS
+        )
+        self._query_embedder = EmbeddingBatcher(self._embed)
         host = weaviate_url.replace("http://", "").split(":")[0]
         tail = weaviate_url.rsplit("/", 1)[-1]
         port = int(weaviate_url.split(":")[-1]) if ":" in tail else 8080
@@ -38,6 +114,11 @@ class WeaviateStore:
     def __exit__(self, *args: object) -> None:
         self.close()
 
+    @cached_property
+    def _collection(self) -> Collection:
+        """Handle to the SupportChunk collection, built once per store."""
+        return self._client.collections.get(COLLECTION_NAME)
+
     def ensure_collection(self) -> None:
         """Create the SupportChunk collection if it doesn't exist."""
         if self._client.collections.exists(COLLECTION_NAME):
@@ -47,6 +128,16 @@ class WeaviateStore:
         self._client.collections.create(
             name=COLLECTION_NAME,
             vectorizer_config=wvc.Configure.Vectorizer.none(),
+            vector_index_config=wvc.Configure.VectorIndex.hnsw(
+                ef_construction=_HNSW_EF_CONSTRUCTION,
+                max_connections=_HNSW_MAX_CONNECTIONS,
+                ef=-1,
+                dynamic_ef_min=_HNSW_DYNAMIC_EF_MIN,
+                dynamic_ef_max=_HNSW_DYNAMIC_EF_MAX,
+                quantizer=wvc.Configure.VectorIndex.Quantizer.sq(
+                    rescore_limit=_SQ_RESCORE_LIMIT
+                )
+            ),
             properties=[
                 wvc.Property(name="text", data_type=wvc.DataType.TEXT),
                 wvc.Property(name="source_type", data_type=wvc.DataType.TEXT),
@@ -62,7 +153,7 @@ class WeaviateStore:
 
     def delete_by_source(self, source_url: str) -> int:
         """Delete all chunks matching source_url. Returns count deleted."""
-        collection = self._client.collections.get(COLLECTION_NAME)
+        collection = self._collection
         result = collection.data.delete_many(
             where=Filter.by_property("source_url").equal(source_url)
         )
@@ -72,7 +163,7 @@ class WeaviateStore:
 
     def delete_by_source_type(self, source_type: str) -> int:
         """Delete all chunks matching source_type ('video' or 'web'). Returns count."""
-        collection = self._client.collections.get(COLLECTION_NAME)
+        collection = self._collection
         result = collection.data.delete_many(
             where=Filter.by_property("source_type").equal(source_type)
         )
@@ -85,40 +176,62 @@ class WeaviateStore:
         if self._client.collections.exists(COLLECTION_NAME):
             self._client.collections.delete(COLLECTION_NAME)
             logger.info("Deleted collection %s", COLLECTION_NAME)
+        self.__dict__.pop("_collection", None)
 
     def _embed(self, texts: list[str]) -> list[list[float]]:
         return embed_texts(texts, embeddings=self._embeddings)
 
+    def _embed_cached(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, reusing vectors from the ingest cache when available."""
+        if self._cache is None:
+            return self._embed(texts)
+
+        cached = self._cache.get_vectors(texts)
+        missing = [t for t, v in zip(texts, cached) if v is None]
+        fresh = self._embed(missing)
+        self._cache.put_vectors(missing, fresh)
+        logger.info(
+            "Embedding cache: %d hits, %d misses",
+            len(texts) - len(missing),
+            len(missing),
+        )
+
+        fresh_iter = iter(fresh)
+        return [v if v is not None else next(fresh_iter) for v in cached]
+
     def add_chunks(self, chunks: list[SupportChunk]) -> int:
         """Add SupportChunks to Weaviate with embeddings. Returns count added."""
         if not chunks:
             return 0
 
         texts = [f"{c.source_name}: {c.text}" for c in chunks]
-        vectors = self._embed(texts)
+        vectors = self._embed_cached(texts)
 
-        collection = self._client.collections.get(COLLECTION_NAME)
+        collection = self._collection
         added = 0
 
-        with collection.batch.dynamic() as batch:
+        with collection.batch.fixed_size(
+            batch_size=_INSERT_BATCH_SIZE, concurrent_requests=_INSERT_CONCURRENCY
+        ) as batch:
             for chunk, vector in zip(chunks, vectors):
-                props = {
-                    "text": chunk.text,
-                    "source_type": chunk.source_type.value,
-                    "source_url": chunk.source_url,
-                    "source_name": chunk.source_name,
-                    "timestamp_seconds": chunk.timestamp_seconds,
-                    "section_heading": chunk.section_heading or "",
-                    "url_hash": chunk.url_hash,
-                    "ingested_at": chunk.ingested_at.isoformat(),
-                }
                 batch.add_object(
-                    properties=props,
+                    properties=chunk.to_weaviate_properties(),
                     vector=vector,
                     uuid=chunk.chunk_id,
                 )
                 added += 1
 
+        # The batch context swallows per-object errors; surface them here
+        failed = collection.batch.failed_objects
+        if failed:
+            logger.error(
+                "%d of %d chunks failed to insert, first error: %s",
+                len(failed),
+                added,
+                failed[0].message,
+            )
+            added -= len(failed)
+
         logger.info("Added %d chunks to %s", added, COLLECTION_NAME)
         return added
 
@@ -128,13 +241,38 @@ class WeaviateStore:
         top_k: int = 5,
     ) -> list[dict]:
         """Search for similar chunks, returning properties + distance."""
-        vectors = self._embed([query])
-        if not vectors:
-            return []
+        return self.search_by_vector(self.embed_query(query), top_k=top_k)
+
+    def embed_query(self, query: str) -> list[float]:
+        """Embed a query with the store's embedding model.
+
+        Repeat queries within _QUERY_CACHE_TTL_SECONDS reuse the vector
+        instead of another embedding round-trip. Query vectors stay in this
+        bounded in-memory cache only: every distinct question would
+        otherwise add a row to the IngestCache's document embeddings
+        forever. Misses from concurrent callers are coalesced into shared
+        embedding requests.
+        """
+        key = self._query_vectors.key(query)
+        vector = self._query_vectors.get(key)
+        if vector is None:
+            vector = self._query_embedder.embed(query)
+            self._query_vectors.put(key, vector)
+        return vector
 
-        collection = self._client.collections.get(COLLECTION_NAME)
+    def query_cache_info(self) -> dict[str, int]:
+        """Hit/miss counts and size of the query embedding cache."""
+        return self._query_vectors.info()
+
+    def search_by_vector(
+        self,
+        vector: list[float],
+        top_k: int = 5,
+    ) -> list[dict]:
+        """Search with a precomputed query vector (see embed_query)."""
+        collection = self._collection
         response = collection.query.near_vector(
-            near_vector=vectors[0],
+            near_vector=vector,
             limit=top_k,
             return_metadata=MetadataQuery(distance=True),
         )
@@ -151,8 +289,20 @@ class WeaviateStore:
 
         return results
 
+    def existing_ids(self, ids: list[UUID]) -> set[UUID]:
+        """Return the subset of ids already stored, in one query."""
+        if not ids:
+            return set()
+        collection = self._collection
+        response = collection.query.fetch_objects(
+            filters=Filter.by_id().contains_any(ids),
+            limit=len(ids),
+            return_properties=[],
+        )
+        return {obj.uuid for obj in response.objects}
+
     def count(self) -> int:
         """Return total number of objects in the collection."""
-        collection = self._client.collections.get(COLLECTION_NAME)
+        collection = self._collection
         result = collection.aggregate.over_all(total_count=True)
         return result.total_count or 0
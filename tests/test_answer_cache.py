@@ -0,0 +1,155 @@
+"""Tests for the in-memory answer and retrieval caches."""
+
+from unittest.mock import MagicMock, patch
+
+from multimodal_rag.models.chunks import SourceType
+from multimodal_rag.models.query import CitedAnswer, SearchResult
+from multimodal_rag.query.cache import AnswerCache, RetrievalCache
+
+
+def _answer(text: str) -> CitedAnswer:
+    return CitedAnswer(answer=text, citations=[])
+
+
+def _results() -> list[SearchResult]:
+    return []
+
+
+class TestAnswerCache:
+    def test_exact_hit_ignores_case_and_spacing(self) -> None:
+        cache = AnswerCache()
+        cache.put("How do I reset?", "m", [1.0, 0.0], _answer("a"), _results())
+        hit = cache.get_exact("  how do i   RESET? ", "m")
+        assert hit is not None
+        assert hit[0].answer == "a"
+
+    def test_exact_miss_for_other_model(self) -> None:
+        cache = AnswerCache()
+        cache.put("q", "model-a", [1.0, 0.0], _answer("a"), _results())
+        assert cache.get_exact("q", "model-b") is None
+
+    def test_similar_hit_above_threshold(self) -> None:
+        cache = AnswerCache(similarity_threshold=0.97)
+        cache.put("reset password", "m", [1.0, 0.0], _answer("a"), _results())
+        hit = cache.get_similar("reset my password", [0.99, 0.05], "m")
+        assert hit is not None
+        assert hit[0].answer == "a"
+
+    def test_similar_miss_below_threshold(self) -> None:
+        cache = AnswerCache(similarity_threshold=0.97)
+        cache.put("reset password", "m", [1.0, 0.0], _answer("a"), _results())
+        assert cache.get_similar("reset password", [0.5, 0.5], "m") is None
+
+    def test_similar_scoped_to_model(self) -> None:
+        cache = AnswerCache()
+        cache.put("q", "model-a", [1.0, 0.0], _answer("a"), _results())
+        assert cache.get_similar("q", [1.0, 0.0], "model-b") is None
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = AnswerCache(max_entries=2)
+        cache.put("q1", "m", [1.0, 0.0], _answer("1"), _results())
+        cache.put("q2", "m", [0.0, 1.0], _answer("2"), _results())
+        cache.get_exact("q1", "m")
+        cache.put("q3", "m", [-1.0, 0.0], _answer("3"), _results())
+        assert cache.get_exact("q1", "m") is not None
+        assert cache.get_exact("q2", "m") is None
+
+    def test_zero_size_disables_cache(self) -> None:
+        cache = AnswerCache(max_entries=0)
+        cache.put("q", "m", [1.0, 0.0], _answer("a"), _results())
+        assert cache.get_exact("q", "m") is None
+
+    def test_similar_miss_when_negation_differs(self) -> None:
+        cache = AnswerCache(similarity_threshold=0.97)
+        cache.put("Can I undo a sync?", "m", [1.0, 0.0], _answer("a"), _results())
+        assert cache.get_similar("Can't I undo a sync?", [1.0, 0.0], "m") is None
+        assert cache.get_similar("Can I not undo a sync?", [1.0, 0.0], "m") is None
+        assert cache.get_similar("can i undo sync", [1.0, 0.0], "m") is not None
+
+    def test_similar_skips_evicted_entries(self) -> None:
+        cache = AnswerCache(max_entries=2)
+        cache.put("q1", "m", [1.0, 0.0], _answer("1"), _results())
+        cache.put("q2", "m", [0.0, 1.0], _answer("2"), _results())
+        cache.put("q3", "m", [-1.0, 0.0], _answer("3"), _results())
+        assert cache.get_similar("q", [1.0, 0.0], "m") is None
+        hit = cache.get_similar("q", [-1.0, 0.0], "m")
+        assert hit is not None
+        assert hit[0].answer == "3"
+
+    @patch("multimodal_rag.query.cache.time.monotonic")
+    def test_entries_expire_after_ttl(self, mock_monotonic: MagicMock) -> None:
+        cache = AnswerCache(ttl_seconds=60)
+        mock_monotonic.return_value = 100.0
+        cache.put("q", "m", [1.0, 0.0], _answer("a"), _results())
+        mock_monotonic.return_value = 159.0
+        assert cache.get_exact("q", "m") is not None
+        mock_monotonic.return_value = 161.0
+        assert cache.get_similar("q", [1.0, 0.0], "m") is None
+        assert cache.get_exact("q", "m") is None
+
+    def test_clear_drops_all_entries(self) -> None:
+        cache = AnswerCache()
+        cache.put("q", "m", [1.0, 0.0], _answer("a"), _results())
+        cache.clear()
+        assert cache.get_exact("q", "m") is None
+        assert cache.get_similar("q", [1.0, 0.0], "m") is None
+        cache.put("q", "m", [1.0, 0.0], _answer("b"), _results())
+        hit = cache.get_exact("q", "m")
+        assert hit is not None
+        assert hit[0].answer == "b"
+
+
+def _result(text: str) -> SearchResult:
+    return SearchResult(
+        text=text,
+        source_type=SourceType.WEB,
+        source_url="https://docs.example.com",
+        source_name="Docs",
+        relevance_score=0.9,
+    )
+
+
+class TestRetrievalCache:
+    def test_similar_hit_above_threshold(self) -> None:
+        cache = RetrievalCache(similarity_threshold=0.97)
+        cache.put([1.0, 0.0], 5, [_result("a")])
+        hit = cache.get([0.99, 0.05], 5)
+        assert hit is not None
+        assert hit[0].text == "a"
+
+    def test_miss_below_threshold_or_other_top_k(self) -> None:
+        cache = RetrievalCache(similarity_threshold=0.97)
+        cache.put([1.0, 0.0], 5, [_result("a")])
+        assert cache.get([0.5, 0.5], 5) is None
+        assert cache.get([1.0, 0.0], 10) is None
+
+    def test_evicts_oldest_when_full(self) -> None:
+        cache = RetrievalCache(max_entries=2)
+        cache.put([1.0, 0.0], 5, [_result("1")])
+        cache.put([0.0, 1.0], 5, [_result("2")])
+        cache.put([-1.0, 0.0], 5, [_result("3")])
+        assert cache.get([1.0, 0.0], 5) is None
+        hit = cache.get([-1.0, 0.0], 5)
+        assert hit is not None
+        assert hit[0].text == "3"
+
+    def test_disabled_when_size_zero(self) -> None:
+        cache = RetrievalCache(max_entries=0)
+        cache.put([1.0, 0.0], 5, [_result("a")])
+        assert cache.get([1.0, 0.0], 5) is None
+
+    @patch("multimodal_rag.query.cache.time.monotonic")
+    def test_entries_expire_after_ttl(self, mock_monotonic: MagicMock) -> None:
+        cache = RetrievalCache(ttl_seconds=60)
+        mock_monotonic.return_value = 100.0
+        cache.put([1.0, 0.0], 5, [_result("a")])
+        mock_monotonic.return_value = 159.0
+        assert cache.get([1.0, 0.0], 5) is not None
+        mock_monotonic.return_value = 161.0
+        assert cache.get([1.0, 0.0], 5) is None
+
+    def test_clear_drops_all_entries(self) -> None:
+        cache = RetrievalCache()
+        cache.put([1.0, 0.0], 5, [_result("a")])
+        cache.clear()
+        assert cache.get([1.0, 0.0], 5) is None
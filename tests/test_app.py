@@ -4,13 +4,16 @@ import re
 from pathlib import Path
 
 from multimodal_rag.app import (
+    _build_llm,
     _format_citations_block,
     _format_step1,
     _format_step2,
+    _make_llm,
     _slugify,
     save_kb_article,
 )
 from multimodal_rag.models.chunks import SourceType
+from multimodal_rag.models.config import AppSettings
 from multimodal_rag.models.query import Citation, CitedAnswer, SearchResult
 
 
@@ -220,3 +223,20 @@ class TestSaveKbArticle:
         nested = tmp_path / "sub" / "kb"
         path_str = save_kb_article("Test", "Body.", output_dir=nested)
         assert Path(path_str).exists()
+
+
+class TestMakeLlm:
+    def setup_method(self) -> None:
+        _build_llm.cache_clear()
+
+    def test_reuses_client_for_same_model(self) -> None:
+        settings = AppSettings(openrouter_api_key="key")
+        first = _make_llm("openai/gpt-4o-mini", settings)
+        second = _make_llm("openai/gpt-4o-mini", settings)
+        assert first is second
+
+    def test_distinct_clients_per_model(self) -> None:
+        settings = AppSettings(openrouter_api_key="key")
+        a = _make_llm("openai/gpt-4o-mini", settings)
+        b = _make_llm("deepseek/deepseek-v3.2", settings)
+        assert a is not b
@@ -0,0 +1,104 @@
+"""Tests for the SQLite ingest cache."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from multimodal_rag.models.chunks import Segment
+from multimodal_rag.store.cache import IngestCache, content_hash
+
+
+class TestPageHashes:
+    def test_unseen_page_returns_none(self, tmp_path: Path) -> None:
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            assert cache.page_hash("https://ex.com/a") is None
+
+    def test_round_trip_and_replace(self, tmp_path: Path) -> None:
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            cache.set_page_hashes({"https://ex.com/a": content_hash("v1")})
+            cache.set_page_hashes({"https://ex.com/a": content_hash("v2")})
+            assert cache.page_hash("https://ex.com/a") == content_hash("v2")
+
+    def test_forget_one_page_or_all(self, tmp_path: Path) -> None:
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            cache.set_page_hashes({"https://ex.com/a": "h1", "https://ex.com/b": "h2"})
+            cache.forget_pages("https://ex.com/a")
+            assert cache.page_hash("https://ex.com/a") is None
+            assert cache.page_hash("https://ex.com/b") == "h2"
+            cache.forget_pages()
+            assert cache.page_hash("https://ex.com/b") is None
+
+    def test_persists_across_instances(self, tmp_path: Path) -> None:
+        path = tmp_path / "nested" / "c.db"
+        with IngestCache(path, embedding_model="m") as cache:
+            cache.set_page_hashes({"https://ex.com/a": "abc"})
+        with IngestCache(path, embedding_model="m") as cache:
+            assert cache.page_hash("https://ex.com/a") == "abc"
+
+
+class TestVectors:
+    def test_missing_texts_return_none(self, tmp_path: Path) -> None:
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            cache.put_vectors(["known"], [[0.5, 0.25]])
+            assert cache.get_vectors(["known", "unknown"]) == [[0.5, 0.25], None]
+
+    def test_keyed_on_embedding_model(self, tmp_path: Path) -> None:
+        path = tmp_path / "c.db"
+        with IngestCache(path, embedding_model="model-a") as cache:
+            cache.put_vectors(["text"], [[1.0]])
+        with IngestCache(path, embedding_model="model-b") as cache:
+            assert cache.get_vectors(["text"]) == [None]
+
+
+class TestTranscripts:
+    _SEGMENTS = [Segment("Hello", 0.0, 1.5)]
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            cache.put_transcript("vid", "captions", self._SEGMENTS)
+            assert cache.get_transcript("vid", "captions", 60) == self._SEGMENTS
+            assert cache.get_transcript("vid", "voxtral", 60) is None
+
+    @patch("multimodal_rag.store.cache.time.time")
+    def test_expired_entry_returns_none(
+        self, mock_time: MagicMock, tmp_path: Path
+    ) -> None:
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            mock_time.return_value = 1000.0
+            cache.put_transcript("vid", "captions", self._SEGMENTS)
+            mock_time.return_value = 1061.0
+            assert cache.get_transcript("vid", "captions", 60) is None
+
+
+class TestImageDescriptions:
+    def test_round_trip_scoped_per_model(self, tmp_path: Path) -> None:
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            cache.put_image_descriptions({"https://x/a.png": "A chart"}, "vis-1")
+            urls = ["https://x/a.png", "https://x/b.png"]
+            assert cache.get_image_descriptions(urls, "vis-1") == {
+                "https://x/a.png": "A chart"
+            }
+            assert cache.get_image_descriptions(urls, "vis-2") == {}
+
+
+
+class TestFrameDescriptions:
+    def test_round_trip_scoped_per_model_and_mode(self, tmp_path: Path) -> None:
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            cache.put_frame_descriptions({"h1": "A dialog"}, "vis-1", "describe")
+            assert cache.get_frame_descriptions(["h1", "h2"], "vis-1", "describe") == {
+                "h1": "A dialog"
+            }
+            assert cache.get_frame_descriptions(["h1"], "vis-1", "transcribe") == {}
+            assert cache.get_frame_descriptions(["h1"], "vis-2", "describe") == {}
+
+
+class TestIngestRuns:
+    @patch("multimodal_rag.store.cache.time.time", return_value=1_700_000_000.0)
+    def test_last_finished_run_is_shared_via_file(
+        self, _mock_time: MagicMock, tmp_path: Path
+    ) -> None:
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as app_cache:
+            assert app_cache.last_ingest_finished() is None
+            with IngestCache(tmp_path / "c.db", embedding_model="m") as ingest:
+                ingest.mark_ingest_finished()
+            assert app_cache.last_ingest_finished() == 1_700_000_000.0
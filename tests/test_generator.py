@@ -1,8 +1,9 @@
 """Tests for cited answer generation."""
 
+from dataclasses import replace
 from unittest.mock import MagicMock
 
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, AIMessageChunk
 
 from multimodal_rag.models.chunks import SourceType
 from multimodal_rag.models.query import Citation, CitedAnswer, SearchResult
@@ -13,6 +14,7 @@ from multimodal_rag.query.generator import (
     _replace_refs_with_links,
     generate_cited_answer,
     generate_kb_article,
+    stream_cited_answer,
 )
 
 
@@ -81,6 +83,12 @@ class TestReplaceRefsWithLinks:
         assert "[99]" in replaced
         assert "[1]" not in replaced
 
+    def test_inserted_links_are_not_rewritten(self) -> None:
+        stepped = replace(_web_result(), section_heading="Step [2]")
+        results = [stepped, _video_result()]
+        replaced = _replace_refs_with_links("See [1].", results)
+        assert replaced == f"See {stepped.citation_markdown}."
+
 
 class TestGenerateCitedAnswer:
     def test_empty_results_returns_fallback(self) -> None:
@@ -172,3 +180,65 @@ class TestGenerateKbArticle:
         result = generate_kb_article(answer, llm=mock_llm)
         assert result == "Draft."
         mock_llm.invoke.assert_called_once()
+
+
+class TestStreamCitedAnswer:
+    def test_no_results_yields_fallback(self) -> None:
+        mock_llm = MagicMock()
+        answers = list(stream_cited_answer("test?", [], llm=mock_llm))
+        assert len(answers) == 1
+        assert "couldn't find" in answers[0].answer
+        mock_llm.stream.assert_not_called()
+
+    def test_yields_partials_then_final_with_citations(self) -> None:
+        mock_llm = MagicMock()
+        mock_llm.stream.return_value = [
+            AIMessageChunk(content="Use File > New"),
+            AIMessageChunk(content=""),
+            AIMessageChunk(content=" [1]."),
+        ]
+        results = [_video_result()]
+
+        answers = list(stream_cited_answer("How?", results, llm=mock_llm))
+
+        assert [a.answer for a in answers[:-1]] == [
+            "Use File > New",
+            "Use File > New [1].",
+        ]
+        assert all(not a.citations for a in answers[:-1])
+        final = answers[-1]
+        assert "[1]" not in final.answer
+        assert "Quickstart @ 00:42" in final.answer
+        assert len(final.citations) == 1
+
+    def test_content_blocks_yield_their_text(self) -> None:
+        mock_llm = MagicMock()
+        mock_llm.stream.return_value = [
+            AIMessageChunk(content=[{"type": "text", "text": "Use File"}]),
+            AIMessageChunk(content=[{"type": "reasoning", "reasoning": "hmm"}]),
+            AIMessageChunk(content=[" > New", {"type": "text", "text": " [1]."}]),
+        ]
+        results = [_video_result()]
+
+        answers = list(stream_cited_answer("How?", results, llm=mock_llm))
+
+        assert [a.answer for a in answers[:-1]] == [
+            "Use File",
+            "Use File > New [1].",
+        ]
+        assert "Quickstart @ 00:42" in answers[-1].answer
+
+    def test_final_matches_non_streaming(self) -> None:
+        results = [_video_result(), _web_result()]
+        stream_llm = MagicMock()
+        stream_llm.stream.return_value = [
+            AIMessageChunk(content="See [1] "),
+            AIMessageChunk(content="and [2]."),
+        ]
+        invoke_llm = MagicMock()
+        invoke_llm.invoke.return_value = AIMessage(content="See [1] and [2].")
+
+        streamed = list(stream_cited_answer("q?", results, llm=stream_llm))[-1]
+        blocking = generate_cited_answer("q?", results, llm=invoke_llm)
+
+        assert streamed == blocking
@@ -1,9 +1,22 @@
 """Tests for the ingestion CLI orchestrator."""
 
+import threading
+from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
-from multimodal_rag.ingest.__main__ import load_sources, run
-from multimodal_rag.models.chunks import TranscriptChunk
+from multimodal_rag.ingest.__main__ import (
+    _ingested_image_urls,
+    _stored_page_urls,
+    load_sources,
+    run,
+)
+from multimodal_rag.models.chunks import (
+    TranscriptChunk,
+    screenshot_chunk_id,
+    web_chunk_id,
+)
+from multimodal_rag.store.cache import IngestCache
 
 
 class TestLoadSources:
@@ -12,17 +25,36 @@ class TestLoadSources:
         assert len(sources.youtube) >= 1
         assert sources.youtube[0].name is not None
 
-
-def _make_settings(vision_model: str = "") -> MagicMock:
-    settings = MagicMock()
-    settings.log_level = "WARNING"
-    settings.chunk_size = 400
-    settings.firecrawl_api_key = "fake"
-    settings.weaviate_url = "http://localhost:8080"
-    settings.mistral_api_key = ""
-    settings.vision_model = vision_model
-    settings.youtube_cookies_file = ""
-    return settings
+    def test_parses_custom_sources_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "sources.yaml"
+        path.write_text(
+            "youtube:\n"
+            "  - url: https://www.youtube.com/watch?v=abc\n"
+            "    name: Intro\n"
+            "    skip_voxtral: true\n"
+        )
+        with patch("multimodal_rag.ingest.__main__.SOURCES_PATH", path):
+            sources = load_sources()
+        assert [yt.name for yt in sources.youtube] == ["Intro"]
+        assert sources.youtube[0].skip_voxtral is True
+
+
+def _make_settings(vision_model: str = "") -> SimpleNamespace:
+    # Plain attributes rather than a MagicMock: run() reads settings in its
+    # loops, and a misspelt attribute should fail instead of returning a mock
+    return SimpleNamespace(
+        log_level="WARNING",
+        chunk_size=400,
+        firecrawl_api_key="fake",
+        weaviate_url="http://localhost:8080",
+        mistral_api_key="",
+        vision_model=vision_model,
+        vision_images_per_call=1,
+        youtube_cookies_file="",
+        ingest_cache_path="",
+        embedding_model="test-embed",
+        transcript_cache_ttl_days=30,
+    )
 
 
 def _make_store() -> MagicMock:
@@ -37,12 +69,54 @@ def _setup_store_cls(mock_store_cls: MagicMock, mock_store: MagicMock) -> None:
     mock_store_cls.return_value.__exit__ = MagicMock(return_value=False)
 
 
+class TestIngestedImageUrls:
+    def test_maps_stored_ids_back_to_urls(self) -> None:
+        store = MagicMock()
+        store.existing_ids.return_value = {screenshot_chunk_id("https://x/a.png")}
+        markdown = "![A](https://x/a.png) ![B](https://x/b.png)"
+
+        assert _ingested_image_urls(store, markdown) == {"https://x/a.png"}
+
+    def test_store_error_describes_everything(self) -> None:
+        store = MagicMock()
+        store.existing_ids.side_effect = RuntimeError("weaviate down")
+
+        assert _ingested_image_urls(store, "![A](https://x/a.png)") == set()
+
+
+class TestStoredPageUrls:
+    def test_needs_first_chunk_and_images_when_described(self) -> None:
+        pages = [
+            {"url": "https://x/p1", "content": "![A](https://x/a.png)"},
+            {"url": "https://x/p2", "content": "Text only"},
+        ]
+        store = MagicMock()
+        store.existing_ids.return_value = {
+            web_chunk_id("https://x/p1", 0),
+            web_chunk_id("https://x/p2", 0),
+        }
+
+        assert _stored_page_urls(store, pages, with_images=False) == {
+            "https://x/p1",
+            "https://x/p2",
+        }
+        # p1's screenshot chunk is missing, so p1 must be ingested again
+        assert _stored_page_urls(store, pages, with_images=True) == {"https://x/p2"}
+
+    def test_store_error_skips_nothing(self) -> None:
+        store = MagicMock()
+        store.existing_ids.side_effect = RuntimeError("weaviate down")
+
+        pages = [{"url": "https://x/p1", "content": "Text"}]
+        assert _stored_page_urls(store, pages, with_images=False) == set()
+
+
 class TestRun:
     @patch("multimodal_rag.ingest.__main__.WeaviateStore")
     @patch("multimodal_rag.ingest.__main__.create_embeddings")
     @patch("multimodal_rag.ingest.__main__.fetch_transcript_chunks")
     @patch("multimodal_rag.ingest.__main__.load_sources")
-    @patch("multimodal_rag.ingest.__main__.AppSettings")
+    @patch("multimodal_rag.ingest.__main__.get_settings")
     def test_ingests_youtube_per_video(
         self,
         mock_settings_cls: MagicMock,
@@ -87,6 +161,8 @@ class TestRun:
             target_tokens=400,
             mistral_api_key="",
             cookies_file="",
+            cache=None,
+            cache_ttl_days=30,
         )
         mock_store.ensure_collection.assert_called_once()
         mock_store.add_chunks.assert_called_once()
@@ -96,8 +172,8 @@ class TestRun:
     @patch("multimodal_rag.ingest.__main__.crawl_knowledge_base")
     @patch("multimodal_rag.ingest.__main__.fetch_transcript_chunks")
     @patch("multimodal_rag.ingest.__main__.load_sources")
-    @patch("multimodal_rag.ingest.__main__.AppSettings")
-    def test_ingests_kb_per_page(
+    @patch("multimodal_rag.ingest.__main__.get_settings")
+    def test_ingests_kb_batched_per_source(
         self,
         mock_settings_cls: MagicMock,
         mock_load: MagicMock,
@@ -142,14 +218,309 @@ class TestRun:
 
         run()
 
-        # add_chunks called once per page
+        # Both pages are stored in a single batched add_chunks call
+        mock_store.add_chunks.assert_called_once()
+        assert len(mock_store.add_chunks.call_args[0][0]) == 2
+
+    @patch("multimodal_rag.ingest.__main__.WeaviateStore")
+    @patch("multimodal_rag.ingest.__main__.create_embeddings")
+    @patch("multimodal_rag.ingest.__main__.crawl_knowledge_base")
+    @patch("multimodal_rag.ingest.__main__.fetch_transcript_chunks")
+    @patch("multimodal_rag.ingest.__main__.load_sources")
+    @patch("multimodal_rag.ingest.__main__.get_settings")
+    def test_kb_crawl_overlaps_youtube_fetch(
+        self,
+        mock_settings_cls: MagicMock,
+        mock_load: MagicMock,
+        mock_yt: MagicMock,
+        mock_crawl: MagicMock,
+        mock_create_emb: MagicMock,
+        mock_store_cls: MagicMock,
+    ) -> None:
+        mock_settings_cls.return_value = _make_settings()
+        mock_create_emb.return_value = MagicMock()
+
+        from multimodal_rag.models.sources import (
+            KnowledgeBaseSource,
+            SourceConfig,
+            YouTubeSource,
+        )
+
+        mock_load.return_value = SourceConfig(
+            youtube=[
+                YouTubeSource(url="https://www.youtube.com/watch?v=abc", name="T")
+            ],
+            knowledge_bases=[
+                KnowledgeBaseSource(url="https://docs.example.com", name="Docs")
+            ],
+        )
+        crawl_started = threading.Event()
+
+        def _crawl(**_: object) -> list[dict[str, str]]:
+            crawl_started.set()
+            return []
+
+        overlapped: list[bool] = []
+
+        def _fetch(**_: object) -> list[TranscriptChunk]:
+            # Sequential ingestion would only crawl after this returns
+            overlapped.append(crawl_started.wait(timeout=5))
+            return []
+
+        mock_crawl.side_effect = _crawl
+        mock_yt.side_effect = _fetch
+        _setup_store_cls(mock_store_cls, _make_store())
+
+        run()
+
+        assert overlapped == [True]
+
+    # Spacing is covered by test_throttle
+    @patch("multimodal_rag.ingest.__main__._YOUTUBE_INTERVAL_SECONDS", 0.0)
+    @patch("multimodal_rag.ingest.__main__._CRAWL_INTERVAL_SECONDS", 0.0)
+    @patch("multimodal_rag.ingest.__main__._MAX_WORKERS", 2)
+    @patch("multimodal_rag.ingest.__main__.WeaviateStore")
+    @patch("multimodal_rag.ingest.__main__.create_embeddings")
+    @patch("multimodal_rag.ingest.__main__.crawl_knowledge_base")
+    @patch("multimodal_rag.ingest.__main__.fetch_transcript_chunks")
+    @patch("multimodal_rag.ingest.__main__.load_sources")
+    @patch("multimodal_rag.ingest.__main__.get_settings")
+    def test_waiting_crawls_leave_workers_for_youtube(
+        self,
+        mock_settings_cls: MagicMock,
+        mock_load: MagicMock,
+        mock_yt: MagicMock,
+        mock_crawl: MagicMock,
+        mock_create_emb: MagicMock,
+        mock_store_cls: MagicMock,
+    ) -> None:
+        mock_settings_cls.return_value = _make_settings()
+        mock_create_emb.return_value = MagicMock()
+
+        from multimodal_rag.models.sources import (
+            KnowledgeBaseSource,
+            SourceConfig,
+            YouTubeSource,
+        )
+
+        # More KB sources than pool workers, each crawl blocked until the
+        # videos are fetched
+        mock_load.return_value = SourceConfig(
+            youtube=[
+                YouTubeSource(url=f"https://www.youtube.com/watch?v={v}", name=v)
+                for v in ("a", "b")
+            ],
+            knowledge_bases=[
+                KnowledgeBaseSource(url=f"https://kb{i}.example.com", name=f"KB{i}")
+                for i in range(4)
+            ],
+        )
+        videos: list[str] = []
+        videos_fetched = threading.Event()
+
+        def _fetch(video_url: str, **_: object) -> list[TranscriptChunk]:
+            videos.append(video_url)
+            if len(videos) == 2:
+                videos_fetched.set()
+            return []
+
+        fetched: list[bool] = []
+
+        def _crawl(**_: object) -> list[dict[str, str]]:
+            # Crawls holding every shared worker would starve the fetches
+            fetched.append(videos_fetched.wait(timeout=5))
+            return []
+
+        mock_crawl.side_effect = _crawl
+        mock_yt.side_effect = _fetch
+        _setup_store_cls(mock_store_cls, _make_store())
+
+        run()
+
+        assert fetched == [True] * 4
+
+    @patch("multimodal_rag.ingest.__main__._YOUTUBE_INTERVAL_SECONDS", 0.0)
+    @patch("multimodal_rag.ingest.__main__.logger")
+    @patch("multimodal_rag.ingest.__main__.WeaviateStore")
+    @patch("multimodal_rag.ingest.__main__.create_embeddings")
+    @patch("multimodal_rag.ingest.__main__.fetch_transcript_chunks")
+    @patch("multimodal_rag.ingest.__main__.load_sources")
+    @patch("multimodal_rag.ingest.__main__.get_settings")
+    def test_failed_store_reports_every_video_in_batch(
+        self,
+        mock_settings_cls: MagicMock,
+        mock_load: MagicMock,
+        mock_yt: MagicMock,
+        mock_create_emb: MagicMock,
+        mock_store_cls: MagicMock,
+        mock_logger: MagicMock,
+    ) -> None:
+        mock_settings_cls.return_value = _make_settings()
+        mock_create_emb.return_value = MagicMock()
+
+        from multimodal_rag.models.sources import SourceConfig, YouTubeSource
+
+        mock_load.return_value = SourceConfig(
+            youtube=[
+                YouTubeSource(url=f"https://www.youtube.com/watch?v={v}", name=v)
+                for v in ("a", "b", "c")
+            ],
+        )
+
+        def _fetch(video_url: str, **_: object) -> list[TranscriptChunk]:
+            if video_url.endswith("c"):
+                return []
+            return [
+                TranscriptChunk(
+                    text="Hello",
+                    source_url=video_url,
+                    source_name="V",
+                    start_seconds=0,
+                    end_seconds=10,
+                )
+            ]
+
+        mock_yt.side_effect = _fetch
+        mock_store = _make_store()
+        mock_store.add_chunks.side_effect = RuntimeError("weaviate down")
+        _setup_store_cls(mock_store_cls, mock_store)
+
+        run()
+
+        # Both queued videos share the one failed batch; c queued nothing
+        mock_store.add_chunks.assert_called_once()
+        failed = {c.args[1] for c in mock_logger.exception.call_args_list}
+        assert failed == {"youtube:a", "youtube:b"}
+        summary = mock_logger.info.call_args_list[-1].args
+        assert summary[3] == 2
+
+    @patch("multimodal_rag.ingest.__main__._FLUSH_SIZE", 2)
+    @patch("multimodal_rag.ingest.__main__.WeaviateStore")
+    @patch("multimodal_rag.ingest.__main__.create_embeddings")
+    @patch("multimodal_rag.ingest.__main__.crawl_knowledge_base")
+    @patch("multimodal_rag.ingest.__main__.load_sources")
+    @patch("multimodal_rag.ingest.__main__.get_settings")
+    def test_flushes_when_queue_reaches_flush_size(
+        self,
+        mock_settings_cls: MagicMock,
+        mock_load: MagicMock,
+        mock_crawl: MagicMock,
+        mock_create_emb: MagicMock,
+        mock_store_cls: MagicMock,
+    ) -> None:
+        mock_settings_cls.return_value = _make_settings()
+        mock_create_emb.return_value = MagicMock()
+
+        from multimodal_rag.models.sources import (
+            KnowledgeBaseSource,
+            SourceConfig,
+        )
+
+        mock_load.return_value = SourceConfig(
+            knowledge_bases=[
+                KnowledgeBaseSource(url="https://docs.example.com", name="Docs")
+            ],
+        )
+        mock_crawl.return_value = [
+            {
+                "url": f"https://docs.example.com/p{i}",
+                "title": f"P{i}",
+                "content": f"Page {i} content",
+            }
+            for i in range(3)
+        ]
+
+        mock_store = _make_store()
+        _setup_store_cls(mock_store_cls, mock_store)
+
+        run()
+
+        # Flush after the second page, then the remainder at end of source
+        batch_sizes = [len(c[0][0]) for c in mock_store.add_chunks.call_args_list]
+        assert batch_sizes == [2, 1]
+
+    @patch("multimodal_rag.ingest.__main__.WeaviateStore")
+    @patch("multimodal_rag.ingest.__main__.create_embeddings")
+    @patch("multimodal_rag.ingest.__main__.crawl_knowledge_base")
+    @patch("multimodal_rag.ingest.__main__.load_sources")
+    @patch("multimodal_rag.ingest.__main__.get_settings")
+    def test_skips_pages_unchanged_since_last_run(
+        self,
+        mock_settings_cls: MagicMock,
+        mock_load: MagicMock,
+        mock_crawl: MagicMock,
+        mock_create_emb: MagicMock,
+        mock_store_cls: MagicMock,
+        tmp_path: object,
+    ) -> None:
+        settings = _make_settings()
+        settings.ingest_cache_path = f"{tmp_path}/ingest.sqlite3"
+        settings.embedding_model = "test-embed"
+        mock_settings_cls.return_value = settings
+        mock_create_emb.return_value = MagicMock()
+
+        from multimodal_rag.models.sources import (
+            KnowledgeBaseSource,
+            SourceConfig,
+        )
+
+        mock_load.return_value = SourceConfig(
+            knowledge_bases=[
+                KnowledgeBaseSource(url="https://docs.example.com", name="Docs")
+            ],
+        )
+        page = {
+            "url": "https://docs.example.com/p1",
+            "title": "P1",
+            "content": "Page one content",
+        }
+
+        mock_store = _make_store()
+        mock_store.existing_ids.side_effect = set
+        _setup_store_cls(mock_store_cls, mock_store)
+
+        def last_ingest() -> float | None:
+            with IngestCache(settings.ingest_cache_path, "test-embed") as cache:
+                return cache.last_ingest_finished()
+
+        # A fresh list per crawl: run() clears the pages it has handed out
+        mock_crawl.side_effect = lambda **_: [dict(page)]
+        run()
+        assert mock_store.add_chunks.call_count == 1
+        first_ingest = last_ingest()
+        assert first_ingest is not None
+
+        # Second run with identical content stores nothing new
+        run()
+        assert mock_store.add_chunks.call_count == 1
+        assert last_ingest() == first_ingest
+
+        # Changed content is re-ingested
+        page["content"] = "Page one, revised"
+        run()
         assert mock_store.add_chunks.call_count == 2
+        assert last_ingest() != first_ingest
 
+        # Unchanged, but purged from the store since: re-ingested
+        mock_store.existing_ids.side_effect = lambda ids: set()
+        run()
+        assert mock_store.add_chunks.call_count == 3
+        mock_store.existing_ids.side_effect = set
+
+        # Unchanged, but chunked with new settings: re-ingested
+        settings.chunk_size = 200
+        run()
+        assert mock_store.add_chunks.call_count == 4
+        run()
+        assert mock_store.add_chunks.call_count == 4
+
+    # Both videos share a host; spacing is covered by test_throttle
+    @patch("multimodal_rag.ingest.__main__._YOUTUBE_INTERVAL_SECONDS", 0.0)
     @patch("multimodal_rag.ingest.__main__.WeaviateStore")
     @patch("multimodal_rag.ingest.__main__.create_embeddings")
     @patch("multimodal_rag.ingest.__main__.fetch_transcript_chunks")
     @patch("multimodal_rag.ingest.__main__.load_sources")
-    @patch("multimodal_rag.ingest.__main__.AppSettings")
+    @patch("multimodal_rag.ingest.__main__.get_settings")
     def test_youtube_failure_continues(
         self,
         mock_settings_cls: MagicMock,
@@ -197,8 +568,8 @@ class TestRun:
     @patch("multimodal_rag.ingest.__main__.crawl_knowledge_base")
     @patch("multimodal_rag.ingest.__main__.fetch_transcript_chunks")
     @patch("multimodal_rag.ingest.__main__.load_sources")
-    @patch("multimodal_rag.ingest.__main__.AppSettings")
-    def test_kb_page_failure_continues(
+    @patch("multimodal_rag.ingest.__main__.get_settings")
+    def test_kb_store_failure_continues(
         self,
         mock_settings_cls: MagicMock,
         mock_load: MagicMock,
@@ -218,29 +589,31 @@ class TestRun:
         mock_load.return_value = SourceConfig(
             youtube=[],
             knowledge_bases=[
-                KnowledgeBaseSource(
-                    url="https://docs.example.com",
-                    name="Docs",
-                )
+                KnowledgeBaseSource(url="https://docs.example.com", name="Docs"),
+                KnowledgeBaseSource(url="https://help.example.com", name="Help"),
             ],
         )
         mock_yt.return_value = []
-        mock_crawl.return_value = [
-            {
-                "url": "https://docs.example.com/p1",
-                "title": "P1",
-                "content": "Page one",
-            },
-            {
-                "url": "https://docs.example.com/p2",
-                "title": "P2",
-                "content": "Page two",
-            },
+        mock_crawl.side_effect = [
+            [
+                {
+                    "url": "https://docs.example.com/p1",
+                    "title": "P1",
+                    "content": "Page one",
+                }
+            ],
+            [
+                {
+                    "url": "https://help.example.com/p2",
+                    "title": "P2",
+                    "content": "Page two",
+                }
+            ],
         ]
 
         mock_store = _make_store()
         _setup_store_cls(mock_store_cls, mock_store)
-        # First page store fails, second succeeds
+        # First source's batch fails, second succeeds
         mock_store.add_chunks.side_effect = [RuntimeError("embed fail"), 1]
 
         run()
@@ -251,7 +624,7 @@ class TestRun:
     @patch("multimodal_rag.ingest.__main__.create_embeddings")
     @patch("multimodal_rag.ingest.__main__.fetch_transcript_chunks")
     @patch("multimodal_rag.ingest.__main__.load_sources")
-    @patch("multimodal_rag.ingest.__main__.AppSettings")
+    @patch("multimodal_rag.ingest.__main__.get_settings")
     def test_no_chunks_opens_store_but_adds_nothing(
         self,
         mock_settings_cls: MagicMock,
@@ -282,7 +655,7 @@ class TestRun:
     @patch("multimodal_rag.ingest.__main__.create_embeddings")
     @patch("multimodal_rag.ingest.__main__.fetch_transcript_chunks")
     @patch("multimodal_rag.ingest.__main__.load_sources")
-    @patch("multimodal_rag.ingest.__main__.AppSettings")
+    @patch("multimodal_rag.ingest.__main__.get_settings")
     def test_skip_voxtral_uses_vision_only_path(
         self,
         mock_settings_cls: MagicMock,
@@ -327,7 +700,7 @@ class TestRun:
     @patch("multimodal_rag.ingest.__main__.create_embeddings")
     @patch("multimodal_rag.ingest.__main__.fetch_transcript_chunks")
     @patch("multimodal_rag.ingest.__main__.load_sources")
-    @patch("multimodal_rag.ingest.__main__.AppSettings")
+    @patch("multimodal_rag.ingest.__main__.get_settings")
     def test_visual_grounding_skipped_when_vision_model_not_set(
         self,
         mock_settings_cls: MagicMock,
@@ -362,7 +735,7 @@ class TestRun:
     @patch("multimodal_rag.ingest.__main__.create_embeddings")
     @patch("multimodal_rag.ingest.__main__.fetch_transcript_chunks")
     @patch("multimodal_rag.ingest.__main__.load_sources")
-    @patch("multimodal_rag.ingest.__main__.AppSettings")
+    @patch("multimodal_rag.ingest.__main__.get_settings")
     def test_visual_grounding_runs_when_vision_model_set(
         self,
         mock_settings_cls: MagicMock,
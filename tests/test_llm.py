@@ -1,9 +1,31 @@
 """Tests for LangChain model factory functions."""
 
+import subprocess
+import sys
 from unittest.mock import patch
 
+import httpx
+
 from multimodal_rag.models.config import AppSettings
-from multimodal_rag.models.llm import create_chat_model, create_embeddings
+from multimodal_rag.models.llm import (
+    content_text,
+    create_chat_model,
+    create_embeddings,
+)
+
+
+class TestContentText:
+    def test_plain_string_is_returned_as_is(self) -> None:
+        assert content_text("Hello") == "Hello"
+
+    def test_keeps_only_text_blocks_in_order(self) -> None:
+        content: list[str | dict[str, object]] = [
+            {"type": "text", "text": "Use File"},
+            {"type": "reasoning", "reasoning": "hmm"},
+            " > New",
+            {"type": "image_url", "image_url": {"url": "x"}},
+        ]
+        assert content_text(content) == "Use File > New"
 
 
 class TestCreateChatModel:
@@ -46,6 +68,8 @@ class TestCreateEmbeddings:
         )
         emb = create_embeddings(settings)
         assert isinstance(emb, OpenAIEmbeddings)
+        assert emb.check_embedding_ctx_length is False
+        assert isinstance(emb.http_client, httpx.Client)
 
     @patch.dict(
         "os.environ",
@@ -58,3 +82,15 @@ class TestCreateEmbeddings:
         settings = AppSettings(embedding_provider="ollama")
         emb = create_embeddings(settings)
         assert isinstance(emb, OllamaEmbeddings)
+
+
+class TestLazyImports:
+    def test_models_import_defers_langchain(self) -> None:
+        code = (
+            "import sys, multimodal_rag.models; "
+            "print(any(m.startswith('langchain') for m in sys.modules))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert out.stdout.strip() == "False"
@@ -1,7 +1,12 @@
 """Tests for data models."""
 
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+from uuid import NAMESPACE_URL, uuid5
+
 import pytest
 import yaml
+from pydantic import ValidationError
 
 from multimodal_rag.models import (
     AppSettings,
@@ -12,8 +17,9 @@ from multimodal_rag.models import (
     SupportChunk,
     TranscriptChunk,
     WebChunk,
+    get_settings,
 )
-from multimodal_rag.models.chunks import SourceType
+from multimodal_rag.models.chunks import SourceType, _stable_id, _url_hash
 
 
 class TestSourceConfig:
@@ -26,7 +32,7 @@ class TestSourceConfig:
                 {"url": "https://docs.example.com", "name": "Docs"}
             ],
         }
-        config = SourceConfig(**raw)
+        config = SourceConfig.model_validate(raw)
         assert len(config.youtube) == 1
         assert len(config.knowledge_bases) == 1
         assert config.youtube[0].name == "Test Video"
@@ -40,7 +46,7 @@ class TestSourceConfig:
     def test_sources_yaml_file(self) -> None:
         with open("config/sources.yaml") as f:
             raw = yaml.safe_load(f)
-        config = SourceConfig(**raw)
+        config = SourceConfig.model_validate(raw)
         assert len(config.youtube) >= 1
 
 
@@ -115,6 +121,21 @@ class TestWebChunk:
         assert chunk.section_heading is None
 
 
+class TestStableId:
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "",
+            "https://youtube.com/watch?v=abc123|transcript|10",
+            "https://docs.example.com/é|3",
+        ],
+    )
+    def test_matches_uuid5(self, name: str) -> None:
+        stable = _stable_id(name)
+        assert stable == uuid5(NAMESPACE_URL, name)
+        assert stable.version == 5
+
+
 class TestSupportChunk:
     def test_from_transcript_chunk(self) -> None:
         tc = TranscriptChunk(
@@ -141,6 +162,21 @@ class TestSupportChunk:
         assert sc.section_heading == "Introduction"
         assert sc.timestamp_seconds is None
 
+    def test_to_weaviate_properties(self) -> None:
+        sc = SupportChunk(
+            text="Hello",
+            source_type=SourceType.VIDEO,
+            source_url="https://youtube.com/watch?v=abc123",
+            source_name="Tutorial",
+            timestamp_seconds=10,
+        )
+        props = sc.to_weaviate_properties()
+        assert props["source_type"] == "video"
+        assert props["section_heading"] == ""
+        assert props["timestamp_seconds"] == 10
+        assert props["ingested_at"] == sc.ingested_at.isoformat()
+        assert props["url_hash"] == sc.url_hash
+
     def test_url_hash_deterministic(self) -> None:
         sc1 = SupportChunk(
             text="a",
@@ -156,6 +192,26 @@ class TestSupportChunk:
         )
         assert sc1.url_hash == sc2.url_hash
 
+    def test_url_hash_is_sha256_memoized_per_url(self) -> None:
+        from hashlib import sha256
+
+        url = "https://example.com/memoized"
+        chunks = [
+            SupportChunk.from_web_chunk(
+                WebChunk(
+                    text=f"Section {i}",
+                    source_url=url,
+                    source_name="Test",
+                    chunk_index=i,
+                )
+            )
+            for i in range(3)
+        ]
+        info = _url_hash.cache_info()
+        # Stored url_hash values stay comparable with already-ingested objects
+        assert {c.url_hash for c in chunks} == {sha256(url.encode()).hexdigest()}
+        assert info.hits >= 2
+
     def test_different_urls_different_hash(self) -> None:
         sc1 = SupportChunk(
             text="a",
@@ -413,6 +469,18 @@ class TestFromFusedChunk:
 
 
 class TestSearchResult:
+    def test_is_frozen(self) -> None:
+        result = SearchResult(
+            text="Content",
+            source_type=SourceType.WEB,
+            source_url="https://docs.example.com/page",
+            source_name="Docs",
+            relevance_score=0.85,
+        )
+        # Cached results are shared between requests
+        with pytest.raises(FrozenInstanceError):
+            result.relevance_score = 1.0  # type: ignore[misc]
+
     def test_video_citation_markdown(self) -> None:
         result = SearchResult(
             text="Some content",
@@ -467,6 +535,11 @@ class TestCitedAnswer:
         assert len(answer.citations) == 1
         assert answer.citations[0].source_type == SourceType.VIDEO
 
+    def test_is_immutable(self) -> None:
+        answer = CitedAnswer(answer="Cached.", citations=[])
+        with pytest.raises(ValidationError):
+            answer.answer = "Changed."
+
 
 class TestAppSettings:
     def test_defaults(self, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -482,3 +555,21 @@ class TestAppSettings:
         assert settings.weaviate_url == "http://localhost:8080"
         assert settings.chunk_size == 400
         assert settings.top_k == 10
+
+    def test_settings_are_frozen(self) -> None:
+        settings = AppSettings(_env_file=None)
+        with pytest.raises(ValidationError):
+            settings.top_k = 5  # type: ignore[misc]
+
+    def test_misspelt_env_file_key_is_rejected(self, tmp_path: Path) -> None:
+        env_file = tmp_path / ".env"
+        env_file.write_text("TOP_KK=5\n")
+        with pytest.raises(ValidationError, match="top_kk"):
+            AppSettings(_env_file=env_file)
+
+    def test_get_settings_is_loaded_once(self) -> None:
+        get_settings.cache_clear()
+        try:
+            assert get_settings() is get_settings()
+        finally:
+            get_settings.cache_clear()
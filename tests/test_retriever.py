@@ -2,7 +2,10 @@
 
 from unittest.mock import MagicMock
 
+import pytest
+
 from multimodal_rag.models.chunks import SourceType
+from multimodal_rag.query.cache import RetrievalCache
 from multimodal_rag.query.retriever import (
     _distance_to_score,
     format_context,
@@ -11,20 +14,18 @@ from multimodal_rag.query.retriever import (
 
 
 class TestDistanceToScore:
-    def test_zero_distance(self) -> None:
-        assert _distance_to_score(0.0) == 1.0
-
-    def test_max_distance(self) -> None:
-        assert _distance_to_score(2.0) == 0.0
-
-    def test_mid_distance(self) -> None:
-        assert _distance_to_score(0.5) == 0.5
-
-    def test_none_returns_zero(self) -> None:
-        assert _distance_to_score(None) == 0.0
-
-    def test_over_two_clamps_to_zero(self) -> None:
-        assert _distance_to_score(2.5) == 0.0
+    @pytest.mark.parametrize(
+        ("distance", "expected"),
+        [
+            (0.0, 1.0),  # identical
+            (2.0, 0.0),  # opposite
+            (0.5, 0.5),
+            (None, 0.0),  # no distance metadata
+            (2.5, 0.0),  # clamped
+        ],
+    )
+    def test_score(self, distance: float | None, expected: float) -> None:
+        assert _distance_to_score(distance) == expected
 
 
 class TestRetrieve:
@@ -71,6 +72,29 @@ class TestRetrieve:
         assert results[0].section_heading == "Setup"
         assert results[0].timestamp_seconds is None
 
+    def test_accepts_enum_source_type_from_store(self) -> None:
+        store = self._mock_store([
+            {"text": "Clip", "source_type": SourceType.VIDEO, "_distance": 0.2}
+        ])
+        results = retrieve("q", store)
+        assert results[0].source_type is SourceType.VIDEO
+
+    def test_source_strings_shared_across_queries(self) -> None:
+        def _hit() -> dict:
+            # Fresh str objects per hit, as decoded from a gRPC response
+            return {
+                "text": "Clip",
+                "source_type": "web",
+                "source_url": "".join(["https://docs.example.com/", "faq"]),
+                "source_name": "".join(["Do", "cs"]),
+                "_distance": 0.2,
+            }
+
+        first = retrieve("q1", self._mock_store([_hit()]))[0]
+        second = retrieve("q2", self._mock_store([_hit()]))[0]
+        assert first.source_url is second.source_url
+        assert first.source_name is second.source_name
+
     def test_empty_results(self) -> None:
         store = self._mock_store([])
         results = retrieve("anything", store)
@@ -81,6 +105,34 @@ class TestRetrieve:
         retrieve("q", store, top_k=3)
         store.search.assert_called_once_with("q", top_k=12)
 
+    def test_uses_precomputed_query_vector(self) -> None:
+        store = self._mock_store([])
+        store.search_by_vector.return_value = []
+        retrieve("q", store, top_k=3, query_vector=[0.1, 0.2])
+        store.search.assert_not_called()
+        store.search_by_vector.assert_called_once_with([0.1, 0.2], top_k=12)
+
+
+    def test_near_duplicate_query_served_from_cache(self) -> None:
+        hit = {
+            "text": "Installation guide",
+            "source_type": "web",
+            "source_url": "https://docs.example.com/install",
+            "source_name": "Docs",
+            "_distance": 0.1,
+        }
+        store = self._mock_store([])
+        store.search_by_vector.return_value = [hit]
+        store.embed_query.return_value = [0.99, 0.05]
+        cache = RetrievalCache()
+
+        first = retrieve("install", store, query_vector=[1.0, 0.0], cache=cache)
+        second = retrieve("how to install", store, cache=cache)
+
+        assert second == first
+        store.search_by_vector.assert_called_once()
+        store.search.assert_not_called()
+
 
 class TestFormatContext:
     def test_formats_numbered_context(self) -> None:
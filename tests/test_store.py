@@ -1,6 +1,13 @@
 """Tests for store module (embeddings + Weaviate store)."""
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
 
 from multimodal_rag.models.chunks import (
     SourceType,
@@ -8,18 +15,32 @@ from multimodal_rag.models.chunks import (
     TranscriptChunk,
     WebChunk,
 )
-from multimodal_rag.store.embeddings import _MAX_WORDS, _RETRY_MAX_WORDS, embed_texts
-from multimodal_rag.store.weaviate import WeaviateStore
+from multimodal_rag.store.cache import IngestCache
+from multimodal_rag.store.embeddings import (
+    _BATCH_SIZE,
+    _MAX_WORDS,
+    _RETRY_MAX_WORDS,
+    EmbeddingBatcher,
+    _truncate,
+    embed_texts,
+)
+from multimodal_rag.store.weaviate import WeaviateStore, _QueryVectorCache
 
 
 class TestEmbedTexts:
     def test_returns_embeddings(self) -> None:
         mock_emb = MagicMock()
-        mock_emb.embed_documents.return_value = [[0.1, 0.2, 0.3]]
+        mock_emb.embed_documents.return_value = [[3.0, 4.0]]
         result = embed_texts(["hello"], embeddings=mock_emb)
-        assert result == [[0.1, 0.2, 0.3]]
+        assert result == [[0.6, 0.8]]
         mock_emb.embed_documents.assert_called_once_with(["hello"])
 
+    def test_zero_vector_is_left_unscaled(self) -> None:
+        mock_emb = MagicMock()
+        mock_emb.embed_documents.return_value = [[0.0, 0.0], [0.0, 5.0]]
+        result = embed_texts(["blank", "text"], embeddings=mock_emb)
+        assert result == [[0.0, 0.0], [0.0, 1.0]]
+
     def test_empty_list(self) -> None:
         mock_emb = MagicMock()
         result = embed_texts([], embeddings=mock_emb)
@@ -27,13 +48,19 @@ class TestEmbedTexts:
         mock_emb.embed_documents.assert_not_called()
 
     def test_batching(self) -> None:
+        batch_sizes: list[int] = []
+
+        def _embed(batch: list[str]) -> list[list[float]]:
+            batch_sizes.append(len(batch))
+            return [[1.0]] * len(batch)
+
         mock_emb = MagicMock()
-        mock_emb.embed_documents.return_value = [[0.1]]
-        texts = [f"text_{i}" for i in range(12)]
+        mock_emb.embed_documents.side_effect = _embed
+        texts = [f"text_{i}" for i in range(2 * _BATCH_SIZE + 2)]
         result = embed_texts(texts, embeddings=mock_emb)
-        # 12 texts / 5 batch size = 3 calls
-        assert mock_emb.embed_documents.call_count == 3
-        assert len(result) == 3
+        # Two full batches plus a partial one, one vector per text
+        assert sorted(batch_sizes) == [2, _BATCH_SIZE, _BATCH_SIZE]
+        assert len(result) == len(texts)
 
     def test_truncates_long_texts(self) -> None:
         mock_emb = MagicMock()
@@ -43,29 +70,122 @@ class TestEmbedTexts:
         called_texts = mock_emb.embed_documents.call_args[0][0]
         assert len(called_texts[0].split()) == _MAX_WORDS
 
+    def test_truncate_length_shortcut_is_exact_at_boundary(self) -> None:
+        at_limit = "a " * _MAX_WORDS
+        assert _truncate(at_limit) is at_limit
+        over_limit = "a " * (_MAX_WORDS + 1)
+        assert len(_truncate(over_limit).split()) == _MAX_WORDS
+
+    def test_short_text_passes_through_unchanged(self) -> None:
+        mock_emb = MagicMock()
+        mock_emb.embed_documents.return_value = [[0.1]]
+        text = "keep   this\nspacing"
+        embed_texts([text], embeddings=mock_emb)
+        assert mock_emb.embed_documents.call_args[0][0] == [text]
+
     def test_context_length_retry(self) -> None:
         mock_emb = MagicMock()
         # First call raises context length error, retry succeeds
         mock_emb.embed_documents.side_effect = [
             Exception("the input length exceeds the context length"),
-            [[0.1, 0.2]],
+            [[0.0, 1.0]],
         ]
         long_text = "word " * 500
         result = embed_texts([long_text], embeddings=mock_emb)
-        assert result == [[0.1, 0.2]]
+        assert result == [[0.0, 1.0]]
         assert mock_emb.embed_documents.call_count == 2
         # Retry batch should be truncated to _RETRY_MAX_WORDS
         retry_texts = mock_emb.embed_documents.call_args_list[1][0][0]
         assert len(retry_texts[0].split()) == _RETRY_MAX_WORDS
 
+    def test_batches_run_concurrently_in_order(self) -> None:
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def _slow(batch: list[str]) -> list[list[float]]:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return [[float(t.split("_")[1]), 1.0] for t in batch]
+
+        mock_emb = MagicMock()
+        mock_emb.embed_documents.side_effect = _slow
+        texts = [f"text_{i}" for i in range(10 * _BATCH_SIZE)]
+
+        result = embed_texts(texts, embeddings=mock_emb)
+
+        assert [v[0] / v[1] for v in result] == pytest.approx(range(len(texts)))
+        assert 1 < peak <= 8
+
     def test_non_context_error_propagates(self) -> None:
         mock_emb = MagicMock()
         mock_emb.embed_documents.side_effect = ConnectionError("network down")
-        try:
+        with pytest.raises(ConnectionError, match="network down"):
             embed_texts(["hello"], embeddings=mock_emb)
-            assert False, "Should have raised"
-        except ConnectionError:
-            pass
+        mock_emb.embed_documents.assert_called_once()
+
+
+class TestEmbeddingBatcher:
+    def test_concurrent_requests_share_a_call(self) -> None:
+        release = threading.Event()
+        calls: list[list[str]] = []
+
+        def _embed(texts: list[str]) -> list[list[float]]:
+            calls.append(texts)
+            release.wait(timeout=5)
+            return [[float(len(t))] for t in texts]
+
+        batcher = EmbeddingBatcher(_embed)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            first = pool.submit(batcher.embed, "a")
+            while not calls:
+                time.sleep(0.001)
+            rest = [pool.submit(batcher.embed, t) for t in ["bb", "ccc", "dddd"]]
+            time.sleep(0.05)
+            release.set()
+            results = [f.result() for f in [first, *rest]]
+
+        assert results == [[1.0], [2.0], [3.0], [4.0]]
+        assert calls[0] == ["a"]
+        assert sorted(calls[1]) == ["bb", "ccc", "dddd"]
+
+    def test_error_reaches_every_caller(self) -> None:
+        batcher = EmbeddingBatcher(MagicMock(side_effect=RuntimeError("down")))
+        with pytest.raises(RuntimeError, match="down"):
+            batcher.embed("q")
+
+
+    def test_short_reply_fails_instead_of_hanging(self) -> None:
+        batcher = EmbeddingBatcher(MagicMock(return_value=[]))
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(batcher.embed, "q")
+            with pytest.raises(ValueError, match="Expected 1 vectors, got 0"):
+                future.result(timeout=5)
+
+    def test_aborted_batch_fails_callers_and_restarts_worker(self) -> None:
+        workers: list[threading.Thread] = []
+
+        def _embed(texts: list[str]) -> list[list[float]]:
+            workers.append(threading.current_thread())
+            if len(workers) == 1:
+                raise KeyboardInterrupt
+            return [[1.0]]
+
+        batcher = EmbeddingBatcher(_embed)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # The interrupt still ends the worker thread, as it should
+            with patch("threading.excepthook") as excepthook:
+                with pytest.raises(RuntimeError, match="aborted"):
+                    pool.submit(batcher.embed, "q").result(timeout=5)
+                workers[0].join(timeout=5)
+            excepthook.assert_called_once()
+            assert pool.submit(batcher.embed, "q").result(timeout=5) == [1.0]
+        assert workers[1] is not workers[0]
 
 
 class TestWeaviateStoreDeleteBySourceType:
@@ -118,6 +238,211 @@ class TestWeaviateStoreDeleteBySourceType:
         assert n == 0
 
 
+class TestWeaviateStoreExistingIds:
+    def test_returns_stored_subset(self) -> None:
+        store = WeaviateStore.__new__(WeaviateStore)
+        store._client = MagicMock()
+        collection = store._client.collections.get.return_value
+        stored, missing = uuid4(), uuid4()
+        collection.query.fetch_objects.return_value.objects = [MagicMock(uuid=stored)]
+
+        assert store.existing_ids([stored, missing]) == {stored}
+        assert collection.query.fetch_objects.call_args.kwargs["limit"] == 2
+
+    def test_empty_ids_skip_query(self) -> None:
+        store = WeaviateStore.__new__(WeaviateStore)
+        store._client = MagicMock()
+
+        assert store.existing_ids([]) == set()
+        store._client.collections.get.assert_not_called()
+
+
+class TestWeaviateStoreQueryCache:
+    def _make_store(self) -> WeaviateStore:
+        store = WeaviateStore.__new__(WeaviateStore)
+        store._client = MagicMock()
+        store._embeddings = MagicMock()
+        store._cache = None
+        store._query_vectors = _QueryVectorCache(max_entries=2, ttl_seconds=300)
+        store._query_embedder = EmbeddingBatcher(store._embed)
+        return store
+
+    @patch("multimodal_rag.store.weaviate.embed_texts", return_value=[[0.1, 0.2]])
+    def test_repeat_query_embeds_once(self, mock_embed: MagicMock) -> None:
+        store = self._make_store()
+
+        assert store.embed_query("reset password") == [0.1, 0.2]
+        assert store.embed_query("reset password") == [0.1, 0.2]
+
+        mock_embed.assert_called_once()
+        assert store.query_cache_info() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_search_embeds_through_query_path(self) -> None:
+        store = self._make_store()
+        store._query_embedder = MagicMock()
+        store._query_embedder.embed.return_value = [0.3, 0.4]
+        store._client.collections.get.return_value.query.near_vector.return_value = (
+            MagicMock(objects=[])
+        )
+
+        store.search("reset password")
+        store.search("reset password")
+
+        store._query_embedder.embed.assert_called_once_with("reset password")
+        store._embeddings.embed_documents.assert_not_called()
+
+    @patch("multimodal_rag.store.weaviate.embed_texts", return_value=[[0.5, 0.25]])
+    def test_query_vectors_stay_out_of_ingest_cache(
+        self, mock_embed: MagicMock, tmp_path: Path
+    ) -> None:
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            store = self._make_store()
+            store._cache = cache
+            assert store.embed_query("reset password") == [0.5, 0.25]
+
+            assert cache.get_vectors(["reset password"]) == [None]
+
+    @patch("multimodal_rag.store.weaviate.time.monotonic")
+    @patch("multimodal_rag.store.weaviate.embed_texts", return_value=[[0.1]])
+    def test_expired_vector_is_reembedded(
+        self, mock_embed: MagicMock, mock_monotonic: MagicMock
+    ) -> None:
+        store = self._make_store()
+        mock_monotonic.return_value = 1000.0
+        store.embed_query("q")
+        mock_monotonic.return_value = 1301.0
+        store.embed_query("q")
+
+        assert mock_embed.call_count == 2
+
+    @patch("multimodal_rag.store.weaviate.embed_texts", return_value=[[0.1]])
+    def test_evicts_least_recently_used(self, mock_embed: MagicMock) -> None:
+        store = self._make_store()
+        for query in ["a", "b", "a", "c", "a", "b"]:
+            store.embed_query(query)
+
+        # "b" was evicted by "c"; "a" stayed hot
+        assert mock_embed.call_count == 4
+
+
+class TestWeaviateStoreCollectionHandle:
+    def test_handle_fetched_once_and_reset_on_delete(self) -> None:
+        store = WeaviateStore.__new__(WeaviateStore)
+        store._client = MagicMock()
+        store._client.collections.get.return_value.aggregate.over_all.return_value = (
+            MagicMock(total_count=3)
+        )
+
+        assert store.count() == 3
+        assert store.count() == 3
+        assert store._client.collections.get.call_count == 1
+
+        store.delete_collection()
+        store.count()
+        assert store._client.collections.get.call_count == 2
+
+
+class TestWeaviateStoreEnsureCollection:
+    def test_new_collection_tunes_hnsw_with_scalar_quantization(self) -> None:
+        store = WeaviateStore.__new__(WeaviateStore)
+        store._client = MagicMock()
+        store._client.collections.exists.return_value = False
+
+        store.ensure_collection()
+
+        index_config = store._client.collections.create.call_args.kwargs[
+            "vector_index_config"
+        ]
+        assert index_config.quantizer is not None
+        assert index_config.quantizer.rescoreLimit == 100
+        assert index_config.efConstruction == 128
+        assert index_config.maxConnections == 16
+        assert index_config.ef == -1
+
+
+class TestWeaviateStoreAddChunks:
+    def test_inserts_in_fixed_size_concurrent_batches(self) -> None:
+        store = WeaviateStore.__new__(WeaviateStore)
+        store._client = MagicMock()
+        store._embeddings = MagicMock()
+        store._cache = None
+        store._embeddings.embed_documents.return_value = [[0.0, 2.0], [3.0, 4.0]]
+        collection = store._client.collections.get.return_value
+        collection.batch.failed_objects = []
+        batch = collection.batch.fixed_size.return_value.__enter__.return_value
+        chunks = [
+            SupportChunk(
+                text=text,
+                source_type=SourceType.WEB,
+                source_url="https://docs.example.com",
+                source_name="Docs",
+            )
+            for text in ["a", "b"]
+        ]
+
+        assert store.add_chunks(chunks) == 2
+
+        collection.batch.fixed_size.assert_called_once_with(
+            batch_size=200, concurrent_requests=4
+        )
+        assert batch.add_object.call_count == 2
+        first = batch.add_object.call_args_list[0].kwargs
+        assert first["uuid"] == chunks[0].chunk_id
+        assert first["vector"] == [0.0, 1.0]
+        assert first["properties"]["text"] == "a"
+
+    def test_failed_objects_are_not_counted(self) -> None:
+        store = WeaviateStore.__new__(WeaviateStore)
+        store._client = MagicMock()
+        store._embeddings = MagicMock()
+        store._cache = None
+        store._embeddings.embed_documents.return_value = [[1.0], [1.0]]
+        collection = store._client.collections.get.return_value
+        collection.batch.failed_objects = [MagicMock(message="vector dim mismatch")]
+        chunks = [
+            SupportChunk(
+                text=text,
+                source_type=SourceType.WEB,
+                source_url="https://docs.example.com",
+                source_name="Docs",
+            )
+            for text in ["a", "b"]
+        ]
+
+        assert store.add_chunks(chunks) == 1
+
+
+class TestWeaviateStoreEmbeddingCache:
+    def _make_store(self, cache: IngestCache | None) -> tuple[WeaviateStore, MagicMock]:
+        store = WeaviateStore.__new__(WeaviateStore)
+        store._client = MagicMock()
+        store._embeddings = MagicMock()
+        store._cache = cache
+        return store, store._embeddings
+
+    def test_only_embeds_uncached_texts(self, tmp_path: object) -> None:
+        from pathlib import Path
+
+        cache = IngestCache(Path(str(tmp_path)) / "c.db", embedding_model="m")
+        cache.put_vectors(["cached"], [[1.0, 0.0]])
+        store, mock_emb = self._make_store(cache)
+        mock_emb.embed_documents.return_value = [[3.0, 4.0]]
+
+        vectors = store._embed_cached(["cached", "fresh"])
+
+        assert vectors == [[1.0, 0.0], [0.6, 0.8]]
+        mock_emb.embed_documents.assert_called_once_with(["fresh"])
+        assert cache.get_vectors(["fresh"]) == [pytest.approx([0.6, 0.8])]
+        cache.close()
+
+    def test_without_cache_embeds_everything(self) -> None:
+        store, mock_emb = self._make_store(None)
+        mock_emb.embed_documents.return_value = [[0.0, 2.0], [3.0, 4.0]]
+
+        assert store._embed_cached(["a", "b"]) == [[0.0, 1.0], [0.6, 0.8]]
+        mock_emb.embed_documents.assert_called_once_with(["a", "b"])
+
+
 class TestSupportChunkConversion:
     def test_from_transcript_chunk(self) -> None:
         tc = TranscriptChunk(
@@ -0,0 +1,37 @@
+"""Tests for per-host ingestion throttling."""
+
+from unittest.mock import MagicMock, patch
+
+from multimodal_rag.ingest.throttle import HostThrottle
+
+
+class TestHostThrottle:
+    @patch("multimodal_rag.ingest.throttle.time.sleep")
+    @patch("multimodal_rag.ingest.throttle.time.monotonic", return_value=100.0)
+    def test_first_request_does_not_wait(
+        self, _mock_monotonic: MagicMock, mock_sleep: MagicMock
+    ) -> None:
+        throttle = HostThrottle(min_interval=2.0)
+        throttle.wait("https://www.youtube.com/watch?v=abc")
+        mock_sleep.assert_not_called()
+
+    @patch("multimodal_rag.ingest.throttle.time.sleep")
+    @patch("multimodal_rag.ingest.throttle.time.monotonic", return_value=100.0)
+    def test_same_host_requests_are_spaced(
+        self, _mock_monotonic: MagicMock, mock_sleep: MagicMock
+    ) -> None:
+        throttle = HostThrottle(min_interval=2.0)
+        throttle.wait("https://www.youtube.com/watch?v=a")
+        throttle.wait("https://www.youtube.com/watch?v=b")
+        throttle.wait("https://www.youtube.com/watch?v=c")
+        assert [c[0][0] for c in mock_sleep.call_args_list] == [2.0, 4.0]
+
+    @patch("multimodal_rag.ingest.throttle.time.sleep")
+    @patch("multimodal_rag.ingest.throttle.time.monotonic", return_value=100.0)
+    def test_different_hosts_do_not_wait(
+        self, _mock_monotonic: MagicMock, mock_sleep: MagicMock
+    ) -> None:
+        throttle = HostThrottle(min_interval=5.0)
+        throttle.wait("https://docs.example.com")
+        throttle.wait("https://help.example.org")
+        mock_sleep.assert_not_called()
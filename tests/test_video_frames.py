@@ -1,19 +1,24 @@
 """Tests for video keyframe extraction and description."""
 
+import asyncio
+import threading
+from collections.abc import Iterator
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from multimodal_rag.ingest.video_frames import (
-    describe_frame,
+    describe_frame_async,
+    describe_frames_batch,
     download_video,
     extract_audio,
-    extract_keyframes,
     fetch_frame_chunks,
     fetch_fused_chunks,
+    iter_keyframes,
 )
-from multimodal_rag.models.chunks import TranscriptChunk
+from multimodal_rag.models.chunks import Segment, TranscriptChunk
+from multimodal_rag.store.cache import IngestCache
 
 
 class TestDownloadVideo:
@@ -34,6 +39,7 @@ class TestDownloadVideo:
         call_kwargs = mock_ydl_cls.call_args[0][0]
         expected_fmt = "bestvideo[vcodec!=images]/best[vcodec!=images]/best"
         assert call_kwargs["format"] == expected_fmt
+        assert call_kwargs["concurrent_fragment_downloads"] == 8
         assert result == video_file
 
     @patch("multimodal_rag.ingest.video_frames.yt_dlp.YoutubeDL")
@@ -54,78 +60,78 @@ class TestDownloadVideo:
         assert result.exists()
 
 
-class TestExtractKeyframes:
-    @patch("multimodal_rag.ingest.video_frames.subprocess.run")
-    def test_calls_ffmpeg_with_fps_filter(
-        self, mock_run: MagicMock, tmp_path: Path
-    ) -> None:
-        video_path = tmp_path / "video.mp4"
-        video_path.write_bytes(b"fake")
-        frame_dir = tmp_path / "frames"
-        frame_dir.mkdir()
+def _make_video(path: Path, seconds: int, width: int, height: int) -> Path:
+    """Encode a tiny synthetic video (1 fps) for keyframe extraction tests."""
+    import av
+    import numpy as np
 
-        mock_run.return_value = MagicMock(returncode=0)
+    with av.open(str(path), mode="w") as container:
+        stream = container.add_stream("mpeg4", rate=1)
+        stream.width = width
+        stream.height = height
+        stream.pix_fmt = "yuv420p"
+        for i in range(seconds):
+            img = np.full((height, width, 3), i * 10 % 255, dtype=np.uint8)
+            frame = av.VideoFrame.from_ndarray(img, format="rgb24")
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+    return path
 
-        extract_keyframes(video_path, frame_dir, interval_seconds=30)
 
-        args = mock_run.call_args[0][0]
-        assert "ffmpeg" in args
-        assert "fps=1/30" in " ".join(args)
+class TestIterKeyframes:
+    def test_returns_one_frame_per_interval(self, tmp_path: Path) -> None:
+        video = _make_video(tmp_path / "video.mp4", seconds=12, width=320, height=240)
 
-    @patch("multimodal_rag.ingest.video_frames.subprocess.run")
-    def test_calls_ffmpeg_with_output_template(
-        self, mock_run: MagicMock, tmp_path: Path
-    ) -> None:
-        video_path = tmp_path / "video.mp4"
-        video_path.write_bytes(b"fake")
-        frame_dir = tmp_path / "frames"
-        frame_dir.mkdir()
+        result = list(iter_keyframes(video, interval_seconds=5))
 
-        mock_run.return_value = MagicMock(returncode=0)
+        frames, timestamps = zip(*result)
+        assert list(timestamps) == [0, 5, 10]
+        assert all(f.startswith(b"\xff\xd8\xff") for f in frames)
 
-        extract_keyframes(video_path, frame_dir, interval_seconds=30)
+    def test_downscales_wide_frames(self, tmp_path: Path) -> None:
+        import io
 
-        args = mock_run.call_args[0][0]
-        joined = " ".join(args)
-        assert "frame_" in joined
-        assert ".jpg" in joined
+        from PIL import Image
 
-    @patch("multimodal_rag.ingest.video_frames.subprocess.run")
-    def test_returns_sorted_timestamps(
-        self, mock_run: MagicMock, tmp_path: Path
-    ) -> None:
-        video_path = tmp_path / "video.mp4"
-        video_path.write_bytes(b"fake")
-        frame_dir = tmp_path / "frames"
-        frame_dir.mkdir()
+        video = _make_video(tmp_path / "video.mp4", seconds=2, width=2048, height=1152)
 
-        mock_run.return_value = MagicMock(returncode=0)
+        result = list(iter_keyframes(video, interval_seconds=30))
 
-        # Create fake frame files
-        for i in range(1, 4):
-            (frame_dir / f"frame_{i:04d}.jpg").write_bytes(b"jpeg")
+        assert len(result) == 1
+        assert Image.open(io.BytesIO(result[0][0])).size == (1024, 576)
 
-        result = extract_keyframes(video_path, frame_dir, interval_seconds=30)
+    def test_downscales_tall_frames(self, tmp_path: Path) -> None:
+        import io
 
-        assert len(result) == 3
-        paths, timestamps = zip(*result)
-        assert list(timestamps) == [0, 30, 60]
-        assert all(p.suffix == ".jpg" for p in paths)
+        from PIL import Image
 
-    @patch("multimodal_rag.ingest.video_frames.subprocess.run")
-    def test_raises_on_ffmpeg_failure(
-        self, mock_run: MagicMock, tmp_path: Path
-    ) -> None:
-        import subprocess
+        video = _make_video(tmp_path / "video.mp4", seconds=2, width=1152, height=2048)
 
-        mock_run.side_effect = subprocess.CalledProcessError(1, "ffmpeg")
-        video_path = tmp_path / "video.mp4"
-        video_path.write_bytes(b"fake")
-        frame_dir = tmp_path / "frames"
-        frame_dir.mkdir()
+        result = list(iter_keyframes(video, interval_seconds=30))
 
-        with pytest.raises(subprocess.CalledProcessError):
-            extract_keyframes(video_path, frame_dir)
+        assert Image.open(io.BytesIO(result[0][0])).size == (576, 1024)
+
+    def test_does_not_upscale_small_frames(self, tmp_path: Path) -> None:
+        import io
+
+        from PIL import Image
+
+        video = _make_video(tmp_path / "video.mp4", seconds=2, width=320, height=240)
+
+        result = list(iter_keyframes(video, interval_seconds=30))
+
+        assert Image.open(io.BytesIO(result[0][0])).size == (320, 240)
+
+    def test_raises_on_invalid_video(self, tmp_path: Path) -> None:
+        import av
+
+        video = tmp_path / "video.mp4"
+        video.write_bytes(b"not a video")
+
+        with pytest.raises(av.error.FFmpegError):
+            list(iter_keyframes(video))
 
 
 class TestExtractAudio:
@@ -160,21 +166,24 @@ class TestExtractAudio:
 
 
 class TestDescribeFrame:
-    def test_sends_base64_image_to_llm(self, tmp_path: Path) -> None:
+    def test_sends_base64_image_to_llm(self) -> None:
+        import asyncio
         import base64
 
-        frame = tmp_path / "frame_0001.jpg"
-        frame.write_bytes(b"\xff\xd8\xff" + b"\x00" * 10)  # minimal JPEG header
+        frame = b"\xff\xd8\xff" + b"\x00" * 10  # minimal JPEG header
 
         mock_llm = MagicMock()
-        mock_llm.invoke.return_value = MagicMock(content="A screenshot showing a menu")
+        mock_llm.ainvoke = AsyncMock(
+            return_value=MagicMock(content="A screenshot showing a menu")
+        )
 
-        result = describe_frame(frame, mock_llm)
+        result = asyncio.run(describe_frame_async(frame, mock_llm))
 
         assert result == "A screenshot showing a menu"
-        assert mock_llm.invoke.call_count == 1
+        mock_llm.ainvoke.assert_awaited_once()
+        mock_llm.invoke.assert_not_called()
 
-        message = mock_llm.invoke.call_args[0][0][0]
+        message = mock_llm.ainvoke.call_args[0][0][0]
         content = message.content
         # Find the image_url block
         image_block = next(b for b in content if b.get("type") == "image_url")
@@ -183,12 +192,49 @@ class TestDescribeFrame:
 
         # Verify the base64 is correct
         b64_part = data_url.split(",", 1)[1]
-        assert base64.b64decode(b64_part) == frame.read_bytes()
+        assert base64.b64decode(b64_part) == frame
+
+
+def _image_count(mock_llm: MagicMock, call: int = 0) -> int:
+    message = mock_llm.ainvoke.call_args_list[call][0][0][0]
+    return sum(1 for block in message.content if block["type"] == "image_url")
+
+
+class TestDescribeFramesBatch:
+    def test_splits_numbered_reply(self) -> None:
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            return_value=MagicMock(content="1. Settings open.\n2. Save clicked.")
+        )
+
+        result = asyncio.run(describe_frames_batch([b"a", b"b"], mock_llm))
+
+        assert result == ["Settings open.", "Save clicked."]
+        assert mock_llm.ainvoke.await_count == 1
+        assert _image_count(mock_llm) == 2
+
+    def test_falls_back_per_frame_on_unparseable_reply(self) -> None:
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            side_effect=[
+                MagicMock(content="Both show a dashboard."),
+                MagicMock(content="First."),
+                MagicMock(content="Second."),
+            ]
+        )
+
+        result = asyncio.run(describe_frames_batch([b"a", b"b"], mock_llm))
+
+        assert result == ["First.", "Second."]
+        assert [_image_count(mock_llm, i) for i in range(3)] == [2, 1, 1]
 
 
 class TestFetchFrameChunks:
-    @patch("multimodal_rag.ingest.video_frames.describe_frame")
-    @patch("multimodal_rag.ingest.video_frames.extract_keyframes")
+    @patch(
+        "multimodal_rag.ingest.video_frames.describe_frame_async",
+        new_callable=AsyncMock,
+    )
+    @patch("multimodal_rag.ingest.video_frames.iter_keyframes")
     @patch("multimodal_rag.ingest.video_frames.download_video")
     def test_returns_transcript_chunks(
         self,
@@ -201,11 +247,7 @@ class TestFetchFrameChunks:
         video_file.write_bytes(b"fake")
         mock_download.return_value = video_file
 
-        frame1 = tmp_path / "frame_0001.jpg"
-        frame2 = tmp_path / "frame_0002.jpg"
-        frame1.write_bytes(b"jpeg1")
-        frame2.write_bytes(b"jpeg2")
-        mock_extract.return_value = [(frame1, 0), (frame2, 30)]
+        mock_extract.return_value = [(b"jpeg1", 0), (b"jpeg2", 30)]
         mock_describe.side_effect = [
             "First frame description",
             "Second frame description",
@@ -229,8 +271,11 @@ class TestFetchFrameChunks:
         assert chunks[0].source_url == "https://youtube.com/watch?v=abc"
         assert chunks[0].source_name == "Test Video"
 
-    @patch("multimodal_rag.ingest.video_frames.describe_frame")
-    @patch("multimodal_rag.ingest.video_frames.extract_keyframes")
+    @patch(
+        "multimodal_rag.ingest.video_frames.describe_frame_async",
+        new_callable=AsyncMock,
+    )
+    @patch("multimodal_rag.ingest.video_frames.iter_keyframes")
     @patch("multimodal_rag.ingest.video_frames.download_video")
     def test_skips_failed_frames_and_continues(
         self,
@@ -243,11 +288,7 @@ class TestFetchFrameChunks:
         video_file.write_bytes(b"fake")
         mock_download.return_value = video_file
 
-        frame1 = tmp_path / "frame_0001.jpg"
-        frame2 = tmp_path / "frame_0002.jpg"
-        frame1.write_bytes(b"jpeg1")
-        frame2.write_bytes(b"jpeg2")
-        mock_extract.return_value = [(frame1, 0), (frame2, 30)]
+        mock_extract.return_value = [(b"jpeg1", 0), (b"jpeg2", 30)]
         mock_describe.side_effect = [RuntimeError("LLM error"), "Good description"]
 
         mock_llm = MagicMock()
@@ -262,8 +303,125 @@ class TestFetchFrameChunks:
         assert chunks[0].text == "Good description"
         assert chunks[0].start_seconds == 30
 
-    @patch("multimodal_rag.ingest.video_frames.describe_frame")
-    @patch("multimodal_rag.ingest.video_frames.extract_keyframes")
+    @patch(
+        "multimodal_rag.ingest.video_frames.describe_frame_async",
+        new_callable=AsyncMock,
+    )
+    @patch("multimodal_rag.ingest.video_frames.iter_keyframes")
+    @patch("multimodal_rag.ingest.video_frames.download_video")
+    def test_describes_frames_while_extracting(
+        self,
+        mock_download: MagicMock,
+        mock_iter: MagicMock,
+        mock_describe: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        video_file = tmp_path / "video.mp4"
+        video_file.write_bytes(b"fake")
+        mock_download.return_value = video_file
+        first_described = threading.Event()
+
+        def _frames() -> Iterator[tuple[bytes, int]]:
+            yield b"jpeg1", 0
+            # The first frame is described before the second is produced
+            assert first_described.wait(timeout=5)
+            yield b"jpeg2", 30
+
+        async def _describe(image_bytes: bytes, *_args: object, **_kw: object) -> str:
+            first_described.set()
+            return image_bytes.decode()
+
+        mock_iter.return_value = _frames()
+        mock_describe.side_effect = _describe
+
+        chunks = fetch_frame_chunks(
+            "https://youtube.com/watch?v=abc", "Test Video", MagicMock()
+        )
+
+        assert [(c.text, c.start_seconds) for c in chunks] == [
+            ("jpeg1", 0),
+            ("jpeg2", 30),
+        ]
+
+    @patch("multimodal_rag.ingest.video_frames.iter_keyframes")
+    @patch("multimodal_rag.ingest.video_frames.download_video")
+    def test_groups_frames_per_call(
+        self,
+        mock_download: MagicMock,
+        mock_iter: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        video_file = tmp_path / "video.mp4"
+        video_file.write_bytes(b"fake")
+        mock_download.return_value = video_file
+        mock_iter.return_value = iter([(b"a", 0), (b"b", 5), (b"c", 10)])
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            side_effect=[
+                MagicMock(content="1. A\n2. B"),
+                MagicMock(content="C"),
+            ]
+        )
+
+        chunks = fetch_frame_chunks(
+            "https://youtube.com/watch?v=abc",
+            "Test Video",
+            mock_llm,
+            interval_seconds=5,
+            frames_per_call=2,
+        )
+
+        assert [(c.text, c.start_seconds) for c in chunks] == [
+            ("A", 0),
+            ("B", 5),
+            ("C", 10),
+        ]
+        assert [_image_count(mock_llm, i) for i in range(2)] == [2, 1]
+
+    @patch(
+        "multimodal_rag.ingest.video_frames.describe_frame_async",
+        new_callable=AsyncMock,
+    )
+    @patch("multimodal_rag.ingest.video_frames.iter_keyframes")
+    @patch("multimodal_rag.ingest.video_frames.download_video")
+    def test_reuses_cached_frame_descriptions(
+        self,
+        mock_download: MagicMock,
+        mock_extract: MagicMock,
+        mock_describe: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        video_file = tmp_path / "video.mp4"
+        video_file.write_bytes(b"fake")
+        mock_download.return_value = video_file
+        mock_describe.side_effect = ["First", "Second", "Third"]
+
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            mock_extract.return_value = [(b"jpeg1", 0), (b"jpeg2", 30)]
+            fetch_frame_chunks(
+                "https://youtube.com/watch?v=abc",
+                "Test Video",
+                MagicMock(),
+                cache=cache,
+                vision_model="vis",
+            )
+            mock_extract.return_value = [(b"jpeg1", 0), (b"jpeg3", 30)]
+            chunks = fetch_frame_chunks(
+                "https://youtube.com/watch?v=abc",
+                "Test Video",
+                MagicMock(),
+                cache=cache,
+                vision_model="vis",
+            )
+
+        assert [c.text for c in chunks] == ["First", "Third"]
+        assert mock_describe.call_count == 3
+
+    @patch(
+        "multimodal_rag.ingest.video_frames.describe_frame_async",
+        new_callable=AsyncMock,
+    )
+    @patch("multimodal_rag.ingest.video_frames.iter_keyframes")
     @patch("multimodal_rag.ingest.video_frames.download_video")
     def test_stable_chunk_id_for_same_url_and_timestamp(
         self,
@@ -279,9 +437,7 @@ class TestFetchFrameChunks:
         video_file.write_bytes(b"fake")
         mock_download.return_value = video_file
 
-        frame = tmp_path / "frame_0001.jpg"
-        frame.write_bytes(b"jpeg")
-        mock_extract.return_value = [(frame, 60)]
+        mock_extract.return_value = [(b"jpeg", 60)]
         mock_llm = MagicMock()
 
         url = "https://youtube.com/watch?v=abc"
@@ -300,14 +456,19 @@ class TestFetchFrameChunks:
 
 class TestFetchFusedChunks:
     VIDEO_URL = "https://youtu.be/test123"
+    # Transcripts are cached by video ID, so these tests need a valid one
+    CACHED_URL = "https://www.youtube.com/watch?v=abc123defgh"
     SOURCE_NAME = "Test Video"
 
-    def _make_segment(self, text: str, start: float, duration: float = 10.0) -> dict:
-        return {"text": text, "start": start, "duration": duration}
+    def _make_segment(self, text: str, start: float, duration: float = 10.0) -> Segment:
+        return Segment(text, start, duration)
 
-    @patch("multimodal_rag.ingest.video_frames.describe_frame")
-    @patch("multimodal_rag.ingest.video_frames.extract_keyframes")
-    @patch("multimodal_rag.ingest.video_frames.transcribe_with_voxtral")
+    @patch(
+        "multimodal_rag.ingest.video_frames.describe_frame_async",
+        new_callable=AsyncMock,
+    )
+    @patch("multimodal_rag.ingest.video_frames.iter_keyframes")
+    @patch("multimodal_rag.ingest.video_frames.transcribe_audio")
     @patch("multimodal_rag.ingest.video_frames.extract_audio")
     @patch("multimodal_rag.ingest.video_frames.download_video")
     def test_combined_text_when_transcript_and_vision(
@@ -330,11 +491,7 @@ class TestFetchFusedChunks:
             self._make_segment("Hello world", 0.0),
             self._make_segment("Second window", 30.0),
         ]
-        frame0 = tmp_path / "frame0.jpg"
-        frame1 = tmp_path / "frame1.jpg"
-        frame0.write_bytes(b"img")
-        frame1.write_bytes(b"img")
-        mock_keyframes.return_value = [(frame0, 0), (frame1, 30)]
+        mock_keyframes.return_value = [(b"img0", 0), (b"img1", 30)]
         mock_describe.side_effect = ["UI screenshot", "Button panel"]
 
         mock_vision = MagicMock()
@@ -348,7 +505,7 @@ class TestFetchFusedChunks:
         assert result[1].text == "[Transcript] Second window\n[Visual] Button panel"
         assert result[1].start_seconds == 30
 
-    @patch("multimodal_rag.ingest.video_frames.transcribe_with_voxtral")
+    @patch("multimodal_rag.ingest.video_frames.transcribe_audio")
     @patch("multimodal_rag.ingest.video_frames.extract_audio")
     @patch("multimodal_rag.ingest.video_frames.download_video")
     def test_transcript_only_when_no_vision_llm(
@@ -376,9 +533,12 @@ class TestFetchFusedChunks:
         assert result[0].text == "Just audio"
         assert "[Visual]" not in result[0].text
 
-    @patch("multimodal_rag.ingest.video_frames.describe_frame")
-    @patch("multimodal_rag.ingest.video_frames.extract_keyframes")
-    @patch("multimodal_rag.ingest.video_frames.transcribe_with_voxtral")
+    @patch(
+        "multimodal_rag.ingest.video_frames.describe_frame_async",
+        new_callable=AsyncMock,
+    )
+    @patch("multimodal_rag.ingest.video_frames.iter_keyframes")
+    @patch("multimodal_rag.ingest.video_frames.transcribe_audio")
     @patch("multimodal_rag.ingest.video_frames.extract_audio")
     @patch("multimodal_rag.ingest.video_frames.download_video")
     def test_visual_only_for_silent_window(
@@ -398,11 +558,7 @@ class TestFetchFusedChunks:
         mock_extract_audio.return_value = audio_file
         # Only segment in window 0; window 1 is silent
         mock_transcribe.return_value = [self._make_segment("Hello", 0.0)]
-        frame0 = tmp_path / "f0.jpg"
-        frame1 = tmp_path / "f1.jpg"
-        frame0.write_bytes(b"img")
-        frame1.write_bytes(b"img")
-        mock_keyframes.return_value = [(frame0, 0), (frame1, 30)]
+        mock_keyframes.return_value = [(b"img0", 0), (b"img1", 30)]
         mock_describe.side_effect = ["Window 0 desc", "Window 1 desc"]
 
         mock_vision = MagicMock()
@@ -414,7 +570,46 @@ class TestFetchFusedChunks:
         assert "[Transcript]" in result[0].text
         assert result[1].text == "[Visual] Window 1 desc"
 
-    @patch("multimodal_rag.ingest.video_frames.transcribe_with_voxtral")
+    @patch(
+        "multimodal_rag.ingest.video_frames.describe_frame_async",
+        new_callable=AsyncMock,
+    )
+    @patch("multimodal_rag.ingest.video_frames.iter_keyframes")
+    @patch("multimodal_rag.ingest.video_frames.transcribe_audio")
+    @patch("multimodal_rag.ingest.video_frames.extract_audio")
+    @patch("multimodal_rag.ingest.video_frames.download_video")
+    def test_failed_frame_keeps_transcript(
+        self,
+        mock_download: MagicMock,
+        mock_extract_audio: MagicMock,
+        mock_transcribe: MagicMock,
+        mock_keyframes: MagicMock,
+        mock_describe: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        video_file = tmp_path / "video.mp4"
+        video_file.write_bytes(b"fake")
+        audio_file = tmp_path / "video.mp3"
+        audio_file.write_bytes(b"fake audio")
+        mock_download.return_value = video_file
+        mock_extract_audio.return_value = audio_file
+        mock_transcribe.return_value = [
+            self._make_segment("Hello", 0.0),
+            self._make_segment("World", 30.0),
+        ]
+        mock_keyframes.return_value = [(b"img0", 0), (b"img1", 30)]
+        mock_describe.side_effect = [RuntimeError("vision down"), "Button panel"]
+
+        result = fetch_fused_chunks(
+            self.VIDEO_URL, self.SOURCE_NAME, "key", MagicMock()
+        )
+
+        assert [c.text for c in result] == [
+            "Hello",
+            "[Transcript] World\n[Visual] Button panel",
+        ]
+
+    @patch("multimodal_rag.ingest.video_frames.transcribe_audio")
     @patch("multimodal_rag.ingest.video_frames.extract_audio")
     @patch("multimodal_rag.ingest.video_frames.download_video")
     def test_skips_empty_window_when_no_vision(
@@ -443,7 +638,7 @@ class TestFetchFusedChunks:
         assert len(result) == 1
         assert result[0].text == "Only here"
 
-    @patch("multimodal_rag.ingest.video_frames.transcribe_with_voxtral")
+    @patch("multimodal_rag.ingest.video_frames.transcribe_audio")
     @patch("multimodal_rag.ingest.video_frames.extract_audio")
     @patch("multimodal_rag.ingest.video_frames.download_video")
     def test_single_download_call(
@@ -465,3 +660,72 @@ class TestFetchFusedChunks:
 
         assert mock_download.call_count == 1
         assert mock_extract_audio.call_count == 1
+
+    @patch("multimodal_rag.ingest.video_frames.transcribe_audio")
+    @patch("multimodal_rag.ingest.video_frames.extract_audio")
+    @patch("multimodal_rag.ingest.video_frames.download_video")
+    def test_reuses_cached_voxtral_transcript(
+        self,
+        mock_download: MagicMock,
+        mock_extract_audio: MagicMock,
+        mock_transcribe: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        video_file = tmp_path / "video.mp4"
+        video_file.write_bytes(b"fake")
+        audio_file = tmp_path / "video.mp3"
+        audio_file.write_bytes(b"fake audio")
+        mock_download.return_value = video_file
+        mock_extract_audio.return_value = audio_file
+        mock_transcribe.return_value = [self._make_segment("Just audio", 0.0)]
+
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            first = fetch_fused_chunks(
+                self.CACHED_URL, self.SOURCE_NAME, "key", None, cache=cache
+            )
+            second = fetch_fused_chunks(
+                self.CACHED_URL, self.SOURCE_NAME, "key", None, cache=cache
+            )
+
+        assert [c.text for c in second] == [c.text for c in first] == ["Just audio"]
+        # Without vision the second run needs neither the video nor Voxtral
+        assert mock_download.call_count == 1
+        assert mock_transcribe.call_count == 1
+
+    @patch(
+        "multimodal_rag.ingest.video_frames.describe_frame_async",
+        new_callable=AsyncMock,
+    )
+    @patch("multimodal_rag.ingest.video_frames.iter_keyframes")
+    @patch("multimodal_rag.ingest.video_frames.transcribe_audio")
+    @patch("multimodal_rag.ingest.video_frames.extract_audio")
+    @patch("multimodal_rag.ingest.video_frames.download_video")
+    def test_cached_transcript_downloads_video_without_audio(
+        self,
+        mock_download: MagicMock,
+        mock_extract_audio: MagicMock,
+        mock_transcribe: MagicMock,
+        mock_keyframes: MagicMock,
+        mock_describe: AsyncMock,
+        tmp_path: Path,
+    ) -> None:
+        video_file = tmp_path / "video.mp4"
+        video_file.write_bytes(b"fake")
+        mock_download.return_value = video_file
+        mock_keyframes.return_value = iter([(b"frame", 0)])
+        mock_describe.return_value = "UI screenshot"
+
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            cache.put_transcript(
+                "abc123defgh", "voxtral", [self._make_segment("Hello world", 0.0)]
+            )
+            result = fetch_fused_chunks(
+                self.CACHED_URL, self.SOURCE_NAME, "key", MagicMock(), cache=cache
+            )
+
+        assert [c.text for c in result] == [
+            "[Transcript] Hello world\n[Visual] UI screenshot"
+        ]
+        assert mock_download.call_args.kwargs["include_audio"] is False
+        mock_extract_audio.assert_not_called()
+        mock_transcribe.assert_not_called()
@@ -0,0 +1,20 @@
+"""Tests for the shared vision LLM reply helpers."""
+
+from multimodal_rag.ingest.vision import split_numbered
+
+
+class TestSplitNumbered:
+    def test_splits_numbered_items(self) -> None:
+        text = "1. A login form.\n2) A settings menu\nwith tabs.\n3. A chart."
+        assert split_numbered(text, 3) == [
+            "A login form.",
+            "A settings menu\nwith tabs.",
+            "A chart.",
+        ]
+
+    def test_wrong_count_returns_none(self) -> None:
+        assert split_numbered("1. One.\n2. Two.", 3) is None
+
+    def test_nested_numbering_returns_none(self) -> None:
+        text = "1. Steps:\n1. click\n2. Other."
+        assert split_numbered(text, 2) is None
@@ -11,11 +11,15 @@ from youtube_transcript_api import (
 )
 
 from multimodal_rag.ingest.voxtral import (
+    _get_client,
     download_audio,
     fetch_voxtral_transcript,
+    split_audio,
+    transcribe_audio,
     transcribe_with_voxtral,
 )
 from multimodal_rag.ingest.youtube import fetch_transcript_chunks
+from multimodal_rag.models.chunks import Segment
 
 # ---------------------------------------------------------------------------
 # voxtral.download_audio
@@ -40,7 +44,10 @@ class TestDownloadAudio:
 
         # Verify YoutubeDL was constructed with the right format
         call_kwargs = mock_ydl_cls.call_args[0][0]
-        assert call_kwargs["format"] == "bestaudio[ext=m4a]/bestaudio"
+        assert call_kwargs["format"] == (
+            "bestaudio[ext=m4a][abr<=?128]/bestaudio[ext=m4a]/bestaudio"
+        )
+        assert call_kwargs["concurrent_fragment_downloads"] == 8
         assert result == tmp_path / "abc123.m4a"
 
     @patch("multimodal_rag.ingest.voxtral.yt_dlp.YoutubeDL")
@@ -69,6 +76,11 @@ class TestDownloadAudio:
 
 
 class TestTranscribeWithVoxtral:
+    @pytest.fixture(autouse=True)
+    def _fresh_clients(self) -> None:
+        # Clients are cached per key; each test patches its own Mistral
+        _get_client.cache_clear()
+
     def _make_segment(
         self, text: str, start: float, end: float
     ) -> MagicMock:
@@ -98,8 +110,8 @@ class TestTranscribeWithVoxtral:
         result = transcribe_with_voxtral(media_file, "fake-key")
 
         assert len(result) == 2
-        assert result[0] == {"text": "Hello world", "start": 0.0, "duration": 2.5}
-        assert result[1] == {"text": "How are you", "start": 2.5, "duration": 2.5}
+        assert result[0] == Segment("Hello world", 0.0, 2.5)
+        assert result[1] == Segment("How are you", 2.5, 2.5)
 
     @patch("multimodal_rag.ingest.voxtral.Mistral")
     def test_duration_equals_end_minus_start(
@@ -117,7 +129,7 @@ class TestTranscribeWithVoxtral:
 
         result = transcribe_with_voxtral(media_file, "fake-key")
 
-        assert pytest.approx(result[0]["duration"]) == 3.7
+        assert pytest.approx(result[0].duration) == 3.7
 
     @patch("multimodal_rag.ingest.voxtral.Mistral")
     def test_empty_segments_returns_empty_list(
@@ -157,6 +169,28 @@ class TestTranscribeWithVoxtral:
         assert call_kwargs["timestamp_granularities"] == ["segment"]
         assert call_kwargs["model"] == "voxtral-mini-latest"
 
+    @patch("multimodal_rag.ingest.voxtral.Mistral")
+    def test_uploads_file_handle_not_bytes(
+        self, mock_mistral_cls: MagicMock, tmp_path: Path
+    ) -> None:
+        import io
+
+        media_file = tmp_path / "audio.mp3"
+        media_file.write_bytes(b"fake")
+
+        mock_client = MagicMock()
+        mock_mistral_cls.return_value = mock_client
+        response = MagicMock()
+        response.segments = [self._make_segment("Hi", 0.0, 1.0)]
+        mock_client.audio.transcriptions.complete.return_value = response
+
+        transcribe_with_voxtral(media_file, "fake-key")
+
+        file_arg = mock_client.audio.transcriptions.complete.call_args.kwargs["file"]
+        assert isinstance(file_arg["content"], io.BufferedReader)
+        assert file_arg["content_type"] == "audio/mpeg"
+        assert file_arg["file_name"] == "audio.mp3"
+
     def test_retries_on_429_then_succeeds(self, tmp_path: Path) -> None:
         import httpx
         from mistralai.client.errors import MistralError
@@ -229,6 +263,84 @@ class TestTranscribeWithVoxtral:
 
         assert mock_client.audio.transcriptions.complete.call_count == 3
 
+    @patch("multimodal_rag.ingest.voxtral.Mistral")
+    def test_reuses_client_across_calls(
+        self, mock_mistral_cls: MagicMock, tmp_path: Path
+    ) -> None:
+        media_file = tmp_path / "audio.m4a"
+        media_file.write_bytes(b"fake")
+        response = MagicMock()
+        response.segments = [self._make_segment("Hi", 0.0, 1.0)]
+        mock_client = mock_mistral_cls.return_value
+        mock_client.audio.transcriptions.complete.return_value = response
+
+        transcribe_with_voxtral(media_file, "key")
+        transcribe_with_voxtral(media_file, "key")
+
+        mock_mistral_cls.assert_called_once_with(api_key="key")
+        assert mock_client.audio.transcriptions.complete.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# voxtral.split_audio / voxtral.transcribe_audio
+# ---------------------------------------------------------------------------
+
+
+class TestSplitAudio:
+    @patch("multimodal_rag.ingest.voxtral.subprocess.run")
+    def test_returns_parts_with_offsets(
+        self, mock_run: MagicMock, tmp_path: Path
+    ) -> None:
+        def fake_ffmpeg(cmd: list[str], **_kwargs: object) -> None:
+            (tmp_path / "parts.csv").write_text(
+                "part_000.mp3,0.000000,600.024\npart_001.mp3,600.024,900.000\n"
+            )
+
+        mock_run.side_effect = fake_ffmpeg
+
+        parts = split_audio(tmp_path / "audio.mp3", tmp_path, 600)
+
+        assert parts == [
+            (tmp_path / "part_000.mp3", 0.0),
+            (tmp_path / "part_001.mp3", 600.024),
+        ]
+        cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index("-segment_time") + 1] == "600"
+        assert cmd[cmd.index("-c") + 1] == "copy"
+
+
+class TestTranscribeAudio:
+    @patch("multimodal_rag.ingest.voxtral.transcribe_with_voxtral")
+    @patch("multimodal_rag.ingest.voxtral._audio_duration", return_value=300.0)
+    def test_short_audio_is_sent_whole(
+        self, _mock_duration: MagicMock, mock_transcribe: MagicMock
+    ) -> None:
+        mock_transcribe.return_value = [Segment("Hi", 0.0, 1.0)]
+
+        result = transcribe_audio(Path("audio.mp3"), "key")
+
+        assert result == [Segment("Hi", 0.0, 1.0)]
+        mock_transcribe.assert_called_once_with(Path("audio.mp3"), "key")
+
+    @patch("multimodal_rag.ingest.voxtral.transcribe_with_voxtral")
+    @patch("multimodal_rag.ingest.voxtral.split_audio")
+    @patch("multimodal_rag.ingest.voxtral._audio_duration", return_value=1500.0)
+    def test_long_audio_parts_are_shifted_onto_timeline(
+        self,
+        _mock_duration: MagicMock,
+        mock_split: MagicMock,
+        mock_transcribe: MagicMock,
+    ) -> None:
+        mock_split.return_value = [(Path("p0.mp3"), 0.0), (Path("p1.mp3"), 600.5)]
+        mock_transcribe.side_effect = lambda path, _key: {
+            Path("p0.mp3"): [Segment("Start", 1.0, 2.0)],
+            Path("p1.mp3"): [Segment("Later", 3.0, 4.0)],
+        }[path]
+
+        result = transcribe_audio(Path("audio.mp3"), "key")
+
+        assert result == [Segment("Start", 1.0, 2.0), Segment("Later", 603.5, 4.0)]
+
 
 # ---------------------------------------------------------------------------
 # voxtral.fetch_voxtral_transcript
@@ -252,7 +364,7 @@ class TestFetchVoxtralTranscript:
             return f
 
         mock_download.side_effect = fake_download
-        mock_transcribe.return_value = [{"text": "Hi", "start": 0.0, "duration": 1.0}]
+        mock_transcribe.return_value = [Segment("Hi", 0.0, 1.0)]
 
         fetch_voxtral_transcript("https://youtu.be/abc", "key")
 
@@ -270,7 +382,7 @@ class TestFetchVoxtralTranscript:
         audio_file = tmp_path / "audio.m4a"
         audio_file.write_bytes(b"fake")
         mock_download.return_value = audio_file
-        expected = [{"text": "Hello", "start": 0.0, "duration": 2.0}]
+        expected = [Segment("Hello", 0.0, 2.0)]
         mock_transcribe.return_value = expected
 
         result = fetch_voxtral_transcript("https://youtu.be/abc", "key")
@@ -293,7 +405,7 @@ class TestFetchTranscriptChunksFallback:
     ) -> None:
         mock_fetch.side_effect = TranscriptsDisabled("vid")
         mock_voxtral.return_value = [
-            {"text": "Hello from audio", "start": 0.0, "duration": 5.0}
+            Segment("Hello from audio", 0.0, 5.0)
         ]
 
         chunks = fetch_transcript_chunks(
@@ -317,7 +429,7 @@ class TestFetchTranscriptChunksFallback:
     ) -> None:
         mock_fetch.side_effect = NoTranscriptFound("vid", [], {})
         mock_voxtral.return_value = [
-            {"text": "Audio content", "start": 0.0, "duration": 3.0}
+            Segment("Audio content", 0.0, 3.0)
         ]
 
         chunks = fetch_transcript_chunks(
@@ -329,12 +441,14 @@ class TestFetchTranscriptChunksFallback:
         mock_voxtral.assert_called_once()
         assert len(chunks) == 1
 
+    @patch("multimodal_rag.ingest.youtube.time.sleep")
     @patch("multimodal_rag.ingest.youtube.fetch_voxtral_transcript")
     @patch("multimodal_rag.ingest.youtube.fetch_transcript")
     def test_ip_blocked_does_not_fall_back(
         self,
         mock_fetch: MagicMock,
         mock_voxtral: MagicMock,
+        _mock_sleep: MagicMock,
     ) -> None:
         mock_fetch.side_effect = IpBlocked("vid")
 
@@ -1,15 +1,22 @@
 """Tests for web image extraction and description."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import base64
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from multimodal_rag.ingest.web_images import (
+    _host_is_public,
     describe_image,
+    describe_images_batch,
     extract_image_urls,
     fetch_image_chunks,
 )
 from multimodal_rag.models.chunks import SupportChunk, WebChunk
+from multimodal_rag.store.cache import IngestCache
 
 
 class TestExtractImageUrls:
@@ -37,6 +44,11 @@ class TestExtractImageUrls:
         result = extract_image_urls(markdown)
         assert result == [url]
 
+    def test_nested_brackets_in_alt_text(self) -> None:
+        markdown = "![Open [Settings] menu](https://example.com/settings.png)"
+        result = extract_image_urls(markdown)
+        assert result == ["https://example.com/settings.png"]
+
     def test_empty_markdown_returns_empty(self) -> None:
         assert extract_image_urls("No images here.") == []
 
@@ -54,11 +66,13 @@ class TestExtractImageUrls:
         ]
 
 
+@patch(
+    "multimodal_rag.ingest.web_images._host_is_public",
+    new=MagicMock(return_value=False),
+)
 class TestDescribeImage:
-    @patch("multimodal_rag.ingest.web_images.httpx.get")
-    def test_downloads_and_calls_llm(self, mock_get: MagicMock) -> None:
-        import base64
-
+    @patch.object(httpx.AsyncClient, "get", new_callable=AsyncMock)
+    def test_downloads_and_calls_llm(self, mock_get: AsyncMock) -> None:
         image_bytes = b"\x89PNG\r\n\x1a\n" + b"\x00" * 20
         mock_response = MagicMock()
         mock_response.content = image_bytes
@@ -66,46 +80,36 @@ class TestDescribeImage:
         mock_get.return_value = mock_response
 
         mock_llm = MagicMock()
-        mock_llm.invoke.return_value = MagicMock(content="A form with input fields")
+        mock_llm.ainvoke = AsyncMock(
+            return_value=MagicMock(content="A form with input fields")
+        )
 
         result = describe_image("https://example.com/screen.png", mock_llm)
 
         assert result == "A form with input fields"
-        mock_get.assert_called_once_with(
-            "https://example.com/screen.png", follow_redirects=True, timeout=30
-        )
+        mock_get.assert_called_once_with("https://example.com/screen.png")
 
-        message = mock_llm.invoke.call_args[0][0][0]
-        image_block = next(
-            b for b in message.content if b.get("type") == "image_url"
-        )
-        data_url = image_block["image_url"]["url"]
+        data_url = _image_urls_sent(mock_llm)[0]
         assert data_url.startswith("data:image/png;base64,")
         b64_part = data_url.split(",", 1)[1]
         assert base64.b64decode(b64_part) == image_bytes
 
-    @patch("multimodal_rag.ingest.web_images.httpx.get")
-    def test_falls_back_to_jpeg_content_type(self, mock_get: MagicMock) -> None:
+    @patch.object(httpx.AsyncClient, "get", new_callable=AsyncMock)
+    def test_falls_back_to_jpeg_content_type(self, mock_get: AsyncMock) -> None:
         mock_response = MagicMock()
         mock_response.content = b"fakeimg"
         mock_response.headers = {}  # no content-type header
         mock_get.return_value = mock_response
 
         mock_llm = MagicMock()
-        mock_llm.invoke.return_value = MagicMock(content="A button")
+        mock_llm.ainvoke = AsyncMock(return_value=MagicMock(content="A button"))
 
         describe_image("https://example.com/img", mock_llm)
 
-        message = mock_llm.invoke.call_args[0][0][0]
-        image_block = next(
-            b for b in message.content if b.get("type") == "image_url"
-        )
-        assert "image/jpeg" in image_block["image_url"]["url"]
-
-    @patch("multimodal_rag.ingest.web_images.httpx.get")
-    def test_raises_on_http_error(self, mock_get: MagicMock) -> None:
-        import httpx
+        assert "image/jpeg" in _image_urls_sent(mock_llm)[0]
 
+    @patch.object(httpx.AsyncClient, "get", new_callable=AsyncMock)
+    def test_raises_on_http_error(self, mock_get: AsyncMock) -> None:
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
             "404", request=MagicMock(), response=MagicMock()
@@ -117,18 +121,86 @@ class TestDescribeImage:
             describe_image("https://example.com/missing.png", mock_llm)
 
 
+def _fake_download(url: str, client: object) -> str:
+    return f"data:image/png;base64,{url}"
+
+
+def _image_urls_sent(mock_llm: MagicMock, call: int = 0) -> list[str]:
+    message = mock_llm.ainvoke.call_args_list[call][0][0][0]
+    return [
+        b["image_url"]["url"] for b in message.content if b["type"] == "image_url"
+    ]
+
+
+class TestDescribeImagesBatch:
+    def test_single_call_for_batch(self) -> None:
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            return_value=MagicMock(content="1. First.\n2. Second.")
+        )
+
+        result = asyncio.run(describe_images_batch(["data:a", "data:b"], mock_llm))
+
+        assert result == ["First.", "Second."]
+        assert mock_llm.ainvoke.await_count == 1
+        assert _image_urls_sent(mock_llm) == ["data:a", "data:b"]
+
+    def test_reads_text_from_content_blocks(self) -> None:
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            return_value=MagicMock(
+                content=[
+                    {"type": "reasoning", "reasoning": "Two images."},
+                    {"type": "text", "text": "1. First.\n2. Second."},
+                ]
+            )
+        )
+
+        result = asyncio.run(describe_images_batch(["data:a", "data:b"], mock_llm))
+
+        assert result == ["First.", "Second."]
+
+    def test_falls_back_per_image_on_unparseable_reply(self) -> None:
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            side_effect=[
+                MagicMock(content="Both show a dashboard."),
+                MagicMock(content="First."),
+                MagicMock(content="Second."),
+            ]
+        )
+
+        result = asyncio.run(describe_images_batch(["data:a", "data:b"], mock_llm))
+
+        assert result == ["First.", "Second."]
+        assert _image_urls_sent(mock_llm, 1) == ["data:a"]
+        assert _image_urls_sent(mock_llm, 2) == ["data:b"]
+
+
+@patch(
+    "multimodal_rag.ingest.web_images._download_image",
+    new_callable=AsyncMock,
+    side_effect=_fake_download,
+)
+@patch(
+    "multimodal_rag.ingest.web_images._host_is_public",
+    new=MagicMock(return_value=False),
+)
 class TestFetchImageChunks:
-    @patch("multimodal_rag.ingest.web_images.describe_image")
-    def test_returns_web_chunks_with_image_url(
-        self, mock_describe: MagicMock
-    ) -> None:
+    def _llm(self, *replies: str) -> MagicMock:
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            side_effect=[MagicMock(content=r) for r in replies]
+        )
+        return mock_llm
+
+    def test_returns_web_chunks_with_image_url(self, _mock_dl: AsyncMock) -> None:
         markdown = (
             "![Screenshot](https://example.com/screen1.png)\n"
             "Some text\n"
             "![Another](https://example.com/screen2.png)"
         )
-        mock_describe.side_effect = ["Screen one description", "Screen two description"]
-        mock_llm = MagicMock()
+        mock_llm = self._llm("Screen one description", "Screen two description")
 
         chunks = fetch_image_chunks(
             "https://docs.example.com/page",
@@ -145,19 +217,13 @@ class TestFetchImageChunks:
         assert chunks[0].source_name == "Example Docs"
         assert chunks[1].image_url == "https://example.com/screen2.png"
 
-    @patch("multimodal_rag.ingest.web_images.describe_image")
-    def test_skips_failed_images_and_continues(
-        self, mock_describe: MagicMock
-    ) -> None:
+    def test_skips_failed_images_and_continues(self, mock_dl: AsyncMock) -> None:
         markdown = (
             "![A](https://example.com/a.png) "
             "![B](https://example.com/b.png)"
         )
-        mock_describe.side_effect = [
-            RuntimeError("Download failed"),
-            "Good description",
-        ]
-        mock_llm = MagicMock()
+        mock_dl.side_effect = [RuntimeError("Download failed"), "data:b"]
+        mock_llm = self._llm("Good description")
 
         chunks = fetch_image_chunks(
             "https://docs.example.com/page",
@@ -170,28 +236,202 @@ class TestFetchImageChunks:
         assert chunks[0].text == "Good description"
         assert chunks[0].image_url == "https://example.com/b.png"
 
-    @patch("multimodal_rag.ingest.web_images.describe_image")
-    def test_stable_chunk_id_for_same_image_url(
-        self, mock_describe: MagicMock
-    ) -> None:
+    def test_stable_chunk_id_for_same_image_url(self, _mock_dl: AsyncMock) -> None:
         """chunk_id must be stable regardless of LLM description text."""
         markdown = "![A](https://example.com/screen.png)"
-        mock_llm = MagicMock()
 
-        mock_describe.return_value = "Description version A"
-        chunks_a = fetch_image_chunks("https://p.com/page", "P", markdown, mock_llm)
+        llm_a = self._llm("Description version A")
+        chunks_a = fetch_image_chunks("https://p.com/page", "P", markdown, llm_a)
 
-        mock_describe.return_value = "Description version B"
-        chunks_b = fetch_image_chunks("https://p.com/page", "P", markdown, mock_llm)
+        llm_b = self._llm("Description version B")
+        chunks_b = fetch_image_chunks("https://p.com/page", "P", markdown, llm_b)
 
         id_a = SupportChunk.from_screenshot_chunk(chunks_a[0]).chunk_id
         id_b = SupportChunk.from_screenshot_chunk(chunks_b[0]).chunk_id
 
         assert id_a == id_b
 
-    def test_empty_markdown_returns_empty(self) -> None:
+    def test_describes_images_concurrently(self, _mock_dl: AsyncMock) -> None:
+        in_flight = 0
+        peak = 0
+
+        async def _slow(messages: list[MagicMock]) -> MagicMock:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MagicMock(content="desc")
+
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(side_effect=_slow)
+        markdown = " ".join(f"![{i}](https://ex.com/{i}.png)" for i in range(20))
+
+        chunks = fetch_image_chunks("https://p.com/page", "P", markdown, mock_llm)
+
+        assert len(chunks) == 20
+        assert 1 < peak <= 8
+
+    def test_batches_images_per_call(self, _mock_dl: AsyncMock) -> None:
+        markdown = " ".join(f"![{i}](https://ex.com/{i}.png)" for i in range(5))
+        mock_llm = self._llm("1. a\n2. b\n3. c", "1. d\n2. e")
+
+        chunks = fetch_image_chunks(
+            "https://p.com/page", "P", markdown, mock_llm, images_per_call=3
+        )
+
+        assert mock_llm.ainvoke.await_count == 2
+        assert [c.text for c in chunks] == ["a", "b", "c", "d", "e"]
+        assert [c.image_url for c in chunks] == [
+            f"https://ex.com/{i}.png" for i in range(5)
+        ]
+
+    def test_skips_already_ingested_urls(self, _mock_dl: AsyncMock) -> None:
+        markdown = "![A](https://ex.com/a.png) ![B](https://ex.com/b.png)"
+        mock_llm = self._llm("B description")
+
+        chunks = fetch_image_chunks(
+            "https://p.com/page",
+            "P",
+            markdown,
+            mock_llm,
+            skip_urls={"https://ex.com/a.png"},
+        )
+
+        assert [c.image_url for c in chunks] == ["https://ex.com/b.png"]
+        assert mock_llm.ainvoke.await_count == 1
+
+    def test_reuses_cached_descriptions(
+        self, _mock_dl: AsyncMock, tmp_path: Path
+    ) -> None:
+        markdown = "![A](https://ex.com/a.png) ![B](https://ex.com/b.png)"
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            cache.put_image_descriptions({"https://ex.com/a.png": "Cached A"}, "vis")
+            mock_llm = self._llm("Fresh B")
+
+            chunks = fetch_image_chunks(
+                "https://p.com/page",
+                "P",
+                markdown,
+                mock_llm,
+                cache=cache,
+                vision_model="vis",
+            )
+
+            assert [c.text for c in chunks] == ["Cached A", "Fresh B"]
+            assert mock_llm.ainvoke.await_count == 1
+            assert cache.get_image_descriptions(["https://ex.com/b.png"], "vis") == {
+                "https://ex.com/b.png": "Fresh B"
+            }
+
+    def test_empty_markdown_returns_empty(self, _mock_dl: AsyncMock) -> None:
         mock_llm = MagicMock()
         chunks = fetch_image_chunks(
             "https://p.com/page", "P", "No images here.", mock_llm
         )
         assert chunks == []
+
+
+class TestHostIsPublic:
+    def setup_method(self) -> None:
+        _host_is_public.cache_clear()
+
+    @patch("multimodal_rag.ingest.web_images.socket.getaddrinfo")
+    def test_global_address_is_public(self, mock_resolve: MagicMock) -> None:
+        mock_resolve.return_value = [(2, 1, 6, "", ("93.184.216.34", 0))]
+        assert _host_is_public("example.com") is True
+
+    @patch("multimodal_rag.ingest.web_images.socket.getaddrinfo")
+    def test_private_address_is_not_public(self, mock_resolve: MagicMock) -> None:
+        mock_resolve.return_value = [
+            (2, 1, 6, "", ("93.184.216.34", 0)),
+            (2, 1, 6, "", ("10.0.0.5", 0)),
+        ]
+        assert _host_is_public("intranet.example.com") is False
+
+    @patch(
+        "multimodal_rag.ingest.web_images.socket.getaddrinfo",
+        side_effect=OSError("no such host"),
+    )
+    def test_unresolvable_host_is_not_public(self, _mock: MagicMock) -> None:
+        assert _host_is_public("nowhere.invalid") is False
+
+
+@patch(
+    "multimodal_rag.ingest.web_images._host_is_public",
+    new=MagicMock(return_value=True),
+)
+class TestPublicImageUrls:
+    @patch.object(httpx.AsyncClient, "get", new_callable=AsyncMock)
+    def test_describe_image_sends_url_without_download(
+        self, mock_get: AsyncMock
+    ) -> None:
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(return_value=MagicMock(content="A chart"))
+
+        result = describe_image("https://example.com/chart.png", mock_llm)
+
+        assert result == "A chart"
+        mock_get.assert_not_called()
+        assert _image_urls_sent(mock_llm) == ["https://example.com/chart.png"]
+
+    @patch.object(httpx.AsyncClient, "get", new_callable=AsyncMock)
+    def test_describe_image_inlines_when_url_rejected(
+        self, mock_get: AsyncMock
+    ) -> None:
+        mock_response = MagicMock()
+        mock_response.content = b"img"
+        mock_response.headers = {"content-type": "image/png"}
+        mock_get.return_value = mock_response
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            side_effect=[
+                RuntimeError("could not fetch image"),
+                MagicMock(content="A chart"),
+            ]
+        )
+
+        result = describe_image("https://example.com/chart.png", mock_llm)
+
+        assert result == "A chart"
+        mock_get.assert_called_once()
+
+    @patch(
+        "multimodal_rag.ingest.web_images._download_image",
+        new_callable=AsyncMock,
+        side_effect=_fake_download,
+    )
+    def test_fetch_sends_urls_without_download(self, mock_dl: AsyncMock) -> None:
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(return_value=MagicMock(content="desc"))
+
+        chunks = fetch_image_chunks(
+            "https://p.com/page", "P", "![A](https://ex.com/a.png)", mock_llm
+        )
+
+        assert [c.text for c in chunks] == ["desc"]
+        mock_dl.assert_not_awaited()
+        assert _image_urls_sent(mock_llm) == ["https://ex.com/a.png"]
+
+    @patch(
+        "multimodal_rag.ingest.web_images._download_image",
+        new_callable=AsyncMock,
+        side_effect=_fake_download,
+    )
+    def test_fetch_inlines_group_when_url_rejected(
+        self, mock_dl: AsyncMock
+    ) -> None:
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            side_effect=[RuntimeError("hotlink denied"), MagicMock(content="desc")]
+        )
+
+        chunks = fetch_image_chunks(
+            "https://p.com/page", "P", "![A](https://ex.com/a.png)", mock_llm
+        )
+
+        assert [c.text for c in chunks] == ["desc"]
+        mock_dl.assert_awaited_once()
+        assert _image_urls_sent(mock_llm, 1) == [
+            "data:image/png;base64,https://ex.com/a.png"
+        ]
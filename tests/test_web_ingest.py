@@ -1,40 +1,47 @@
 """Tests for web knowledge base ingestion."""
 
+from collections.abc import Iterator
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import pytest
+import tiktoken
+from firecrawl import RateLimitError
+from tenacity import wait_none
+
 from multimodal_rag.ingest.web import (
+    _chunk_units,
+    _crawl,
     crawl_knowledge_base,
     split_by_sections,
 )
 
 
-def _make_doc(url: str, title: str, markdown: str) -> MagicMock:
-    """Create a mock Firecrawl Document."""
-    doc = MagicMock()
-    doc.markdown = markdown
-    doc.metadata = MagicMock()
-    doc.metadata.source_url = url
-    doc.metadata.title = title
-    return doc
+def _make_doc(url: str, title: str, markdown: str) -> SimpleNamespace:
+    """Create a stand-in Firecrawl Document."""
+    return SimpleNamespace(
+        markdown=markdown, metadata=SimpleNamespace(source_url=url, title=title)
+    )
 
 
-def _make_crawl_result(pages: list[dict[str, str]]) -> MagicMock:
-    """Create a mock CrawlJob result."""
-    result = MagicMock()
-    result.data = [
-        _make_doc(p["url"], p.get("title", ""), p["content"]) for p in pages
-    ]
-    return result
+def _make_crawl_result(pages: list[dict[str, str]]) -> SimpleNamespace:
+    """Create a stand-in CrawlJob result."""
+    return SimpleNamespace(
+        data=[_make_doc(p["url"], p.get("title", ""), p["content"]) for p in pages]
+    )
 
 
 class TestCrawlKnowledgeBase:
-    @patch("multimodal_rag.ingest.web.ScrapeOptions")
-    @patch("multimodal_rag.ingest.web.FirecrawlApp")
-    def test_returns_pages_with_content(
-        self, mock_fc_cls: MagicMock, _mock_opts: MagicMock
-    ) -> None:
-        mock_app = MagicMock()
-        mock_fc_cls.return_value = mock_app
+    @pytest.fixture
+    def mock_app(self) -> Iterator[MagicMock]:
+        """The FirecrawlApp instance crawl_knowledge_base will construct."""
+        with (
+            patch("multimodal_rag.ingest.web.ScrapeOptions"),
+            patch("multimodal_rag.ingest.web.FirecrawlApp") as mock_fc_cls,
+        ):
+            yield mock_fc_cls.return_value
+
+    def test_returns_pages_with_content(self, mock_app: MagicMock) -> None:
         mock_app.crawl.return_value = _make_crawl_result(
             [
                 {"url": "https://example.com/a", "title": "A", "content": "# Hello"},
@@ -46,13 +53,24 @@ class TestCrawlKnowledgeBase:
         assert pages[0]["url"] == "https://example.com/a"
         assert pages[1]["content"] == "World"
 
-    @patch("multimodal_rag.ingest.web.ScrapeOptions")
-    @patch("multimodal_rag.ingest.web.FirecrawlApp")
-    def test_skips_empty_pages(
-        self, mock_fc_cls: MagicMock, _mock_opts: MagicMock
-    ) -> None:
-        mock_app = MagicMock()
-        mock_fc_cls.return_value = mock_app
+    @patch.object(_crawl.retry, "wait", wait_none())
+    def test_retries_on_rate_limit(self, mock_app: MagicMock) -> None:
+        mock_app.crawl.side_effect = [
+            RateLimitError("Too many requests", 429),
+            _make_crawl_result([{"url": "https://example.com/a", "content": "Hi"}]),
+        ]
+        pages = crawl_knowledge_base("https://example.com", "fake-key")
+        assert [p["url"] for p in pages] == ["https://example.com/a"]
+        assert mock_app.crawl.call_count == 2
+
+    @patch.object(_crawl.retry, "wait", wait_none())
+    def test_gives_up_after_repeated_rate_limits(self, mock_app: MagicMock) -> None:
+        mock_app.crawl.side_effect = RateLimitError("Too many requests", 429)
+        with pytest.raises(RateLimitError):
+            crawl_knowledge_base("https://example.com", "fake-key")
+        assert mock_app.crawl.call_count == 3
+
+    def test_skips_empty_pages(self, mock_app: MagicMock) -> None:
         mock_app.crawl.return_value = _make_crawl_result(
             [
                 {"url": "https://example.com/a", "content": "Real content"},
@@ -62,30 +80,14 @@ class TestCrawlKnowledgeBase:
         pages = crawl_knowledge_base("https://example.com", "fake-key")
         assert len(pages) == 1
 
-    @patch("multimodal_rag.ingest.web.ScrapeOptions")
-    @patch("multimodal_rag.ingest.web.FirecrawlApp")
-    def test_handles_empty_data(
-        self, mock_fc_cls: MagicMock, _mock_opts: MagicMock
-    ) -> None:
-        mock_app = MagicMock()
-        mock_fc_cls.return_value = mock_app
+    def test_handles_empty_data(self, mock_app: MagicMock) -> None:
         mock_app.crawl.return_value = _make_crawl_result([])
         pages = crawl_knowledge_base("https://example.com", "fake-key")
         assert pages == []
 
-    @patch("multimodal_rag.ingest.web.ScrapeOptions")
-    @patch("multimodal_rag.ingest.web.FirecrawlApp")
-    def test_handles_no_metadata(
-        self, mock_fc_cls: MagicMock, _mock_opts: MagicMock
-    ) -> None:
-        mock_app = MagicMock()
-        mock_fc_cls.return_value = mock_app
-        doc = MagicMock()
-        doc.markdown = "Some content"
-        doc.metadata = None
-        result = MagicMock()
-        result.data = [doc]
-        mock_app.crawl.return_value = result
+    def test_handles_no_metadata(self, mock_app: MagicMock) -> None:
+        doc = SimpleNamespace(markdown="Some content", metadata=None)
+        mock_app.crawl.return_value = SimpleNamespace(data=[doc])
         pages = crawl_knowledge_base("https://example.com", "fake-key")
         assert len(pages) == 1
         assert pages[0]["url"] == "https://example.com"
@@ -94,66 +96,158 @@ class TestCrawlKnowledgeBase:
 class TestSplitBySections:
     def test_splits_on_headers(self) -> None:
         content = "## Intro\nSome intro text.\n## Details\nMore details here."
-        chunks = split_by_sections(content, "https://ex.com", "Test")
+        chunks = list(split_by_sections(content, "https://ex.com", "Test"))
         assert len(chunks) == 2
         assert chunks[0].section_heading == "Intro"
         assert chunks[1].section_heading == "Details"
 
     def test_no_headers_falls_back_to_tokens(self) -> None:
         content = "Just plain text without any markdown headers at all."
-        chunks = split_by_sections(content, "https://ex.com", "Test")
+        chunks = list(split_by_sections(content, "https://ex.com", "Test"))
         assert len(chunks) >= 1
         assert chunks[0].section_heading is None
 
     def test_preserves_pre_header_content(self) -> None:
         content = "Preamble text.\n\n## Section One\nSection content."
-        chunks = split_by_sections(content, "https://ex.com", "Test")
+        chunks = list(split_by_sections(content, "https://ex.com", "Test"))
         assert any("Preamble" in c.text for c in chunks)
 
     def test_respects_target_tokens(self) -> None:
         long_section = "word " * 500
         content = f"## Big Section\n{long_section}"
-        chunks = split_by_sections(
-            content, "https://ex.com", "Test", target_tokens=50
+        chunks = list(
+            split_by_sections(content, "https://ex.com", "Test", target_tokens=50)
         )
         assert len(chunks) > 1
 
     def test_empty_section_skipped(self) -> None:
         content = "## Empty\n\n## Has Content\nSome text."
-        chunks = split_by_sections(content, "https://ex.com", "Test")
+        chunks = list(split_by_sections(content, "https://ex.com", "Test"))
         assert len(chunks) == 1
         assert chunks[0].section_heading == "Has Content"
 
     def test_chunk_metadata(self) -> None:
         content = "## Topic\nSome text about the topic."
-        chunks = split_by_sections(content, "https://ex.com/page", "My KB")
+        chunks = list(split_by_sections(content, "https://ex.com/page", "My KB"))
         assert chunks[0].source_url == "https://ex.com/page"
         assert chunks[0].source_name == "My KB"
 
     def test_h1_h2_h3_all_split(self) -> None:
         content = "# H1\nText1.\n## H2\nText2.\n### H3\nText3."
-        chunks = split_by_sections(content, "https://ex.com", "Test")
+        chunks = list(split_by_sections(content, "https://ex.com", "Test"))
         assert len(chunks) == 3
 
     def test_chunk_index_is_sequential(self) -> None:
         content = "## A\nText A.\n## B\nText B.\n## C\nText C."
-        chunks = split_by_sections(content, "https://ex.com", "Test")
+        chunks = list(split_by_sections(content, "https://ex.com", "Test"))
         assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
 
     def test_chunk_index_sequential_across_sections(self) -> None:
         """Index must be global across sections, not reset per section."""
         long = "word " * 500
         content = f"## First\n{long}\n## Second\n{long}"
-        chunks = split_by_sections(
-            content, "https://ex.com", "Test", target_tokens=50
+        chunks = list(
+            split_by_sections(content, "https://ex.com", "Test", target_tokens=50)
         )
         assert len(chunks) > 2
         assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
 
     def test_chunk_index_set_when_no_headers(self) -> None:
         content = "Just plain text without any headers."
-        chunks = split_by_sections(content, "https://ex.com", "Test")
+        chunks = list(split_by_sections(content, "https://ex.com", "Test"))
         assert all(c.chunk_index is not None for c in chunks)
         assert chunks[0].chunk_index == 0
 
+    def test_yields_chunks_lazily(self) -> None:
+        content = "## A\nText A.\n## B\nText B."
+        chunks = split_by_sections(content, "https://ex.com", "Test")
+        assert next(chunks).section_heading == "A"
+        assert [c.section_heading for c in chunks] == ["B"]
 
+    def test_preserves_original_whitespace_within_chunk(self) -> None:
+        content = "Step one.\n\n- item a\n- item b"
+        chunks = list(split_by_sections(content, "https://ex.com", "Test"))
+        assert len(chunks) == 1
+        assert chunks[0].text == content
+
+
+def _byte_encoding(merges: tuple[bytes, ...] = ()) -> tiktoken.Encoding:
+    """Offline tiktoken encoding: one token per byte, plus the given merges."""
+    ranks = {bytes([i]): i for i in range(256)}
+    for merge in merges:
+        ranks[merge] = len(ranks)
+    return tiktoken.Encoding(
+        "test-bytes", pat_str=r"\S+|\s+", mergeable_ranks=ranks, special_tokens={}
+    )
+
+
+class TestTokenCounting:
+    @patch(
+        "multimodal_rag.ingest.web._token_encoding", return_value=_byte_encoding()
+    )
+    def test_windows_follow_encoder_tokens(self, _mock_enc: MagicMock) -> None:
+        chunks = list(
+            split_by_sections(
+                "abcdefghij" * 3, "https://ex.com", "Test", target_tokens=10
+            )
+        )
+        assert [c.text for c in chunks] == ["abcdefghij"] * 3
+
+    @patch(
+        "multimodal_rag.ingest.web._token_encoding", return_value=_byte_encoding()
+    )
+    def test_whitespace_only_windows_skipped(self, _mock_enc: MagicMock) -> None:
+        chunks = list(
+            split_by_sections(
+                "abc" + " " * 10, "https://ex.com", "Test", target_tokens=3
+            )
+        )
+        assert [c.text for c in chunks] == ["abc"]
+        assert chunks[0].chunk_index == 0
+
+    def test_page_is_encoded_once(self) -> None:
+        enc = MagicMock(wraps=_byte_encoding())
+        content = "## A\nabcdef\n## B\nghijkl\n## C\nmnopqr"
+        with patch("multimodal_rag.ingest.web._token_encoding", return_value=enc):
+            chunks = list(
+                split_by_sections(content, "https://ex.com", "Test", target_tokens=3)
+            )
+        assert [c.text for c in chunks] == ["abc", "def", "ghi", "jkl", "mno", "pqr"]
+        assert [c.section_heading for c in chunks] == ["A", "A", "B", "B", "C", "C"]
+        enc.encode.assert_called_once()
+
+    def test_offsets_match_tiktoken_on_ascii(self) -> None:
+        enc = _byte_encoding((b"th", b"the", b" the", b"in", b"ing"))
+        text = "Open the settings, then the thing.\n\n## Next\nthe end"
+        with patch("multimodal_rag.ingest.web._token_encoding", return_value=enc):
+            offsets, step = _chunk_units(text, 10)
+
+        tokens = enc.encode(text)
+        assert len(tokens) < len(text)
+        assert offsets == enc.decode_with_offsets(tokens)[1]
+        assert step == 10
+
+    def test_offsets_land_on_characters_in_non_ascii_text(self) -> None:
+        # "ä" is split across two tokens; the second starts inside it
+        enc = _byte_encoding((b"\xa4n", b"\xa4nd"))
+        text = "Einstellungen ändern"
+        with patch("multimodal_rag.ingest.web._token_encoding", return_value=enc):
+            offsets, _ = _chunk_units(text, 10)
+
+        expected = enc.decode_with_offsets(enc.encode(text))[1]
+        assert len(offsets) == len(expected)
+        assert offsets == sorted(offsets)
+        assert all(0 <= o <= len(text) for o in offsets)
+        # Only the mid-character token moves, to the next character
+        moved = [(a, b) for a, b in zip(expected, offsets) if a != b]
+        assert moved == [(text.index("ä"), text.index("ä") + 1)]
+
+    @patch("multimodal_rag.ingest.web._token_encoding", return_value=None)
+    def test_falls_back_to_word_estimate(self, _mock_enc: MagicMock) -> None:
+        content = "word " * 500
+        chunks = list(
+            split_by_sections(content, "https://ex.com", "Test", target_tokens=50)
+        )
+        # 50 tokens / 1.3 → 38 words per chunk
+        assert len(chunks) == 14
+        assert chunks[0].text.split() == ["word"] * 38
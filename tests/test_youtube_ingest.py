@@ -1,46 +1,74 @@
 """Tests for YouTube transcript ingestion."""
 
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
 import pytest
+from youtube_transcript_api import (
+    IpBlocked,
+    TranscriptsDisabled,
+    YouTubeTranscriptApi,
+)
 
 from multimodal_rag.ingest.youtube import (
+    _cookie_jar,
+    _transcript_api,
     chunk_segments,
     extract_video_id,
     fetch_transcript_chunks,
+    iter_chunk_segments,
 )
+from multimodal_rag.models.chunks import Segment
+from multimodal_rag.store.cache import IngestCache
+
+
+class TestTranscriptApi:
+    def test_client_is_shared_per_thread_and_cookie_file(
+        self, tmp_path: Path
+    ) -> None:
+        cookies = tmp_path / "cookies.txt"
+        cookies.write_text("# Netscape HTTP Cookie File\n")
+        _cookie_jar.cache_clear()
+        assert _transcript_api("") is _transcript_api("")
+        assert _transcript_api(str(cookies)) is _transcript_api(str(cookies))
+        assert _transcript_api(str(cookies)) is not _transcript_api("")
+
+        other: list[YouTubeTranscriptApi] = []
+        thread = threading.Thread(
+            target=lambda: other.append(_transcript_api(str(cookies)))
+        )
+        thread.start()
+        thread.join()
+        assert other[0] is not _transcript_api(str(cookies))
+        assert _cookie_jar.cache_info().misses == 1
 
 
 class TestExtractVideoId:
-    def test_standard_url(self) -> None:
-        url = "https://www.youtube.com/watch?v=KHo5xEaPyAI"
-        assert extract_video_id(url) == "KHo5xEaPyAI"
-
-    def test_url_with_timestamp(self) -> None:
-        url = "https://www.youtube.com/watch?v=KHo5xEaPyAI&t=18s"
-        assert extract_video_id(url) == "KHo5xEaPyAI"
-
-    def test_short_url(self) -> None:
-        url = "https://youtu.be/KHo5xEaPyAI"
-        assert extract_video_id(url) == "KHo5xEaPyAI"
-
-    def test_embed_url(self) -> None:
-        url = "https://www.youtube.com/embed/KHo5xEaPyAI"
-        assert extract_video_id(url) is not None
-
-    def test_invalid_url(self) -> None:
-        assert extract_video_id("https://example.com") is None
-
-    def test_empty_string(self) -> None:
-        assert extract_video_id("") is None
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            ("https://www.youtube.com/watch?v=KHo5xEaPyAI", "KHo5xEaPyAI"),
+            ("https://www.youtube.com/watch?v=KHo5xEaPyAI&t=18s", "KHo5xEaPyAI"),
+            ("https://youtu.be/KHo5xEaPyAI", "KHo5xEaPyAI"),
+            ("https://www.youtube.com/embed/KHo5xEaPyAI", "KHo5xEaPyAI"),
+            ("https://example.com", None),
+            ("", None),
+        ],
+    )
+    def test_extract_video_id(self, url: str, expected: str | None) -> None:
+        assert extract_video_id(url) == expected
 
 
 class TestChunkSegments:
     def _make_segments(
         self, texts: list[str], start: float = 0.0, gap: float = 3.0
-    ) -> list[dict[str, float | str]]:
+    ) -> list[Segment]:
         segments = []
         t = start
         for text in texts:
-            segments.append({"text": text, "start": t, "duration": gap})
+            segments.append(Segment(text, t, gap))
             t += gap
         return segments
 
@@ -58,6 +86,21 @@ class TestChunkSegments:
         chunks = chunk_segments(segments, "https://yt.com/watch?v=abc", "Test", 20)
         assert len(chunks) > 1
 
+    def test_iter_yields_before_consuming_all_segments(self) -> None:
+        consumed = 0
+
+        def _stream() -> Iterator[Segment]:
+            nonlocal consumed
+            for seg in self._make_segments(["word " * 20] * 10):
+                consumed += 1
+                yield seg
+
+        chunks = iter_chunk_segments(_stream(), "https://yt.com/watch?v=abc", "T", 20)
+        first = next(chunks)
+        assert consumed < 10
+        assert first.start_seconds == 0
+        assert first.end_seconds == 3
+
     def test_preserves_start_timestamp(self) -> None:
         segments = self._make_segments(["First segment", "Second segment"], start=90.0)
         chunks = chunk_segments(segments, "https://yt.com/watch?v=abc", "Test", 400)
@@ -69,13 +112,26 @@ class TestChunkSegments:
 
     def test_skips_empty_text(self) -> None:
         segments = [
-            {"text": "", "start": 0.0, "duration": 3.0},
-            {"text": "Actual content", "start": 3.0, "duration": 3.0},
+            Segment("", 0.0, 3.0),
+            Segment("Actual content", 3.0, 3.0),
         ]
         chunks = chunk_segments(segments, "https://yt.com/watch?v=abc", "Test", 400)
         assert len(chunks) == 1
         assert chunks[0].text == "Actual content"
 
+    def test_end_ignores_trailing_empty_segments(self) -> None:
+        segments = [
+            Segment("word " * 10, 0.0, 5.0),
+            Segment("", 5.0, 30.0),
+            Segment("word " * 10, 35.0, 5.0),
+            Segment("", 40.0, 60.0),
+        ]
+        chunks = chunk_segments(segments, "https://yt.com/watch?v=abc", "Test", 15)
+        assert [(c.start_seconds, c.end_seconds) for c in chunks] == [
+            (0, 5),
+            (35, 40),
+        ]
+
     def test_chunk_has_correct_source_metadata(self) -> None:
         segments = self._make_segments(["Hello"])
         chunks = chunk_segments(
@@ -85,6 +141,83 @@ class TestChunkSegments:
         assert chunks[0].source_name == "My Video"
 
 
+class TestFetchTranscriptChunksCache:
+    _URL = "https://www.youtube.com/watch?v=abc12345678"
+    _SEGMENTS = [Segment("Hello", 0.0, 2.0)]
+
+    @patch("multimodal_rag.ingest.youtube.fetch_transcript")
+    def test_second_run_reads_from_cache(
+        self, mock_fetch: MagicMock, tmp_path: Path
+    ) -> None:
+        mock_fetch.return_value = self._SEGMENTS
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            first = fetch_transcript_chunks(self._URL, "Test", cache=cache)
+            second = fetch_transcript_chunks(self._URL, "Test", cache=cache)
+
+        mock_fetch.assert_called_once()
+        assert [c.text for c in second] == [c.text for c in first] == ["Hello"]
+
+    @patch("multimodal_rag.ingest.youtube.fetch_voxtral_transcript")
+    @patch("multimodal_rag.ingest.youtube.fetch_transcript")
+    def test_cached_voxtral_skips_caption_request(
+        self, mock_fetch: MagicMock, mock_voxtral: MagicMock, tmp_path: Path
+    ) -> None:
+        mock_fetch.side_effect = TranscriptsDisabled("abc12345678")
+        mock_voxtral.return_value = self._SEGMENTS
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            fetch_transcript_chunks(
+                self._URL, "Test", mistral_api_key="key", cache=cache
+            )
+            chunks = fetch_transcript_chunks(
+                self._URL, "Test", mistral_api_key="key", cache=cache
+            )
+
+        assert mock_fetch.call_count == 1
+        mock_voxtral.assert_called_once()
+        assert chunks[0].text == "Hello"
+
+    @patch("multimodal_rag.ingest.youtube.fetch_transcript", return_value=[])
+    def test_empty_transcript_not_cached(
+        self, mock_fetch: MagicMock, tmp_path: Path
+    ) -> None:
+        with IngestCache(tmp_path / "c.db", embedding_model="m") as cache:
+            fetch_transcript_chunks(self._URL, "Test", cache=cache)
+            fetch_transcript_chunks(self._URL, "Test", cache=cache)
+
+        assert mock_fetch.call_count == 2
+
+
+@patch("multimodal_rag.ingest.youtube.time.sleep")
+class TestIpBlockedBackoff:
+    _URL = "https://www.youtube.com/watch?v=abc12345678"
+
+    @patch("multimodal_rag.ingest.youtube.fetch_transcript")
+    def test_retries_with_exponential_backoff(
+        self, mock_fetch: MagicMock, mock_sleep: MagicMock
+    ) -> None:
+        mock_fetch.side_effect = [
+            IpBlocked("abc12345678"),
+            IpBlocked("abc12345678"),
+            [Segment("Hello", 0.0, 2.0)],
+        ]
+
+        chunks = fetch_transcript_chunks(self._URL, "Test")
+
+        assert [c.text for c in chunks] == ["Hello"]
+        assert [c[0][0] for c in mock_sleep.call_args_list] == [1, 2]
+
+    @patch(
+        "multimodal_rag.ingest.youtube.fetch_transcript",
+        side_effect=IpBlocked("abc12345678"),
+    )
+    def test_gives_up_after_retries(
+        self, mock_fetch: MagicMock, mock_sleep: MagicMock
+    ) -> None:
+        assert fetch_transcript_chunks(self._URL, "Test") == []
+        assert mock_fetch.call_count == 4
+        assert mock_sleep.call_count == 3
+
+
 class TestFetchTranscriptChunksIntegration:
     """Integration tests against real YouTube API. Requires network."""
 